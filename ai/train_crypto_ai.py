@@ -1,13 +1,23 @@
+import os
 
 import pandas as pd
 import joblib
 from sklearn.ensemble import RandomForestClassifier
 
-df = pd.read_csv("data/crypto_features_15m.csv")
+from features.streaming_features import FEATURES, TARGET, load_features
+
+# jalankan dari root repo: python -m ai.train_crypto_ai
+FEATURE_DIR = "data/crypto_features_15m"
+
+# fitur kolumnar (features/streaming_features.py) dibaca lewat memmap;
+# fallback ke CSV lama bila belum di-build
+if os.path.exists(os.path.join(FEATURE_DIR, "meta.json")):
+    df = load_features(FEATURE_DIR, FEATURES + [TARGET])
+else:
+    df = pd.read_csv("data/crypto_features_15m.csv")
 
-FEATURES = ["return","sma5","sma10","ema5","ema10","rsi","macd","signal","vol_change","body"]
 X = df[FEATURES]
-y = df["Direction"]
+y = df[TARGET]
 
 model = RandomForestClassifier(
     n_estimators=400,
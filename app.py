@@ -10,6 +10,13 @@ from components.sentiment import render_sentiment
 from components.crypto_sentiment import render_crypto_sentiment
 from components.ai_signal import render_ai_signal
 from data.data_loader import load_candles
+from data.watchlist import TOP_SYMBOLS, get_top_symbols, parse_watchlist
+from data.trade_tape import update_trade_flow
+from data.bars import BUILDERS, auto_size, get_bar_builder
+from data.ohlcv import canonical_ohlcv
+from data.candle_cache import get_candle_cache
+from data.yf_planner import planner_stats
+from data.http_client import latency_histograms
 from components.ai_confidence_chart import render_ai_confidence_chart
 from components.ai_final_engine import final_decision_engine
 from components.reversal_detector import render_reversal_detector
@@ -18,6 +25,8 @@ from components.indo_heatmap import render_heatmap
 from components.indo_battle_meter import render_battle_meter
 from components.reversal_premium_ui import render_reversal_premium
 from components.reversal_premium_level2 import render_reversal_premium_level2
+from components.mtf_confluence import render_mtf_confluence
+from components.scanner import render_scanner
 from auth import login_ui, is_premium, logout, init_auth, check_timeout, is_guest
 from db import init_db
 
@@ -208,6 +217,11 @@ interval = st.sidebar.selectbox(
     intervals_stock if mode.startswith("Saham") else intervals_crypto
 )
 
+# bar non-waktu dibangun streaming dari kline 1m (crypto saja)
+bar_type = "Time"
+if mode.startswith("Crypto"):
+    bar_type = st.sidebar.selectbox("Bar Type", ["Time", *BUILDERS])
+
 reversal_sensitivity = st.sidebar.select_slider(
     "Reversal Sensitivity",
     options=["Low", "Medium", "High"],
@@ -217,6 +231,36 @@ reversal_sensitivity = st.sidebar.select_slider(
 auto_refresh = st.sidebar.checkbox("Auto Refresh", True)
 refresh_rate = st.sidebar.slider("Refresh (seconds)", 3, 30, 5)
 
+with st.sidebar.expander("🔎 Watchlist Scanner"):
+    scanner_on = st.checkbox("Aktifkan scanner", False)
+    watchlist_text = st.text_area(
+        "Watchlist (pisahkan dengan koma / baris baru)",
+        "" if mode.startswith("Crypto") else "BBNI.JK, BBRI.JK, BMRI.JK, TLKM.JK, ASII.JK",
+        help=f"Kosong (crypto) = top {TOP_SYMBOLS} pair USDT berdasarkan volume 24 jam.",
+    )
+
+cache_stats = get_candle_cache().stats()
+st.sidebar.caption(
+    f"Candle cache — hit: {cache_stats['hits']} · miss: {cache_stats['misses']} · "
+    f"coalesced: {cache_stats['coalesced']} · saved: {cache_stats['hit_ratio']*100:.0f}%"
+)
+
+yf_stats = planner_stats()
+st.sidebar.caption(
+    f"yfinance planner — request: {yf_stats['requested']} · download: {yf_stats['downloads']} "
+    f"({yf_stats['tickers']} ticker) · dieliminasi: {yf_stats['eliminated']}"
+)
+
+with st.sidebar.expander("📡 Upstream Latency"):
+    latency = latency_histograms()
+    if latency:
+        st.dataframe({
+            host: {"requests": h["requests"], "errors": h["errors"], "avg_ms": h["avg_ms"], **h["buckets"]}
+            for host, h in latency.items()
+        })
+    else:
+        st.caption("Belum ada request upstream.")
+
 #st.sidebar.markdown("---")
 #if st.sidebar.button("🚪 Logout"):
 #    logout()
@@ -228,6 +272,31 @@ refresh_rate = st.sidebar.slider("Refresh (seconds)", 3, 30, 5)
 page = st.empty()
 
 
+# ======================================================
+# ALTERNATIVE BARS (VOLUME / RANGE / RENKO)
+# ======================================================
+ALT_BARS_BASE = 1000
+ALT_BARS_MIN = 30
+
+def load_alt_bars(symbol, kind, mode, fallback):
+    base = load_candles(symbol, "1m", mode, limit=ALT_BARS_BASE)
+
+    # size dikunci per session supaya builder (state streaming) tetap sama
+    size_key = f"bar_size_{symbol.upper()}_{kind}"
+    if size_key not in st.session_state:
+        st.session_state[size_key] = auto_size(base, kind)
+
+    builder = get_bar_builder(symbol, kind, st.session_state[size_key])
+    builder.feed_candles(base)
+    bars = builder.frame()
+
+    if len(bars) < ALT_BARS_MIN:
+        st.sidebar.caption(f"{kind} bar belum cukup ({len(bars)}), pakai candle waktu.")
+        return fallback
+    st.sidebar.caption(f"{kind} bar · size {builder.size:g} · {builder.completed} bar")
+    return canonical_ohlcv(bars, symbol, f"{kind}:{builder.size:g}")
+
+
 # ======================================================
 # DASHBOARD LOOP
 # ======================================================
@@ -241,11 +310,16 @@ while True:
     # --- load data ---
     try:
         df = load_candles(symbol, interval, mode)
+        if bar_type != "Time":
+            df = load_alt_bars(symbol, bar_type, mode, df)
     except Exception as e:
         loading_area.empty()
         st.error(f"❌ Gagal memuat data: {e}")
         st.stop()
 
+    # --- trade tape (order flow) hanya tersedia untuk crypto ---
+    flow = update_trade_flow(symbol, interval) if mode.startswith("Crypto") else None
+
     # --- hilangkan loader setelah data siap ---
     loading_area.empty()
 
@@ -257,7 +331,7 @@ while True:
         col1, col2 = st.columns([3, 1])
 
         with col1:
-            render_smartmoney(df)
+            render_smartmoney(df, flow)
             render_chart(df)
             render_indicators(df)
 
@@ -273,7 +347,7 @@ while True:
                     render_ai_signal(df)
             
                     trend_result = ai.predict(df)
-                    decision, reason, reversal_sig, smart_money = final_decision_engine(df, trend_result)
+                    decision, reason, reversal_sig, smart_money = final_decision_engine(df, trend_result, flow=flow)
                     
                     st.markdown("## 🧠 AI Final Decision Engine")
                     
@@ -285,6 +359,7 @@ while True:
                     for r in reason:
                         st.markdown(f"- {r}")
     
+                    render_mtf_confluence(symbol)
                     render_reversal_detector(df, reversal_sensitivity)
                     render_ai_confidence_chart()
             else:
@@ -299,6 +374,15 @@ while True:
             else:
                 st.info("Orderbook tidak tersedia untuk saham Indo.")
 
+        if scanner_on:
+            watchlist = parse_watchlist(watchlist_text)
+            if not watchlist and mode.startswith("Crypto"):
+                watchlist = get_top_symbols()
+                if not watchlist:
+                    st.info("⏳ Memuat daftar top pair MEXC...")
+            if watchlist or not mode.startswith("Crypto"):
+                render_scanner(watchlist, interval, mode, max_age=refresh_rate)
+
     # --- kontrol auto refresh ---
     if not auto_refresh:
         break
@@ -1,30 +1,17 @@
 from components.ai_reversal import detect_reversal
 from components.smartmoney import get_smart_money_bias
+from data.ohlcv import normalize_ohlcv as _normalize_ohlcv
 
 def normalize_ohlcv(df):
-    df = df.copy()
-    mapping = {
-        "open": "Open",
-        "high": "High",
-        "low": "Low",
-        "close": "Close",
-        "volume": "Volume",
-    }
+    # tanpa validasi/dropna: reversal & smart money menanganinya sendiri
+    return _normalize_ohlcv(df, required=(), numeric=(), dropna=None)
 
-    lower = {c.lower(): c for c in df.columns}
 
-    for std, raw in mapping.items():
-        if std in lower:
-            df[mapping[std]] = df[lower[std]]
-
-    return df
-
-
-def final_decision_engine(df, trend_result, sensitivity=1.0):
+def final_decision_engine(df, trend_result, sensitivity=1.0, flow=None):
     df = normalize_ohlcv(df)
 
     reversal_signal, reversal_expl = detect_reversal(df, sensitivity)
-    smart = get_smart_money_bias(df)
+    smart = get_smart_money_bias(df, flow)
     
     trend_dir = trend_result["direction"]
     conf = trend_result["confidence"]
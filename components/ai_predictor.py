@@ -1,6 +1,12 @@
 import numpy as np
 import pandas as pd
 
+from components.indicator_engine import indicators
+from data.ohlcv import normalize_ohlcv
+
+# bar bersih terakhir yang dipakai _extract_features (volume iloc[-21:-1] + bar terakhir)
+FEATURE_WINDOW = 21
+
 class AIPredictor:
     """
     Rule-based AI + Explanation
@@ -18,35 +24,8 @@ class AIPredictor:
     # Normalisasi kolom OHLCV
     # -----------------------------
     def _normalize_ohlcv(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        col_map = {}
-
-        candidates = {
-            "Open": ["open", "o"],
-            "High": ["high", "h"],
-            "Low": ["low", "l"],
-            "Close": ["close", "c", "price", "last"],
-            "Volume": ["volume", "vol", "qty"],
-        }
-
-        lower_cols = {c.lower(): c for c in df.columns}
-
-        for std_name, poss in candidates.items():
-            for p in poss:
-                if p.lower() in lower_cols:
-                    col_map[std_name] = lower_cols[p.lower()]
-                    break
-
-        missing = [c for c in ["Open", "High", "Low", "Close", "Volume"] if c not in col_map]
-        if missing:
-            raise KeyError(f"Missing OHLCV: {missing}")
-
-        df = df.rename(columns={orig: std for std, orig in col_map.items()})
-
-        for c in ["Open", "High", "Low", "Close", "Volume"]:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-        return df.dropna()
+        # frame kanonik dari load_candles → view tanpa copy
+        return normalize_ohlcv(df, dropna="all")
 
     def detect_reversal(self, df):
         """
@@ -89,8 +68,8 @@ class AIPredictor:
         score = 0
 
         # ---------- 1. RSI reversal ----------
-        # compute RSI 14
-        delta = np.diff(close)
+        # compute RSI 14 (delta dari indicator engine = np.diff(close))
+        delta = indicators(df)["delta"].to_numpy()[1:]
         gain = np.maximum(delta, 0)
         loss = np.abs(np.minimum(delta, 0))
 
@@ -281,3 +260,242 @@ class AIPredictor:
             "confidence": float(confidence),
             "explanations": explanations
         }
+
+    # -----------------------------
+    # Full-history prediction (batch)
+    # -----------------------------
+    def predict_history(self, df):
+        """
+        predict() untuk setiap bar sekaligus (vectorized, O(n)).
+        Baris i identik dengan predict(df.iloc[:i + 1]) untuk kolom
+        direction, prob_up, prob_down, confidence + fitur mentahnya.
+        """
+        n_raw = 0 if df is None else len(df)
+        index = df.index if df is not None else pd.RangeIndex(0)
+
+        feats = np.zeros((n_raw, 4), dtype=np.float64)
+        if n_raw:
+            clean = self._normalize_ohlcv(df)
+            clean = clean.dropna(subset=["Open", "Close", "Volume"], how="any")
+            f_clean = self._features_history(clean)
+
+            # prefix raw r → jumlah baris bersih di dalamnya (m); fitur = baris m-1
+            pos = index.get_indexer(clean.index)
+            m = np.searchsorted(pos, np.arange(n_raw), side="right")
+            ok = m >= 10
+            feats[ok] = f_clean[m[ok] - 1]
+
+        score = (feats > 0).sum(axis=1)
+        prob_up = score / 4
+        prob_down = 1 - prob_up
+        confidence = np.abs(prob_up - prob_down)
+        direction = np.where(prob_up >= 0.5, "UP", "DOWN").astype(object)
+
+        # < 5 bar → N/A dengan probabilitas 0
+        short = np.arange(1, n_raw + 1) < 5
+        direction[short] = "N/A"
+        prob_up = np.where(short, 0.0, prob_up)
+        prob_down = np.where(short, 0.0, prob_down)
+        confidence = np.where(short, 0.0, confidence)
+
+        return pd.DataFrame({
+            "direction": direction,
+            "prob_up": prob_up,
+            "prob_down": prob_down,
+            "confidence": confidence,
+            "ret_1": feats[:, 0],
+            "mom_5": feats[:, 1],
+            "vol_mom": feats[:, 2],
+            "body": feats[:, 3],
+        }, index=index)
+
+    def _features_history(self, df):
+        """Fitur _extract_features untuk setiap prefix frame bersih (baris < 10 → 0)."""
+        n = len(df)
+        out = np.zeros((n, 4), dtype=np.float64)
+        if n < 10:
+            return out
+
+        close = df["Close"].to_numpy(dtype=np.float64)
+        open_ = df["Open"].to_numpy(dtype=np.float64)
+        volume = df["Volume"].to_numpy(dtype=np.float64)
+        k = np.arange(9, n)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[9:, 0] = (close[k] - close[k - 1]) / close[k - 1] * 100
+            out[9:, 1] = (close[k] - close[k - 5]) / close[k - 5] * 100
+            out[9:, 3] = (close[k] - open_[k]) / open_[k] * 100
+
+            # rata-rata volume min(20, k) bar sebelumnya (iloc[-21:-1])
+            base = np.empty(n - 9, dtype=np.float64)
+            head = min(n, 21) - 9
+            for j in range(head):
+                base[j] = volume[:9 + j].mean()
+            if n > 21:
+                windows = np.lib.stride_tricks.sliding_window_view(volume[:-1], 20)
+                base[head:] = windows[21 - 20:].mean(axis=1)
+
+            vol_mom = (volume[k] - base) / base * 100
+            out[9:, 2] = np.where(base != 0, vol_mom, 0.0)
+
+        return out
+
+    # -----------------------------
+    # Batched prediction (N symbol / T timestamp)
+    # -----------------------------
+    def stack_frames(self, frames, window=FEATURE_WINDOW):
+        """
+        List frame OHLCV → (open, close, volume, lengths) untuk predict_batch.
+        Tiap frame dibersihkan seperti _extract_features, lalu `window` bar
+        bersih terakhir diletakkan rata kanan (kiri diisi NaN).
+        """
+        n = len(frames)
+        out = [np.full((n, window), np.nan) for _ in range(3)]
+        lengths = np.zeros(n, dtype=np.int64)
+
+        for i, df in enumerate(frames):
+            if df is None or len(df) == 0:
+                continue
+            lengths[i] = len(df)
+            clean = self._normalize_ohlcv(df).dropna(subset=["Open", "Close", "Volume"], how="any")
+            tail = clean.iloc[-window:]
+            for arr, col in zip(out, ("Open", "Close", "Volume")):
+                arr[i, window - len(tail):] = tail[col].to_numpy(dtype=np.float64)
+
+        return (*out, lengths)
+
+    def predict_batch(self, open_, close, volume, lengths=None):
+        """
+        predict() untuk banyak series sekaligus (vectorized).
+
+        Input array 2D (N, L): satu baris = satu series (simbol, atau window
+        per timestamp), bar terakhir di kolom paling kanan. NaN = bar tidak
+        ada (padding / baris yang di-dropna). `lengths` = jumlah bar mentah
+        per series untuk aturan < 5 bar (default L).
+
+        Return dict array: direction, prob_up, prob_down, confidence,
+        features (N, 4: ret_1, mom_5, vol_mom, body). Identik dengan predict
+        pada frame yang sama.
+        """
+        open_ = np.atleast_2d(np.asarray(open_, dtype=np.float64))
+        close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+        volume = np.atleast_2d(np.asarray(volume, dtype=np.float64))
+        n, width = close.shape
+        if lengths is None:
+            lengths = np.full(n, width)
+
+        # geser bar valid ke kanan (urutan dijaga) → sama dengan dropna
+        valid = ~(np.isnan(open_) | np.isnan(close) | np.isnan(volume))
+        m = valid.sum(axis=1)
+        if not valid.all():
+            order = np.argsort(valid, axis=1, kind="stable")
+            open_ = np.take_along_axis(open_, order, axis=1)
+            close = np.take_along_axis(close, order, axis=1)
+            volume = np.take_along_axis(volume, order, axis=1)
+
+        # cukup FEATURE_WINDOW kolom terakhir
+        if width < FEATURE_WINDOW:
+            pad = np.full((n, FEATURE_WINDOW - width), np.nan)
+            open_, close, volume = (np.hstack([pad, a]) for a in (open_, close, volume))
+        o = open_[:, -FEATURE_WINDOW:]
+        c = close[:, -FEATURE_WINDOW:]
+        v = volume[:, -FEATURE_WINDOW:]
+
+        feats = np.zeros((n, 4), dtype=np.float64)
+        ok = m >= 10
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            feats[:, 0] = (c[:, -1] - c[:, -2]) / c[:, -2] * 100
+            feats[:, 1] = (c[:, -1] - c[:, -6]) / c[:, -6] * 100
+            feats[:, 3] = (c[:, -1] - o[:, -1]) / o[:, -1] * 100
+
+            # rata-rata volume min(20, m-1) bar sebelumnya; per panjang supaya
+            # urutan penjumlahan sama dengan Series.mean
+            base = np.full(n, np.nan)
+            full = m >= FEATURE_WINDOW
+            base[full] = v[full, :-1].mean(axis=1)
+            for k in np.unique(m[ok & ~full]):
+                rows = m == k
+                base[rows] = v[rows, -k:-1].mean(axis=1)
+
+            vol_mom = (v[:, -1] - base) / base * 100
+            feats[:, 2] = np.where(base != 0, vol_mom, 0.0)
+
+        feats[~ok] = 0.0
+
+        score = (feats > 0).sum(axis=1)
+        prob_up = score / 4
+        prob_down = 1 - prob_up
+        confidence = np.abs(prob_up - prob_down)
+        direction = np.where(prob_up >= 0.5, "UP", "DOWN").astype(object)
+
+        short = np.asarray(lengths) < 5
+        direction[short] = "N/A"
+        prob_up = np.where(short, 0.0, prob_up)
+        prob_down = np.where(short, 0.0, prob_down)
+        confidence = np.where(short, 0.0, confidence)
+
+        return {
+            "direction": direction,
+            "prob_up": prob_up,
+            "prob_down": prob_down,
+            "confidence": confidence,
+            "features": feats,
+        }
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    ai = AIPredictor()
+
+    # kesetaraan: frame acak (panjang bervariasi, ada NaN) vs predict()
+    frames = []
+    for _ in range(2000):
+        n = int(rng.integers(1, 60))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        df = pd.DataFrame({
+            "open": close * (1 + rng.normal(0, 0.002, n)),
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.random(n) * 10 * (rng.random(n) > 0.05),
+        })
+        df.loc[rng.random(n) < 0.05, "close"] = np.nan
+        frames.append(df)
+
+    res = ai.predict_batch(*ai.stack_frames(frames))
+    for i, df in enumerate(frames):
+        ref = ai.predict(df)
+        assert ref["direction"] == res["direction"][i], i
+        for key in ("prob_up", "prob_down", "confidence"):
+            assert ref[key] == res[key][i], (i, key)
+        if len(df) >= 5:
+            assert np.array_equal(ai._extract_features(df), res["features"][i], equal_nan=True), i
+    print(f"predict_batch == predict untuk {len(frames)} frame ✔")
+
+    # throughput: N symbol × window 200 bar
+    n_sym, width = 100_000, 200
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_sym, width)), axis=1))
+    open_ = close * (1 + rng.normal(0, 0.002, (n_sym, width)))
+    volume = rng.random((n_sym, width)) * 10
+
+    t = time.perf_counter()
+    ai.predict_batch(open_, close, volume)
+    dt = time.perf_counter() - t
+    print(f"predict_batch: {n_sym:,} prediksi dalam {dt:.3f}s → {n_sym / dt:,.0f}/s")
+
+    sample = [
+        pd.DataFrame({"open": open_[i], "high": close[i], "low": close[i], "close": close[i], "volume": volume[i]})
+        for i in range(300)
+    ]
+    t = time.perf_counter()
+    for df in sample:
+        ai.predict(df)
+    dt = time.perf_counter() - t
+    print(f"predict (loop): {len(sample) / dt:,.0f}/s")
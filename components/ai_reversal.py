@@ -1,36 +1,13 @@
 import numpy as np
 import pandas as pd
 
-def _normalize_ohlcv(df):
-    df = df.copy()
-    col_map = {}
-    candidates = {
-        "Open": ["open", "o"],
-        "High": ["high", "h"],
-        "Low": ["low", "l"],
-        "Close": ["close", "c", "price", "last"],
-        "Volume": ["volume", "vol", "qty"],
-    }
-
-    lower = {c.lower(): c for c in df.columns}
-
-    for std, poss in candidates.items():
-        for p in poss:
-            if p.lower() in lower:
-                col_map[std] = lower[p.lower()]
-                break
+from data.ohlcv import expand_history, normalize_ohlcv
 
-    missing = [c for c in ["Open", "High", "Low", "Close"] if c not in col_map]
-    if missing:
-        raise KeyError(f"Missing columns: {missing}")
+_PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
 
-    df = df.rename(columns={orig: std for std, orig in col_map.items()})
-
-    for col in ["Open", "High", "Low", "Close"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df = df.dropna(subset=["Open", "Close"])
-    return df
+def _normalize_ohlcv(df):
+    # volume opsional untuk deteksi wick
+    return normalize_ohlcv(df, required=_PRICE_COLUMNS, numeric=_PRICE_COLUMNS)
 
 
 def detect_reversal(df, sensitivity=1.0):
@@ -102,3 +79,51 @@ def detect_reversal(df, sensitivity=1.0):
 
     explanations.append("Tidak ada wick ekstrem → no clear reversal.")
     return None, explanations
+
+
+def detect_reversal_history(df, sensitivity=1.0):
+    """
+    detect_reversal untuk setiap bar sekaligus (vectorized, O(n)).
+    Baris i identik dengan sinyal detect_reversal(df.iloc[:i + 1], sensitivity):
+    kolom signal ("UP" / "DOWN" / None), body, upper_wick, lower_wick.
+    Index sama dengan df, termasuk baris OHLC NaN yang dibuang normalisasi.
+    """
+    index = df.index
+    try:
+        # index posisi → baris yang di-dropna bisa dipetakan balik
+        df = _normalize_ohlcv(df.set_axis(pd.RangeIndex(len(df))))
+    except Exception:
+        return pd.DataFrame({"signal": None}, index=df.index)
+
+    try:
+        sensitivity = float(sensitivity)
+    except:
+        sensitivity = 1.0
+
+    open_ = df["Open"].to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    high = df["High"].to_numpy(dtype=np.float64)
+    low = df["Low"].to_numpy(dtype=np.float64)
+
+    body = np.abs(close - open_)
+    upper_wick = high - np.maximum(open_, close)
+    lower_wick = np.minimum(open_, close) - low
+    body = np.where(body > 0, body, 0.0001)
+
+    cond_bearish = upper_wick > body * (2.0 * sensitivity)
+    cond_bullish = lower_wick > body * (2.0 * sensitivity)
+
+    signal = np.full(len(df), None, dtype=object)
+    signal[cond_bullish & ~cond_bearish] = "UP"
+    signal[cond_bearish & ~cond_bullish] = "DOWN"
+    signal[:4] = None   # < 5 bar → tidak ada analisa
+
+    out = pd.DataFrame({
+        # dtype object supaya None tidak diubah jadi NaN (inferensi string)
+        "signal": pd.Series(signal, index=df.index, dtype=object),
+        "body": body,
+        "upper_wick": upper_wick,
+        "lower_wick": lower_wick,
+    }, index=df.index)
+    neutral = {"signal": None, "body": np.nan, "upper_wick": np.nan, "lower_wick": np.nan}
+    return expand_history(out, df.index.to_numpy(), index, neutral)
@@ -0,0 +1,347 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from components.ai_predictor import AIPredictor
+from components.ai_reversal import detect_reversal_history
+from components.indicator_engine import IndicatorSet
+from data.ohlcv import canonical_ohlcv
+from data.trade_tape import INTERVAL_MS
+
+# biaya default per sisi (basis point dari notional)
+FEE_BPS = 10
+SLIPPAGE_BPS = 2
+
+YEAR_MS = 365 * 24 * 60 * 60_000
+
+# keputusan → target posisi; None = tahan posisi sebelumnya
+FINAL_POSITIONS = {
+    "BUY": 1.0,
+    "REVERSAL BUY": 1.0,
+    "SELL": -1.0,
+    "TAKE PROFIT": 0.0,
+    "WAIT": None,
+}
+SIGNAL_POSITIONS = {
+    "BUY": 1.0,
+    "SELL": -1.0,
+    None: None,
+}
+
+
+# ======================================================
+# DECISIONS (VECTORIZED)
+# ======================================================
+
+def final_decisions(df, sensitivity=1.0):
+    """
+    final_decision_engine untuk setiap bar sekaligus.
+    trend = AIPredictor.predict, reversal = detect_reversal (versi history).
+    Smart money hanya informatif di engine asli, jadi tidak ikut dihitung.
+    """
+    trend = AIPredictor().predict_history(df)["direction"].to_numpy()
+    rev = detect_reversal_history(df, sensitivity)["signal"].to_numpy()
+
+    t_up, t_down = trend == "UP", trend == "DOWN"
+    r_up, r_down = rev == "UP", rev == "DOWN"
+
+    decision = np.full(len(df), "WAIT", dtype=object)
+    decision[t_down & r_up] = "REVERSAL BUY"
+    decision[t_up & r_down] = "TAKE PROFIT"
+    decision[t_down & r_down] = "SELL"
+    decision[t_up & r_up] = "BUY"
+    return decision
+
+
+def signal_decisions(df):
+    """render_signals untuk setiap bar: BUY / SELL / None (< 30 bar → None)."""
+    ind = IndicatorSet(df)   # tanpa cache engine: frame history bisa ratusan ribu bar
+    close = ind.col("close").to_numpy()
+    ema20 = ind["ema20"].to_numpy()
+    rsi = ind["rsi14"].to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        buy = (close > ema20) & (rsi < 70)
+        sell = (close < ema20) & (rsi > 30)
+
+    decision = np.full(len(df), None, dtype=object)
+    decision[sell & ~buy] = "SELL"
+    decision[buy] = "BUY"
+    decision[:29] = None
+    return decision
+
+
+STRATEGIES = {
+    "final": (final_decisions, FINAL_POSITIONS),
+    "signals": (signal_decisions, SIGNAL_POSITIONS),
+}
+
+
+def decisions_to_target(decision, mapping, long_only=False):
+    """Target posisi per bar (-1/0/1), keputusan 'tahan' di-forward-fill."""
+    target = np.full(len(decision), np.nan)
+    for label, pos in mapping.items():
+        if pos is None:
+            continue
+        if long_only and pos < 0:
+            pos = 0.0
+        target[decision == label] = pos
+
+    # forward-fill tanpa loop: indeks terakhir yang terisi
+    idx = np.where(np.isnan(target), 0, np.arange(len(target)))
+    np.maximum.accumulate(idx, out=idx)
+    target = target[idx]
+    return np.nan_to_num(target, nan=0.0)
+
+
+# ======================================================
+# SIMULATION
+# ======================================================
+
+def simulate(open_, close, target, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS, initial=1.0):
+    """
+    Keputusan di close bar i dieksekusi di open bar i+1.
+    Return dihitung open → open berikutnya (bar terakhir: open → close).
+    Fee + slippage dipotong dari equity sebanding dengan perubahan posisi.
+    """
+    n = len(open_)
+    pos = np.zeros(n)
+    pos[1:] = target[:-1]
+
+    nxt = np.empty(n)
+    nxt[:-1] = open_[1:]
+    nxt[-1:] = close[-1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = np.nan_to_num(nxt / open_ - 1, nan=0.0, posinf=0.0, neginf=0.0)
+
+    turnover = np.abs(np.diff(pos, prepend=0.0))
+    cost = turnover * (fee_bps + slippage_bps) / 1e4
+
+    growth = (1 + pos * ret) * (1 - cost)
+    equity = initial * np.cumprod(growth)
+    return pos, ret, cost, equity
+
+
+def extract_trades(pos, ret, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS):
+    """Segmen posisi non-nol berurutan → satu trade (entry & exit di open)."""
+    n = len(pos)
+    prev = np.concatenate(([0.0], pos[:-1]))
+    starts = np.flatnonzero(pos != prev)
+    if n == 0 or len(starts) == 0:
+        return pd.DataFrame(columns=["entry", "exit", "side", "bars", "return", "open"])
+
+    bounds = starts if starts[0] == 0 else np.concatenate(([0], starts))
+    side = pos[bounds]
+    ends = np.append(bounds[1:], n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_g = np.log1p(pos * ret)
+    gross = np.add.reduceat(log_g, bounds)
+
+    c = (fee_bps + slippage_bps) / 1e4
+    still_open = ends == n
+    net = gross + np.log1p(-c) + np.where(still_open, 0.0, np.log1p(-c))
+
+    keep = side != 0
+    return pd.DataFrame({
+        "entry": bounds[keep],
+        "exit": ends[keep],
+        "side": np.where(side[keep] > 0, "LONG", "SHORT"),
+        "bars": (ends - bounds)[keep],
+        "return": np.expm1(net[keep]),
+        "open": still_open[keep],
+    })
+
+
+def compute_stats(equity, pos, ret, trades, periods_per_year, initial=1.0):
+    bar_ret = np.diff(equity, prepend=initial) / np.concatenate(([initial], equity[:-1]))
+    peak = np.maximum.accumulate(np.maximum(equity, initial))
+    drawdown = equity / peak - 1
+
+    std = bar_ret.std()
+    sharpe = bar_ret.mean() / std * np.sqrt(periods_per_year) if std > 0 else 0.0
+
+    wins = trades["return"][trades["return"] > 0]
+    losses = trades["return"][trades["return"] <= 0]
+    loss_sum = -losses.sum()
+
+    return {
+        "bars": int(len(equity)),
+        "total_return": float(equity[-1] / initial - 1) if len(equity) else 0.0,
+        "buy_hold_return": float(np.prod(1 + ret) - 1),
+        "max_drawdown": float(drawdown.min()) if len(drawdown) else 0.0,
+        "sharpe": float(sharpe),
+        "exposure": float((pos != 0).mean()) if len(pos) else 0.0,
+        "trades": int(len(trades)),
+        "win_rate": float(len(wins) / len(trades)) if len(trades) else 0.0,
+        "avg_trade": float(trades["return"].mean()) if len(trades) else 0.0,
+        "best_trade": float(trades["return"].max()) if len(trades) else 0.0,
+        "worst_trade": float(trades["return"].min()) if len(trades) else 0.0,
+        "profit_factor": float(wins.sum() / loss_sum) if loss_sum > 0 else float("inf") if len(wins) else 0.0,
+        "avg_bars_held": float(trades["bars"].mean()) if len(trades) else 0.0,
+    }
+
+
+# ======================================================
+# BACKTEST
+# ======================================================
+
+def run_backtest(df, strategy="final", interval=None, fee_bps=FEE_BPS,
+                 slippage_bps=SLIPPAGE_BPS, long_only=False, sensitivity=1.0, initial=1.0):
+    """
+    Replay seluruh frame OHLCV dengan logika keputusan yang sama seperti
+    dashboard. Return dict:
+    - stats : ringkasan (return, drawdown, sharpe, win rate, ...)
+    - equity: frame per bar (date, close, decision, position, equity)
+    - trades: frame per trade (indeks bar entry/exit, side, return)
+    """
+    decide, mapping = STRATEGIES[strategy]
+    if strategy == "final":
+        decision = decide(df, sensitivity)
+    else:
+        decision = decide(df)
+
+    target = decisions_to_target(decision, mapping, long_only)
+
+    open_ = df["open"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    pos, ret, cost, equity = simulate(open_, close, target, fee_bps, slippage_bps, initial)
+    trades = extract_trades(pos, ret, fee_bps, slippage_bps)
+
+    interval = interval or df.attrs.get("interval", "1m")
+    periods = YEAR_MS / INTERVAL_MS.get(interval, 60_000)
+    stats = compute_stats(equity, pos, ret, trades, periods, initial)
+
+    dates = df["date"].to_numpy() if "date" in df.columns else np.arange(len(df))
+    if len(trades):
+        trades["entry_date"] = dates[trades["entry"].to_numpy()]
+        trades["exit_date"] = dates[np.minimum(trades["exit"].to_numpy(), len(df) - 1)]
+
+    return {
+        "symbol": df.attrs.get("symbol"),
+        "strategy": strategy,
+        "stats": stats,
+        "equity": pd.DataFrame({
+            "date": dates,
+            "close": close,
+            "decision": pd.Series(decision, dtype=object),
+            "position": pos,
+            "equity": equity,
+        }),
+        "trades": trades,
+    }
+
+
+def load_history(symbol, interval, bars=None):
+    """Histori dari candle store (isi dulu lewat sync_mexc / backfill_mexc)."""
+    from data.candle_store import get_candle_store
+
+    df = get_candle_store().read(symbol, interval, limit=bars)
+    return canonical_ohlcv(df, symbol, interval)
+
+
+def backtest_symbol(symbol, interval="1m", strategy="final", bars=None, **kwargs):
+    return run_backtest(load_history(symbol, interval, bars), strategy, interval, **kwargs)
+
+
+def backtest_many(symbols, interval="1m", strategy="final", bars=None, workers=None, **kwargs):
+    """Satu proses per simbol (CPU-bound) → dict symbol → hasil run_backtest."""
+    workers = workers or min(len(symbols), os.cpu_count() or 1)
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            sym: pool.submit(backtest_symbol, sym, interval, strategy, bars, **kwargs)
+            for sym in symbols
+        }
+        for sym, fut in futures.items():
+            try:
+                results[sym] = fut.result()
+            except Exception as e:
+                print("Backtest Error:", sym, e)
+
+    return results
+
+
+def summary_table(results):
+    """Stats beberapa simbol → satu frame (index = symbol)."""
+    return pd.DataFrame({sym: res["stats"] for sym, res in results.items()}).T
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _synthetic(n, seed=0, symbol="BTCUSDT"):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.0006, n)) * close
+    raw = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": open_,
+        "high": np.maximum(open_, close) + spread * rng.random(n),
+        "low": np.minimum(open_, close) - spread * rng.random(n),
+        "close": close,
+        "volume": rng.random(n) * 10,
+    })
+    return canonical_ohlcv(raw, symbol, "1m")
+
+
+def _bench_symbol(seed):
+    return run_backtest(_synthetic(525_600, seed, f"SYM{seed}"), "final", "1m")["stats"]
+
+
+if __name__ == "__main__":
+    import time
+
+    df = _synthetic(525_600)
+
+    for strategy in STRATEGIES:
+        t0 = time.perf_counter()
+        res = run_backtest(df, strategy, "1m")
+        dt = time.perf_counter() - t0
+        s = res["stats"]
+        print(
+            f"{strategy:8s} {s['bars']:,} bar 1m dalam {dt:.2f}s · "
+            f"return {s['total_return']:+.2%} · maxDD {s['max_drawdown']:.2%} · "
+            f"{s['trades']:,} trades · win {s['win_rate']:.1%}"
+        )
+
+    # cek kesetaraan dengan engine per-bar di beberapa titik
+    from components.ai_final_engine import final_decision_engine
+
+    ai = AIPredictor()
+    small = df.iloc[:400]
+    dec = final_decisions(small)
+    for i in (10, 57, 123, 250, 399):
+        prefix = small.iloc[:i + 1]
+        assert final_decision_engine(prefix, ai.predict(prefix))[0] == dec[i]
+    print("final_decisions == final_decision_engine per bar ✔")
+
+    # frame mentah dengan baris OHLC NaN: output history tetap sepanjang df
+    from components.ai_reversal import detect_reversal
+    from components.reversal_premium import premium_reversal, premium_reversal_history
+
+    raw = pd.DataFrame({c: df[c].to_numpy(copy=True)[:500] for c in df.columns})
+    raw.loc[[0, 120, 121], "close"] = np.nan
+    rev = detect_reversal_history(raw)
+    prem = premium_reversal_history(raw)
+    assert len(rev) == len(prem) == len(raw)
+    for i in (0, 3, 30, 119, 120, 121, 122, 499):
+        prefix = raw.iloc[:i + 1]
+        assert detect_reversal(prefix)[0] == rev["signal"].iloc[i], i
+        p, d, c, _ = premium_reversal(prefix)
+        assert (p, d, c) == tuple(prem.iloc[i][["prob", "direction", "confidence"]]), i
+    for strategy in STRATEGIES:
+        assert len(run_backtest(raw, strategy, "1m")["equity"]) == len(raw)
+    print("history dengan baris NaN == engine per bar, run_backtest 500 bar ✔")
+
+    seeds = list(range(4))
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(seeds)) as pool:
+        list(pool.map(_bench_symbol, seeds))
+    print(f"{len(seeds)} simbol × 525,600 bar (process pool) dalam {time.perf_counter() - t0:.2f}s")
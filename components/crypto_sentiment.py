@@ -1,9 +1,12 @@
 import streamlit as st
-import requests
-import yfinance as yf
 import numpy as np
 import pandas as pd
 
+from data.http_client import http_get
+from data.yf_planner import DownloadPlanner, fetch_history
+from data.swr_cache import SWRCache, format_age
+from data.fanout import fan_out, PANEL_DEADLINE
+
 
 # ===================== HELPERS =====================
 
@@ -30,22 +33,46 @@ def _safe_float(x):
 
 # ===================== API FUNCTIONS =====================
 
+# Fear & Greed berubah sekali sehari, dominance bergerak lambat →
+# disajikan dari cache, refresh di background saat sudah basi.
+FEAR_GREED_MAX_AGE = 60 * 60
+DOMINANCE_MAX_AGE = 10 * 60
+
+
+def _fetch_fear_greed():
+    url = "https://api.alternative.me/fng/?limit=1&format=json"
+    data = http_get(url, timeout=5).json()
+    value = int(data["data"][0]["value"])
+    rating = data["data"][0]["value_classification"]
+    return value, rating
+
+
+def _fetch_btc_dominance():
+    url = "https://api.coingecko.com/api/v3/global"
+    data = http_get(url, timeout=5).json()
+    dominance = data["data"]["market_cap_percentage"]["btc"]
+    return round(float(dominance), 2)
+
+
+_FEAR_GREED = SWRCache(_fetch_fear_greed, FEAR_GREED_MAX_AGE)
+_DOMINANCE = SWRCache(_fetch_btc_dominance, DOMINANCE_MAX_AGE)
+
+
 def get_fear_greed():
-    try:
-        url = "https://api.alternative.me/fng/?limit=1&format=json"
-        data = requests.get(url, timeout=5).json()
-        value = int(data["data"][0]["value"])
-        rating = data["data"][0]["value_classification"]
-        return value, rating
-    except Exception:
+    value, _ = _FEAR_GREED.get()
+    if value is None:
         return None, None
+    return value
 
 
-def get_coin_momentum(symbol: str):
+def _yf_ticker(symbol: str):
+    return symbol.replace("USDT", "") + "-USD"
+
+
+def get_coin_momentum(symbol: str, planner=None):
     """Momentum 7 hari untuk coin spesifik (BTCUSDT, ETHUSDT, dll)."""
     try:
-        ticker = symbol.replace("USDT", "") + "-USD"
-        df = yf.download(ticker, period="10d", interval="1d")
+        df = fetch_history(_yf_ticker(symbol), "10d", planner=planner)
 
         if df.empty or len(df) < 7:
             return None
@@ -57,11 +84,10 @@ def get_coin_momentum(symbol: str):
         return None
 
 
-def get_volume_pulse(symbol: str):
+def get_volume_pulse(symbol: str, planner=None):
     """Volume pulse terhadap rata-rata ~20 hari."""
     try:
-        ticker = symbol.replace("USDT", "") + "-USD"
-        df = yf.download(ticker, period="20d", interval="1d")
+        df = fetch_history(_yf_ticker(symbol), "20d", planner=planner)
 
         if df.empty:
             return None
@@ -82,13 +108,18 @@ def get_btc_dominance(symbol: str):
     if not symbol.upper().startswith("BTC"):
         return None
 
-    try:
-        url = "https://api.coingecko.com/api/v3/global"
-        data = requests.get(url, timeout=5).json()
-        dominance = data["data"]["market_cap_percentage"]["btc"]
-        return round(float(dominance), 2)
-    except Exception:
-        return None
+    value, _ = _DOMINANCE.get()
+    return value
+
+
+def age_badge(cache):
+    """Badge umur data; kuning bila sudah basi (upstream lambat/down)."""
+    age = cache.age()
+    if age is None:
+        return ""
+    if cache.is_stale():
+        return badge(f"⏱ {format_age(age)} ago · stale", "#b7950b")
+    return badge(f"⏱ {format_age(age)} ago", "#34495e")
 
 
 # ===================== UI COMPONENTS =====================
@@ -125,11 +156,26 @@ def premium_card(title, value, sub_html="", icon="💠"):
 def render_crypto_sentiment(symbol: str):
     st.subheader("🧭 Crypto Market Sentiment (Premium)")
 
-    # ---- Ambil data mentah ----
-    fear_raw, fear_label = get_fear_greed()
-    momentum_raw = get_coin_momentum(symbol)
-    pulse_raw = get_volume_pulse(symbol)
-    dominance_raw = get_btc_dominance(symbol)
+    # ---- Ambil data mentah (paralel, satu deadline per panel) ----
+    # momentum (10d) & volume pulse (20d) berbagi satu download superset
+    planner = DownloadPlanner()
+    planner.request(_yf_ticker(symbol), "10d")
+    planner.request(_yf_ticker(symbol), "20d")
+
+    results, missed = fan_out({
+        "fear": get_fear_greed,
+        "momentum": lambda: get_coin_momentum(symbol, planner),
+        "pulse": lambda: get_volume_pulse(symbol, planner),
+        "dominance": lambda: get_btc_dominance(symbol),
+    }, deadline=PANEL_DEADLINE)
+
+    fear_raw, fear_label = results["fear"] or (None, None)
+    momentum_raw = results["momentum"]
+    pulse_raw = results["pulse"]
+    dominance_raw = results["dominance"]
+
+    def na(name):
+        return "N/A/stale" if name in missed else "N/A"
 
     # ---- Normalisasi ke scalar float / None ----
     fear = _safe_float(fear_raw)
@@ -155,7 +201,7 @@ def render_crypto_sentiment(symbol: str):
 
     # === CARD 1: Fear & Greed ===
     with c1:
-        val = f"{int(fear)}/100" if fear is not None else "N/A"
+        val = f"{int(fear)}/100" if fear is not None else na("fear")
         if fear is not None:
             if fear > 55:
                 col = "#27ae60"
@@ -166,19 +212,22 @@ def render_crypto_sentiment(symbol: str):
         else:
             col = "#7f8c8d"
 
-        sub = badge(fear_label or "Unknown", col)
+        sub = badge(fear_label or "Unknown", col) + " " + age_badge(_FEAR_GREED)
         html = premium_card("Fear & Greed Index", val, sub_html=sub, icon=mood_icon)
         st.markdown(html, unsafe_allow_html=True)
 
     # === CARD 2: BTC Dominance (hanya BTC) ===
     with c2:
-        val = f"{dominance:.2f}%" if dominance is not None else "N/A"
-        html = premium_card("BTC Dominance", val, "Market Strength Indicator", icon="🧲")
+        val = f"{dominance:.2f}%" if dominance is not None else na("dominance")
+        sub = "Market Strength Indicator"
+        if dominance is not None:
+            sub += "<br>" + age_badge(_DOMINANCE)
+        html = premium_card("BTC Dominance", val, sub, icon="🧲")
         st.markdown(html, unsafe_allow_html=True)
 
     # === CARD 3: Coin Momentum ===
     with c3:
-        val = f"{momentum:.2f}%" if momentum is not None else "N/A"
+        val = f"{momentum:.2f}%" if momentum is not None else na("momentum")
         col = "#2ecc71" if (momentum is not None and momentum > 0) else "#e74c3c"
         sub = badge(
             "Bullish" if (momentum is not None and momentum > 0) else "Bearish",
@@ -190,7 +239,7 @@ def render_crypto_sentiment(symbol: str):
 
     # === CARD 4: Volume Pulse ===
     with c4:
-        val = f"{pulse:.2f}%" if pulse is not None else "N/A"
+        val = f"{pulse:.2f}%" if pulse is not None else na("pulse")
         col = "#2ecc71" if (pulse is not None and pulse > 0) else "#e74c3c"
         sub = badge(
             "High Liquidity"
@@ -1,7 +1,8 @@
-import yfinance as yf
 import numpy as np
 import pandas as pd
 
+from data.macro_service import get_macro
+
 
 def get_foreign_flow():
     """
@@ -15,7 +16,7 @@ def get_foreign_flow():
         # -------------------------------
         # 1) EIDO ETF (iShares Indonesia ETF)
         # -------------------------------
-        eido = yf.download("EIDO", period="3mo", interval="1d")
+        eido = get_macro("EIDO", period="3mo")
 
         if not eido.empty and len(eido) >= 2:
             eido_change = (eido["Close"].iloc[-1] - eido["Close"].iloc[-2]) / eido["Close"].iloc[-2] * 100
@@ -31,7 +32,7 @@ def get_foreign_flow():
         # -------------------------------
         # 2) USDIDR Strength
         # -------------------------------
-        usdidr = yf.download("USDIDR=X", period="7d", interval="1d")
+        usdidr = get_macro("USDIDR=X", period="7d")
         if not usdidr.empty and len(usdidr) >= 2:
             rupiah_change = (usdidr["Close"].iloc[-2] - usdidr["Close"].iloc[-1]) / usdidr["Close"].iloc[-2] * 100
         else:
@@ -46,7 +47,7 @@ def get_foreign_flow():
         # -------------------------------
         # 3) IHSG Volume Expansion
         # -------------------------------
-        ihsg = yf.download("^JKSE", period="30d", interval="1d")
+        ihsg = get_macro("^JKSE", period="30d")
 
         if not ihsg.empty and len(ihsg) >= 20:
             vol = ihsg["Volume"].iloc[-1]
@@ -0,0 +1,245 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# INDICATOR SPECS
+# ======================================================
+# Tiap spec: fungsi(ctx) → Series. `ctx` adalah IndicatorSet sehingga spec
+# boleh memakai spec lain (mis. MACD dari EMA12/EMA26) tanpa hitung ulang.
+# Semantik sama persis dengan implementasi lama di masing-masing komponen.
+
+def _ema(span):
+    return lambda ctx: ctx.col("close").ewm(span=span, adjust=False).mean()
+
+
+def _delta(ctx):
+    return ctx.col("close").diff()
+
+
+def _avg_gain(ctx):
+    return ctx["delta"].clip(lower=0).rolling(14).mean()
+
+
+def _avg_loss(ctx):
+    return (-ctx["delta"].clip(upper=0)).rolling(14).mean()
+
+
+def _rsi(ctx):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = ctx["avg_gain14"] / ctx["avg_loss14"]
+        return 100 - (100 / (1 + rs))
+
+
+def _macd(ctx):
+    return ctx["ema12"] - ctx["ema26"]
+
+
+def _macd_signal(ctx):
+    return ctx["macd"].ewm(span=9, adjust=False).mean()
+
+
+def _bb_std(ctx):
+    return ctx.col("close").rolling(20).std()
+
+
+SPECS = {
+    "ema12": _ema(12),
+    "ema20": _ema(20),
+    "ema26": _ema(26),
+    "ema50": _ema(50),
+    "ema100": _ema(100),
+    "ema200": _ema(200),
+    # smart money: ewm(span=50) default (adjust=True)
+    "ema50_adj": lambda ctx: ctx.col("close").ewm(span=50).mean(),
+
+    # RSI 14 versi SMA (rolling mean gain/loss), dipakai semua komponen
+    "delta": _delta,
+    "avg_gain14": _avg_gain,
+    "avg_loss14": _avg_loss,
+    "rsi14": _rsi,
+
+    "macd": _macd,
+    "macd_signal": _macd_signal,
+    "macd_hist": lambda ctx: ctx["macd"] - ctx["macd_signal"],
+
+    "bb_mid": lambda ctx: ctx.col("close").rolling(20).mean(),
+    "bb_std": _bb_std,
+    "bb_up": lambda ctx: ctx["bb_mid"] + 2 * ctx["bb_std"],
+    "bb_low": lambda ctx: ctx["bb_mid"] - 2 * ctx["bb_std"],
+
+    "vol_ma20": lambda ctx: ctx.col("volume").rolling(20).mean(),
+    "range": lambda ctx: ctx.col("high") - ctx.col("low"),
+    "range_ma10": lambda ctx: ctx["range"].rolling(10).mean(),
+}
+
+# alias nama kolom OHLCV yang diterima (sama dengan normalizer komponen)
+_CANDIDATES = {
+    "open": ["open", "o"],
+    "high": ["high", "h"],
+    "low": ["low", "l"],
+    "close": ["close", "c", "price", "last"],
+    "volume": ["volume", "vol", "qty"],
+}
+
+# jumlah frame (symbol, interval, bar terakhir) yang disimpan
+CACHE_SIZE = 32
+
+
+def _resolve(df):
+    """{std_name: Series} untuk kolom OHLCV yang ada di frame."""
+    lower = {c.lower(): c for c in df.columns}
+    cols = {}
+    for std, poss in _CANDIDATES.items():
+        for p in poss:
+            if p in lower:
+                cols[std] = df[lower[p]]
+                break
+    return cols
+
+
+class IndicatorSet:
+    """
+    Indikator untuk satu frame candle, dihitung lazy & tepat sekali.
+    Hasil berupa Series read-only (array non-writeable) yang di-share
+    ke semua komponen, jadi komponen tidak perlu copy DataFrame.
+    """
+
+    def __init__(self, df):
+        self._cols = _resolve(df)
+        self.index = df.index
+        self._series = {}
+        self.computed = 0
+        self._lock = threading.RLock()
+
+    def col(self, name):
+        """Kolom OHLCV mentah (float64) sebagai Series read-only."""
+        if name not in self._cols:
+            raise KeyError(f"Missing column: {name}")
+        with self._lock:
+            key = f"_{name}"
+            if key not in self._series:
+                s = pd.to_numeric(self._cols[name], errors="coerce").astype(np.float64)
+                self._series[key] = self._freeze(s)
+            return self._series[key]
+
+    @staticmethod
+    def _freeze(s):
+        arr = s.to_numpy(dtype=np.float64)
+        # kolom frame kanonik sudah float64 read-only → tidak perlu copy
+        if arr.flags.writeable:
+            arr = arr.copy()
+            arr.flags.writeable = False
+        return pd.Series(arr, index=s.index, name=s.name, copy=False)
+
+    def __getitem__(self, name):
+        if name in _CANDIDATES:
+            return self.col(name)
+        with self._lock:
+            if name not in self._series:
+                if name not in SPECS:
+                    raise KeyError(f"Unknown indicator: {name}")
+                s = self._freeze(SPECS[name](self))
+                s.name = name
+                self._series[name] = s
+                self.computed += 1
+            return self._series[name]
+
+    def last(self, name):
+        return self[name].iloc[-1]
+
+
+class IndicatorEngine:
+    """
+    Cache IndicatorSet per (symbol, interval, bar terakhir).
+
+    Key memakai df.attrs (diisi load_candles) plus panjang frame dan
+    nilai bar terakhir, sehingga bar yang masih terbentuk (close berubah)
+    menghasilkan set baru, sedangkan satu refresh memakai set yang sama.
+    Frame tanpa attrs symbol/interval (mis. dibuat manual, alt-bars) bisa
+    punya panjang & bar terakhir yang sama → key ditambah hash kolom OHLCV.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._sets = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(df):
+        cols = _resolve(df)
+        dates = df["date"] if "date" in df.columns else df.index.to_series()
+        if len(df) == 0:
+            return (df.attrs.get("symbol"), df.attrs.get("interval"), 0)
+        key = (
+            df.attrs.get("symbol"),
+            df.attrs.get("interval"),
+            len(df),
+            dates.iloc[0],
+            dates.iloc[-1],
+            tuple(float(c.iloc[-1]) for c in cols.values()),
+        )
+        if key[0] is None or key[1] is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for c in cols.values():
+                values = pd.to_numeric(c, errors="coerce").to_numpy(dtype=np.float64)
+                digest.update(np.ascontiguousarray(values).tobytes())
+            key += (digest.digest(),)
+        return key
+
+    def get(self, df):
+        key = self.key(df)
+        with self._lock:
+            ind = self._sets.get(key)
+            if ind is not None:
+                self._sets.move_to_end(key)
+                self.hits += 1
+                return ind
+
+            ind = IndicatorSet(df)
+            self._sets[key] = ind
+            self.misses += 1
+            while len(self._sets) > self.size:
+                self._sets.popitem(last=False)
+            return ind
+
+
+_ENGINE = IndicatorEngine()
+
+
+def get_indicator_engine():
+    return _ENGINE
+
+
+def indicators(df):
+    """Shortcut: IndicatorSet (shared, read-only) untuk frame candle ini."""
+    return _ENGINE.get(df)
+
+
+# ======================================================
+# CACHE KEY CHECK
+# ======================================================
+
+if __name__ == "__main__":
+    n = 60
+    base = pd.DataFrame({
+        "open": np.arange(n) + 1.0,
+        "high": np.arange(n) + 2.0,
+        "low": np.arange(n) + 0.0,
+        "close": np.arange(n) + 1.0,
+        "volume": np.ones(n),
+    })
+    # panjang & bar terakhir sama, histori berbeda, tanpa attrs symbol/interval
+    other = base.copy()
+    other.loc[:n - 2, "close"] *= 1.5
+
+    engine = IndicatorEngine()
+    a, b = engine.get(base), engine.get(other)
+    assert a is not b and a["ema20"].iloc[-1] != b["ema20"].iloc[-1]
+    assert engine.get(base.copy()) is a
+    print("frame tanpa attrs dengan bar terakhir sama → entry cache terpisah ✔")
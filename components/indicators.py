@@ -4,6 +4,8 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from components.indicator_engine import indicators
+
 # ======================================================
 # INDICATOR FUNCTIONS
 # ======================================================
@@ -37,6 +39,30 @@ def Bollinger(series, period=20, dev=2):
     lower = ma - dev * std
     return upper, ma, lower
 
+def RSI_WILDER(series, period=14):
+    """RSI Wilder: seed SMA `period` delta pertama, lalu smoothing 1/period."""
+    delta = series.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    def smooth(x):
+        seeded = x.iloc[period:].copy()
+        if len(seeded):
+            seeded.iloc[0] = x.iloc[1:period + 1].mean()
+        return seeded.ewm(alpha=1 / period, adjust=False).mean().reindex(x.index)
+
+    rs = smooth(gain) / smooth(loss)
+    return 100 - (100 / (1 + rs))
+
+def ATR(df, period=14):
+    prev = df["close"].shift()
+    tr = pd.concat([
+        df["high"] - df["low"],
+        (df["high"] - prev).abs(),
+        (df["low"] - prev).abs(),
+    ], axis=1).max(axis=1)
+    return tr.ewm(alpha=1 / period, adjust=False).mean()
+
 # ======================================================
 # MAIN RENDER
 # ======================================================
@@ -44,24 +70,14 @@ def Bollinger(series, period=20, dev=2):
 def render_indicators(df: pd.DataFrame):
     st.subheader("📊 Technical Indicators - Premium")
 
-    df = df.copy()
-
     # === SAFETY CHECK ===
     required_cols = {"open", "high", "low", "close"}
     if not required_cols.issubset(df.columns):
         st.error("Data tidak lengkap untuk indikator.")
         return
 
-    # === CALCULATIONS ===
-    df["EMA20"] = EMA(df["close"], 20)
-    df["EMA50"] = EMA(df["close"], 50)
-    df["EMA100"] = EMA(df["close"], 100)
-    df["EMA200"] = EMA(df["close"], 200)
-
-    df["BB_UP"], df["BB_MID"], df["BB_LOW"] = Bollinger(df["close"])
-
-    df["RSI"] = RSI(df["close"])
-    df["MACD"], df["MACD_SIGNAL"], df["MACD_HIST"] = MACD(df["close"])
+    # === CALCULATIONS (shared indicator engine, read-only) ===
+    ind = indicators(df)
 
     # ======================================================
     # FIGURE (2 PANELS ONLY)
@@ -91,19 +107,19 @@ def render_indicators(df: pd.DataFrame):
         decreasing_line_color="#e74c3c"
     ), row=1, col=1)
 
-    fig.add_trace(go.Scatter(x=df.index, y=df["EMA20"], name="EMA20", line=dict(color="gold", width=1)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df["EMA50"], name="EMA50", line=dict(color="#3498db", width=1)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df["EMA100"], name="EMA100", line=dict(color="#9b59b6", width=1)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=df.index, y=df["EMA200"], name="EMA200", line=dict(color="#e74c3c", width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=ind["ema20"], name="EMA20", line=dict(color="gold", width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=ind["ema50"], name="EMA50", line=dict(color="#3498db", width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=ind["ema100"], name="EMA100", line=dict(color="#9b59b6", width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=ind["ema200"], name="EMA200", line=dict(color="#e74c3c", width=1)), row=1, col=1)
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df["BB_UP"],
+        x=df.index, y=ind["bb_up"],
         name="BB Upper",
         line=dict(color="rgba(155,89,182,0.4)", dash="dot")
     ), row=1, col=1)
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df["BB_LOW"],
+        x=df.index, y=ind["bb_low"],
         name="BB Lower",
         line=dict(color="rgba(155,89,182,0.4)", dash="dot")
     ), row=1, col=1)
@@ -113,7 +129,7 @@ def render_indicators(df: pd.DataFrame):
     # =====================
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df["RSI"],
+        x=df.index, y=ind["rsi14"],
         name="RSI",
         line=dict(color="#1abc9c", width=1.5)
     ), row=2, col=1)
@@ -123,19 +139,19 @@ def render_indicators(df: pd.DataFrame):
     fig.add_hline(y=50, line_dash="dot", line_color="gray", row=2, col=1)
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df["MACD"],
+        x=df.index, y=ind["macd"],
         name="MACD",
         line=dict(color="#3498db", width=1)
     ), row=2, col=1)
 
     fig.add_trace(go.Scatter(
-        x=df.index, y=df["MACD_SIGNAL"],
+        x=df.index, y=ind["macd_signal"],
         name="Signal",
         line=dict(color="orange", width=1)
     ), row=2, col=1)
 
     fig.add_trace(go.Bar(
-        x=df.index, y=df["MACD_HIST"],
+        x=df.index, y=ind["macd_hist"],
         name="Histogram",
         marker_color="rgba(255,255,255,0.25)"
     ), row=2, col=1)
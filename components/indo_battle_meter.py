@@ -1,7 +1,8 @@
 import streamlit as st
-import yfinance as yf
 import numpy as np
 
+from data.macro_service import get_macro
+
 
 def _safe_float(x):
     try:
@@ -16,7 +17,7 @@ def _safe_float(x):
 def _get_change(ticker: str):
     """Aman mengambil perubahan % harian via yfinance."""
     try:
-        df = yf.download(ticker, period="7d", interval="1d")
+        df = get_macro(ticker, period="7d")
         if df is None or df.empty:
             return None
 
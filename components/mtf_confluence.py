@@ -0,0 +1,82 @@
+import pandas as pd
+import streamlit as st
+
+from components.ai_predictor import AIPredictor
+from components.reversal_premium import premium_reversal
+from data.data_loader import backfill_running, load_mtf
+from data.resample import BASE_INTERVAL
+
+# semua timeframe diturunkan dari satu seri base 1m (data.resample)
+MTF_INTERVALS = ["1m", "5m", "15m", "1h", "4h", "1d"]
+
+ai = AIPredictor()
+
+
+def mtf_confluence(frames):
+    """
+    AIPredictor.predict + premium_reversal di setiap timeframe.
+    Return (tabel per timeframe, bias gabungan, skor -1..1).
+    """
+    rows = []
+    for interval, df in frames.items():
+        if len(df) == 0:
+            continue   # base belum cukup untuk satu bar penuh (backfill berjalan)
+        trend = ai.predict(df)
+        prob, rev_dir, rev_conf, _ = premium_reversal(df)
+        rows.append({
+            "TF": interval,
+            "Bars": len(df),
+            "Trend": trend["direction"],
+            "Prob Up": trend["prob_up"],
+            "Confidence": trend["confidence"],
+            "Reversal": rev_dir,
+            "Reversal %": prob,
+        })
+
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table, "N/A", 0.0
+
+    votes = table["Trend"].map({"UP": 1, "DOWN": -1}).fillna(0)
+    score = float(votes.mean())
+
+    if score >= 0.5:
+        bias = "BULLISH"
+    elif score <= -0.5:
+        bias = "BEARISH"
+    else:
+        bias = "MIXED"
+
+    return table, bias, score
+
+
+def render_mtf_confluence(symbol, intervals=MTF_INTERVALS):
+    st.subheader("🧭 Multi-Timeframe Confluence")
+
+    try:
+        frames = load_mtf(symbol, intervals)
+    except Exception as e:
+        print("MTF Error:", e)
+        st.warning("Data multi-timeframe belum tersedia.")
+        return
+
+    table, bias, score = mtf_confluence(frames)
+    if backfill_running(symbol, BASE_INTERVAL):
+        st.caption("⏳ Histori 1m sedang dilengkapi di background, timeframe besar belum penuh.")
+    if table.empty:
+        st.warning("Data multi-timeframe belum tersedia.")
+        return
+
+    color = "🟢" if bias == "BULLISH" else "🔴" if bias == "BEARISH" else "⚪"
+    aligned = int((table["Trend"] == ("UP" if score >= 0 else "DOWN")).sum())
+    st.info(f"{color} Confluence: **{bias}** ({aligned}/{len(table)} timeframe searah)")
+
+    st.dataframe(
+        table,
+        hide_index=True,
+        column_config={
+            "Prob Up": st.column_config.ProgressColumn("Prob Up", min_value=0, max_value=1, format="%.2f"),
+            "Confidence": st.column_config.NumberColumn(format="%.2f"),
+            "Reversal %": st.column_config.NumberColumn(format="%d%%"),
+        },
+    )
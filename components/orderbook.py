@@ -1,17 +1,93 @@
 import streamlit as st
-import requests
+import pandas as pd
+import plotly.graph_objects as go
+
+from data.http_client import http_get
+from data.order_book import get_order_book
+from data.depth_history import get_depth_history
+
+# level yang diambil dari REST snapshot (MEXC maks 5000) & yang ditampilkan
+DEPTH_LIMIT = 100
+DISPLAY_LEVELS = 20
+
+
+def _side_frame(prices, sizes, cum):
+    return pd.DataFrame({"price": prices, "qty": sizes, "cum_qty": cum})
+
 
 def render_orderbook(symbol):
     st.subheader("📚 Orderbook")
 
-    url = f"https://api.mexc.com/api/v3/depth?symbol={symbol}&limit=20"
-    data = requests.get(url).json()
+    url = f"https://api.mexc.com/api/v3/depth?symbol={symbol}&limit={DEPTH_LIMIT}"
+    try:
+        resp = http_get(url, timeout=5)
+        if resp.status_code != 200:
+            raise ValueError(f"MEXC HTTP {resp.status_code}: {resp.text[:200]}")
+        data = resp.json()
+        # body error MEXC (mis. {"code": ..., "msg": ...}) tidak punya bids/asks
+        if not isinstance(data, dict) or "bids" not in data or "asks" not in data:
+            raise ValueError(f"MEXC API error: {str(data)[:200]}")
+    except Exception as e:
+        st.warning(f"Orderbook tidak tersedia: {e}")
+        return
+
+    # snapshot di-diff in place terhadap book sebelumnya
+    book = get_order_book(symbol)
+    changed = book.apply_snapshot(data["bids"], data["asks"])
+
+    top = book.top_of_book()
+    if top["bid"] is not None and top["ask"] is not None:
+        spread = top["ask"] - top["bid"]
+        mid = (top["ask"] + top["bid"]) / 2
+        st.caption(
+            f"Bid {top['bid']:g} · Ask {top['ask']:g} · Spread {spread:g} "
+            f"({spread / mid * 10_000:.2f} bps) · {changed} level berubah"
+        )
 
-    bids = data["bids"]
-    asks = data["asks"]
+    depth = book.depth(DISPLAY_LEVELS)
 
     st.write("**BIDS**")
-    st.dataframe(bids)
+    st.dataframe(_side_frame(*depth["bids"]))
 
     st.write("**ASKS**")
-    st.dataframe(asks)
+    st.dataframe(_side_frame(*depth["asks"]))
+
+    # snapshot masuk ring buffer → analitik order flow berbasis waktu
+    history = get_depth_history(symbol)
+    history.record(book)
+    render_orderflow(history)
+
+
+def render_orderflow(history):
+    st.write("**ORDER FLOW**")
+
+    if history.count < 2:
+        st.caption("Depth history belum cukup. Tunggu beberapa refresh.")
+        return
+
+    imb = history.imbalance()
+    last = imb[-1]
+    icon = "🟢" if last > 0.2 else "🔴" if last < -0.2 else "⚪"
+    st.markdown(f"{icon} Imbalance: **{last:+.2f}** (avg {imb.mean():+.2f}, {history.count} snapshot)")
+
+    walls = history.walls()
+    if walls:
+        st.dataframe(pd.DataFrame(walls[:5]))
+    else:
+        st.caption("Tidak ada liquidity wall signifikan.")
+
+    times, y, z = history.heatmap()
+    fig = go.Figure(go.Heatmap(
+        x=pd.to_datetime(times, unit="s"),
+        y=y,
+        z=z,
+        colorscale="Viridis",
+        showscale=False,
+    ))
+    fig.update_layout(
+        template="plotly_dark",
+        height=260,
+        margin=dict(l=5, r=5, t=10, b=5),
+        yaxis_title="bps dari mid",
+    )
+    st.plotly_chart(fig, use_container_width=True)
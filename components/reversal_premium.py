@@ -1,41 +1,14 @@
 import numpy as np
 import pandas as pd
 
+from components.indicator_engine import indicators
+from data.ohlcv import expand_history, normalize_ohlcv
+
 # ============================================================
 #  UTIL — AUTO NORMALIZE OHLCV
 # ============================================================
-
-def normalize_ohlcv(df: pd.DataFrame):
-    df = df.copy()
-    lower = {c.lower(): c for c in df.columns}
-
-    mapping = {
-        "Open":   ["open", "o"],
-        "High":   ["high", "h"],
-        "Low":    ["low", "l"],
-        "Close":  ["close", "c", "price", "last"],
-        "Volume": ["volume", "vol", "qty"],
-    }
-
-    remap = {}
-    for std, poss in mapping.items():
-        for p in poss:
-            if p in lower:
-                remap[std] = lower[p]
-                break
-
-    # Fail-safe: if something missing
-    for key in ["Open", "High", "Low", "Close", "Volume"]:
-        if key not in remap:
-            raise KeyError(f"Missing column: {key}")
-
-    df = df.rename(columns={v: k for k, v in remap.items()})
-
-    # numeric ensure
-    for col in ["Open", "High", "Low", "Close", "Volume"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    return df.dropna(subset=["Open", "Close"])
+# normalize_ohlcv kini satu implementasi bersama (data.ohlcv); frame
+# kanonik dari load_candles lewat fast path tanpa copy.
     
 
 # ============================================================
@@ -65,12 +38,8 @@ def premium_reversal(df: pd.DataFrame):
     # ------------------------------------------------------------
     # 1) RSI Proxy
     # ------------------------------------------------------------
-    df["chg"] = df["Close"].diff()
-    df["up"]  = df["chg"].clip(lower=0)
-    df["dn"]  = -df["chg"].clip(upper=0)
-    rs = df["up"].rolling(14).mean() / df["dn"].rolling(14).mean()
-    rsi = 100 - (100 / (1 + rs))
-    last_rsi = rsi.iloc[-1]
+    ind = indicators(df)
+    last_rsi = ind.last("rsi14")
 
     # ------------------------------------------------------------
     # 2) Candle Body Power
@@ -81,7 +50,7 @@ def premium_reversal(df: pd.DataFrame):
     # ------------------------------------------------------------
     # 3) Volume Anomaly (vs 20 bars)
     # ------------------------------------------------------------
-    vol_base = df["Volume"].rolling(20).mean().iloc[-1]
+    vol_base = ind.last("vol_ma20")
     vol_ratio = (
         df["Volume"].iloc[-1] / vol_base if vol_base and not np.isnan(vol_base) else 1
     )
@@ -89,9 +58,8 @@ def premium_reversal(df: pd.DataFrame):
     # ------------------------------------------------------------
     # 4) Volatility Compression / Expansion
     # ------------------------------------------------------------
-    df["range"] = df["High"] - df["Low"]
-    volat = df["range"].rolling(10).mean().iloc[-1]
-    last_vol = df["range"].iloc[-1]
+    volat = ind.last("range_ma10")
+    last_vol = ind.last("range")
     vol_expansion = last_vol > volat * 1.2
 
     # ------------------------------------------------------------
@@ -141,3 +109,63 @@ def premium_reversal(df: pd.DataFrame):
         direction = "NEUTRAL"
 
     return prob, direction, confidence, explanations
+
+
+# ============================================================
+#  FULL-HISTORY (BATCH) VARIANT
+# ============================================================
+
+def premium_reversal_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    premium_reversal untuk setiap bar sekaligus (vectorized, O(n)).
+    Baris i identik dengan premium_reversal(df.iloc[:i + 1]):
+    kolom prob, direction, confidence.
+    Index sama dengan df, termasuk baris OHLC NaN yang dibuang normalisasi.
+    """
+    index = df.index
+    try:
+        # index posisi → baris yang di-dropna bisa dipetakan balik
+        df = normalize_ohlcv(df.set_axis(pd.RangeIndex(len(df))))
+    except Exception:
+        return pd.DataFrame({"prob": 0, "direction": "NEUTRAL", "confidence": 0.0}, index=df.index)
+
+    ind = indicators(df)
+    rsi = ind["rsi14"].to_numpy()
+    open_ = df["Open"].to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    volume = df["Volume"].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        body_pct = (close - open_) / open_ * 100
+
+        vol_base = ind["vol_ma20"].to_numpy()
+        usable = (vol_base != 0) & ~np.isnan(vol_base)
+        vol_ratio = np.where(usable, volume / np.where(usable, vol_base, 1), 1.0)
+
+    vol_expansion = ind["range"].to_numpy() > ind["range_ma10"].to_numpy() * 1.2
+
+    score = np.zeros(len(df), dtype=np.int64)
+    score += np.where(rsi < 30, 2, np.where(rsi > 70, -2, 0))
+    score += np.where(body_pct > 1, 1, np.where(body_pct < -1, -1, 0))
+    push = np.where(body_pct > 0, 1, -1)
+    score += np.where(vol_ratio > 1.4, push, 0)
+    score += np.where(vol_expansion, push, 0)
+
+    prob = np.clip((score + 4) * 12.5, 0, 100).astype(np.int64)
+
+    # dynamic minimum: n < max(14, int(n * 0.15)) hanya terjadi untuk n < 14
+    n = np.arange(1, len(df) + 1)
+    short = n < 14
+    prob[short] = 0
+
+    direction = np.where(prob > 58, "UP", np.where(prob < 42, "DOWN", "NEUTRAL"))
+    direction[short] = "NEUTRAL"
+    confidence = np.abs(prob - 50) / 50
+
+    out = pd.DataFrame({
+        "prob": prob,
+        "direction": direction,
+        "confidence": np.where(short, 0.0, confidence),
+    }, index=df.index)
+    neutral = {"prob": 0, "direction": "NEUTRAL", "confidence": 0.0}
+    return expand_history(out, df.index.to_numpy(), index, neutral)
@@ -2,6 +2,9 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 
+from components.zones import ZoneIndex, find_zones, get_zone_scanner
+from data.ohlcv import normalize_ohlcv as _normalize_ohlcv
+
 # ==========================================
 # MEMORY for reversal probability history
 # ==========================================
@@ -19,77 +22,21 @@ def add_history(prob):
 def normalize_ohlcv(df):
     """
     Rename kolom apa pun menjadi: Open, High, Low, Close, Volume
-    Aman untuk data saham & crypto.
+    Aman untuk data saham & crypto (implementasi bersama di data.ohlcv).
     """
-    df = df.copy()
-    col_map = {}
-
-    candidates = {
-        "Open":   ["open", "o"],
-        "High":   ["high", "h"],
-        "Low":    ["low", "l"],
-        "Close":  ["close", "c", "price", "last"],
-        "Volume": ["volume", "vol", "qty"],
-    }
-
-    lower_cols = {c.lower(): c for c in df.columns}
-
-    for std, keys in candidates.items():
-        for k in keys:
-            if k.lower() in lower_cols:
-                col_map[std] = lower_cols[k.lower()]
-                break
-
-    # jika ada kolom yang benar2 tidak ditemukan → error
-    missing = [c for c in ["Open", "High", "Low", "Close", "Volume"] if c not in col_map]
-    if missing:
-        raise KeyError(f"Missing OHLCV cols: {missing}. Available: {list(df.columns)}")
-
-    df = df.rename(columns={orig: std for std, orig in col_map.items()})
+    return _normalize_ohlcv(df, dropna=["Open", "High", "Low", "Close"])
 
-    # convert to numeric
-    for c in ["Open", "High", "Low", "Close", "Volume"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    return df.dropna(subset=["Open","High","Low","Close"])
-
-def detect_zones(df):
+def detect_zones(df, pivot_width=1):
+    """
+    Demand/supply zone dari swing low/high (vectorized, components.zones).
+    `pivot_width` = jumlah bar kiri & kanan yang harus lebih tinggi/rendah.
+    """
     df = normalize_ohlcv(df)   # ⬅️ FIX PALING PENTING
 
-    close = df["Close"].values
-    high  = df["High"].values
-    low   = df["Low"].values
-
-    zones_demand = []
-    zones_supply = []
+    if len(df) < 30:
+        return [], []
 
-    n = len(df)
-    if n < 30:
-        return zones_demand, zones_supply
-
-    # swing detection
-    for i in range(2, n-2):
-        if low[i] < low[i-1] and low[i] < low[i+1]:
-            zones_demand.append((low[i], low[i] * 1.003))
-
-        if high[i] > high[i-1] and high[i] > high[i+1]:
-            zones_supply.append((high[i] * 0.997, high[i]))
-
-    # cluster zones
-    def cluster(zones):
-        if not zones:
-            return []
-        zones = sorted(zones)
-        merged = [zones[0]]
-        for z in zones[1:]:
-            last = merged[-1]
-            if abs(z[0] - last[1]) / last[1] < 0.004:
-                merged[-1] = (min(last[0], z[0]), max(last[1], z[1]))
-            else:
-                merged.append(z)
-        return merged
-
-    return cluster(zones_demand), cluster(zones_supply)
+    return find_zones(df["High"].to_numpy(), df["Low"].to_numpy(), pivot_width)
 
 
 def auto_reversal_alert(prob, direction):
@@ -176,19 +123,28 @@ def render_reversal_premium_level2(df):
 
     demand, supply = detect_zones(df)
 
+    # zona juga dijaga incremental di scanner global (kolom Zone di watchlist scanner)
+    symbol, interval = df.attrs.get("symbol"), df.attrs.get("interval")
+    if symbol and interval and "date" in df.columns:
+        get_zone_scanner(interval).update(symbol, df)
+
+    price = float(df["close"].iloc[-1]) if "close" in df.columns else None
+
+    def zone_lines(zones, empty_msg):
+        if not zones:
+            st.markdown(empty_msg)
+            return
+        # zona hasil detect_zones sudah disjoint → satu index untuk query harga
+        hit = ZoneIndex.from_zones(zones).containing(price) if price is not None else None
+        for z in zones:
+            pin = " 📍 harga di zona ini" if hit == z else ""
+            st.markdown(f"- **{z[0]:.2f} → {z[1]:.2f}**{pin}")
+
     st.markdown("#### 🟢 Demand Zones")
-    if demand:
-        for d in demand:
-            st.markdown(f"- **{d[0]:.2f} → {d[1]:.2f}**")
-    else:
-        st.markdown("- No demand zones detected")
+    zone_lines(demand, "- No demand zones detected")
 
     st.markdown("#### 🔴 Supply Zones")
-    if supply:
-        for s in supply:
-            st.markdown(f"- **{s[0]:.2f} → {s[1]:.2f}**")
-    else:
-        st.markdown("- No supply zones detected")
+    zone_lines(supply, "- No supply zones detected")
 
     # -----------------------------------
     # EXPLANATIONS
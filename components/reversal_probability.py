@@ -2,10 +2,10 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 
+from components.indicator_engine import indicators
 
-def calc_reversal(df: pd.DataFrame):
-    df = df.copy()
 
+def calc_reversal(df: pd.DataFrame):
     if df is None or len(df) < 25:
         return 0, "N/A", ["Data terlalu sedikit untuk analisa reversal."]
 
@@ -15,18 +15,8 @@ def calc_reversal(df: pd.DataFrame):
             return 0, "N/A", [f"Kolom {col} tidak tersedia."]
 
     # ========== RSI Proxy ==========
-    df["chg"] = df["Close"].diff()
-    df["up"] = df["chg"].clip(lower=0)
-    df["dn"] = -df["chg"].clip(upper=0)
-
-    avg_up = df["up"].rolling(14).mean()
-    avg_dn = df["dn"].rolling(14).mean()
-
-    with np.errstate(divide="ignore", invalid="ignore"):
-        rs = avg_up / avg_dn
-        rsi = 100 - (100 / (1 + rs))
-
-    last_rsi = rsi.iloc[-1]
+    ind = indicators(df)
+    last_rsi = ind.last("rsi14")
     if np.isnan(last_rsi):
         last_rsi = 50
 
@@ -38,7 +28,7 @@ def calc_reversal(df: pd.DataFrame):
 
     # ========== Volume Spike ==========
     vol = df["Volume"]
-    vol_ma = vol.rolling(20).mean().iloc[-1]
+    vol_ma = ind.last("vol_ma20")
     vol_last = vol.iloc[-1]
 
     if vol_ma and not np.isnan(vol_ma):
@@ -88,6 +78,49 @@ def calc_reversal(df: pd.DataFrame):
     return prob, direction, signals
 
 
+def calc_reversal_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    calc_reversal untuk setiap bar sekaligus (vectorized, O(n)).
+    Baris i identik dengan calc_reversal(df.iloc[:i + 1]): kolom prob, direction.
+    """
+    n = 0 if df is None else len(df)
+    index = df.index if df is not None else pd.RangeIndex(0)
+
+    required = ["Open", "High", "Low", "Close", "Volume"]
+    if n == 0 or any(col not in df.columns for col in required):
+        return pd.DataFrame({"prob": 0, "direction": "N/A"}, index=index)
+
+    ind = indicators(df)
+    rsi = ind["rsi14"].to_numpy()
+    rsi = np.where(np.isnan(rsi), 50, rsi)
+
+    o = df["Open"].to_numpy(dtype=np.float64)
+    c = df["Close"].to_numpy(dtype=np.float64)
+    vol = df["Volume"].to_numpy(dtype=np.float64)
+    vol_ma = ind["vol_ma20"].to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        body_pct = np.where(o != 0, (c - o) / np.where(o != 0, o, 1) * 100, 0.0)
+        usable = (vol_ma != 0) & ~np.isnan(vol_ma)
+        vol_ratio = np.where(usable, vol / np.where(usable, vol_ma, 1), 1.0)
+
+    score = np.zeros(n, dtype=np.int64)
+    score += np.where(rsi < 30, 2, np.where(rsi > 70, -2, 0))
+    score += np.where(body_pct > 1, 1, np.where(body_pct < -1, -1, 0))
+    spike = vol_ratio > 1.3
+    score += np.where(spike & (body_pct > 0), 1, np.where(spike & (body_pct < 0), -1, 0))
+
+    prob = np.clip((score + 3) * 20, 0, 100).astype(np.int64)
+    direction = np.where(prob >= 55, "UP", "DOWN").astype(object)
+
+    # < 25 bar → "Data terlalu sedikit"
+    short = np.arange(1, n + 1) < 25
+    prob[short] = 0
+    direction[short] = "N/A"
+
+    return pd.DataFrame({"prob": prob, "direction": direction}, index=index)
+
+
 def render_reversal_probability(df: pd.DataFrame):
     st.markdown("### 🔄 Reversal Probability (Saham Indonesia)")
 
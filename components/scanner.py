@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from components.ai_final_engine import final_decision_engine
+from components.ai_predictor import AIPredictor
+from components.reversal_premium import premium_reversal
+from components.zones import get_zone_scanner
+from data.ohlcv import normalize_ohlcv
+from data.swr_cache import SWRCache, format_age
+from data.watchlist import fetch_watchlist
+
+# urutan keputusan untuk sorting (BUY paling atas)
+DECISION_RANK = {"BUY": 2, "REVERSAL BUY": 1, "WAIT": 0, "TAKE PROFIT": -1, "SELL": -2}
+
+# simbol per task process pool (kurangi overhead pickle / IPC)
+CHUNK = 16
+
+# umur maksimum hasil scan sebelum di-refresh di background (detik)
+SCAN_MAX_AGE = 5
+
+# watchlist berbeda (antar session) yang hasil scannya disimpan
+MAX_SCANS = 8
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_SCANS = {}
+_SCANS_LOCK = threading.Lock()
+ai = AIPredictor()
+
+
+def get_scan_pool():
+    """
+    Process pool bersama untuk analisa watchlist (CPU-bound).
+    Pakai 'spawn': fork dari server Streamlit yang multi-thread tidak aman.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _POOL
+
+
+# ======================================================
+# ANALYSIS (jalan di worker process)
+# ======================================================
+
+def analyze_symbol(symbol, df, sensitivity=1.0):
+    """Pipeline yang sama dengan dashboard utama untuk satu simbol → satu baris tabel."""
+    # satu view bernama standar dipakai semua engine (tanpa normalisasi ulang)
+    df = normalize_ohlcv(df, required=(), numeric=(), dropna=None)
+
+    trend = ai.predict(df)
+    decision, _, reversal, smart = final_decision_engine(df, trend, sensitivity)
+    prob, rev_dir, rev_conf, _ = premium_reversal(df)
+
+    close = df["Close"].to_numpy()
+    change = (close[-1] / close[0] - 1) * 100 if len(close) > 1 and close[0] else 0.0
+
+    return {
+        "Symbol": symbol,
+        "Close": float(close[-1]),
+        "Change %": float(change),
+        "Decision": decision,
+        "Rank": DECISION_RANK.get(decision, 0),
+        "Trend": trend["direction"],
+        "Prob Up": trend["prob_up"],
+        "Confidence": trend["confidence"],
+        "Reversal": reversal or "-",
+        "Premium Rev": rev_dir,
+        "Premium %": prob,
+        "Smart Money": smart,
+    }
+
+
+def _analyze_chunk(items, sensitivity):
+    rows = []
+    for symbol, df in items:
+        try:
+            rows.append(analyze_symbol(symbol, df, sensitivity))
+        except Exception as e:
+            print("Scanner Error:", symbol, e)
+    return rows
+
+
+def analyze_frames(frames, sensitivity=1.0, pool=None):
+    """Analisa semua frame di process pool, dipecah per CHUNK simbol."""
+    items = list(frames.items())
+    if not items:
+        return []
+
+    pool = pool or get_scan_pool()
+    chunks = [items[i:i + CHUNK] for i in range(0, len(items), CHUNK)]
+    futures = [pool.submit(_analyze_chunk, chunk, sensitivity) for chunk in chunks]
+    return [row for fut in futures for row in fut.result()]
+
+
+def zone_hits(frames, interval):
+    """
+    Update ZoneScanner interval ini (incremental per symbol) lalu cek harga
+    terakhir tiap symbol → dict symbol → "demand" / "supply".
+    """
+    zones = get_zone_scanner(interval)
+    prices = {}
+    for symbol, df in frames.items():
+        if len(df):
+            zones.update(symbol, df)
+            prices[symbol] = float(df["close"].iloc[-1])
+    return {hit["symbol"]: hit["side"] for hit in zones.scan(prices)}
+
+
+def scan_watchlist(symbols, interval, mode="Crypto", sensitivity=1.0):
+    """Fetch (thread + rate limit) lalu analisa (process pool) → (tabel, errors, detik)."""
+    t = time.perf_counter()
+    frames, errors = fetch_watchlist(symbols, interval, mode)
+    rows = analyze_frames(frames, sensitivity)
+
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table["Zone"] = table["Symbol"].map(zone_hits(frames, interval)).fillna("-")
+        table = table.sort_values(["Rank", "Confidence"], ascending=False, ignore_index=True)
+    return table, errors, time.perf_counter() - t
+
+
+# ======================================================
+# UI
+# ======================================================
+
+def get_scan(symbols, interval, mode="Crypto", max_age=SCAN_MAX_AGE):
+    """
+    Hasil scan stale-while-revalidate per (mode, interval, watchlist):
+    render berikutnya langsung memakai hasil terakhir sementara scan baru
+    jalan di background, jadi loop dashboard tidak menunggu fetch 300 simbol.
+    Scan pertama juga jalan di background. Return (hasil, umur, cache);
+    hasil None selama scan pertama belum selesai atau gagal.
+    """
+    key = (mode, interval, tuple(symbols))
+    with _SCANS_LOCK:
+        cache = _SCANS.pop(key, None)
+        if cache is None:
+            cache = SWRCache(lambda: scan_watchlist(symbols, interval, mode), max_age)
+        _SCANS[key] = cache   # paling baru di belakang
+        while len(_SCANS) > MAX_SCANS:
+            _SCANS.pop(next(iter(_SCANS)))
+    cache.max_age = max_age
+    result, age = cache.get(block=False)
+    return result, age, cache
+
+
+def render_scanner(symbols, interval, mode="Crypto", max_age=SCAN_MAX_AGE):
+    st.subheader(f"🔎 Watchlist Scanner ({len(symbols)} simbol · {interval})")
+
+    if not symbols:
+        st.info("Watchlist kosong.")
+        return
+
+    result, age, cache = get_scan(symbols, interval, mode, max_age)
+    if result is None:
+        if cache.is_refreshing():
+            st.info(f"⏳ Scanning {len(symbols)} simbol di background...")
+        else:
+            st.warning(f"Scan watchlist gagal: {cache.last_error}")
+        return
+
+    table, errors, elapsed = result
+    st.caption(
+        f"{len(table)} dianalisa · {len(errors)} gagal · scan {elapsed:.1f}s · "
+        f"data {format_age(age)} lalu"
+    )
+    if table.empty:
+        st.warning("Tidak ada data watchlist.")
+        return
+
+    st.dataframe(
+        table,
+        hide_index=True,
+        column_config={
+            "Close": st.column_config.NumberColumn(format="%.6g"),
+            "Change %": st.column_config.NumberColumn(format="%+.2f%%"),
+            "Prob Up": st.column_config.ProgressColumn("Prob Up", min_value=0, max_value=1, format="%.2f"),
+            "Confidence": st.column_config.NumberColumn(format="%.2f"),
+            "Premium %": st.column_config.NumberColumn(format="%d%%"),
+        },
+    )
+
+    if errors:
+        with st.expander(f"⚠️ {len(errors)} simbol gagal"):
+            st.dataframe(pd.Series(errors, name="error"))
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+if __name__ == "__main__":
+    import numpy as np
+
+    from data.ohlcv import canonical_ohlcv
+    from data.rate_limit import MEXC_BURST, MEXC_RATE, RateLimiter
+
+    rng = np.random.default_rng(0)
+    n_sym, n_bar = 300, 200
+
+    frames = {}
+    for i in range(n_sym):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bar)))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        frames[f"SYM{i}USDT"] = canonical_ohlcv(pd.DataFrame({
+            "date": pd.date_range("2024-01-01", periods=n_bar, freq="min"),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.random(n_bar) * 0.002),
+            "low": np.minimum(open_, close) * (1 - rng.random(n_bar) * 0.002),
+            "close": close,
+            "volume": rng.random(n_bar) * 100,
+        }), f"SYM{i}USDT", "1m")
+
+    t = time.perf_counter()
+    serial = _analyze_chunk(list(frames.items()), 1.0)
+    print(f"serial      {n_sym} simbol: {time.perf_counter() - t:.2f}s")
+
+    pool = get_scan_pool()
+    analyze_frames(dict(list(frames.items())[:CHUNK]), pool=pool)   # warm-up spawn
+    t = time.perf_counter()
+    parallel = analyze_frames(frames, pool=pool)
+    print(f"process pool {n_sym} simbol: {time.perf_counter() - t:.2f}s ({pool._max_workers} worker)")
+    assert parallel == serial
+
+    t = time.perf_counter()
+    hits = zone_hits(frames, "1m")
+    print(f"zone scan   {n_sym} simbol: {(time.perf_counter() - t) * 1e3:.1f} ms, {len(hits)} di zona")
+
+    limiter = RateLimiter(MEXC_RATE, MEXC_BURST)
+    t = time.perf_counter()
+    for _ in range(n_sym):
+        limiter.acquire()
+    print(f"rate limit  {n_sym} request @ {MEXC_RATE}/s: {time.perf_counter() - t:.2f}s (batas bawah fetch)")
@@ -1,8 +1,10 @@
 import streamlit as st
-import yfinance as yf
 import numpy as np
 import pandas as pd
 from components.indo_battle_meter import render_battle_meter
+from data.macro_service import get_macro
+from data.yf_planner import yf_download
+from data.fanout import fan_out, PANEL_DEADLINE
 
 # ============================================================
 # SAFE UTILITIES
@@ -54,7 +56,7 @@ def get_ihsg_sentiment():
     Mengambil perubahan IHSG (1-day change %) dengan aman.
     """
     try:
-        df = yf.download("^JKSE", period="10d", interval="1d")
+        df = get_macro("^JKSE", period="10d")
 
         if df is None or df.empty:
             return None
@@ -88,50 +90,101 @@ SECTOR_MAP = {
     "Energy": ["PGAS.JK", "MEDC.JK"],
 }
 
-def get_sector_sentiment(symbol):
+def build_sector_index(sector_map):
+    """Reverse index symbol → sektor, supaya lookup O(1) untuk universe besar."""
+    return {
+        sym.upper(): sec
+        for sec, syms in sector_map.items()
+        for sym in syms
+    }
+
+
+# reverse index per sector_map yang pernah dipakai, key = id(map);
+# map ikut disimpan supaya id tidak dipakai ulang objek lain
+MAX_SECTOR_INDEXES = 8
+_SECTOR_INDEXES = {id(SECTOR_MAP): (SECTOR_MAP, build_sector_index(SECTOR_MAP))}
+
+
+def sector_index_for(sector_map):
+    """
+    build_sector_index yang di-memo per objek map: universe besar (mis.
+    seluruh IDX) tidak di-index ulang tiap render. Map dianggap tidak
+    diubah setelah dipakai; bila diubah, kirim objek dict baru.
+    """
+    entry = _SECTOR_INDEXES.get(id(sector_map))
+    if entry is not None and entry[0] is sector_map:
+        return entry[1]
+
+    index = build_sector_index(sector_map)
+    _SECTOR_INDEXES[id(sector_map)] = (sector_map, index)
+    while len(_SECTOR_INDEXES) > MAX_SECTOR_INDEXES:
+        _SECTOR_INDEXES.pop(next(iter(_SECTOR_INDEXES)))
+    return index
+
+
+def last_two_changes(close: pd.DataFrame) -> pd.Series:
+    """
+    % perubahan antara dua close valid terakhir, per kolom (ticker).
+    NaN per kolom dilewati seperti `close.dropna()` per ticker.
+    """
+    values = close.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    n = len(values)
+    cols = np.arange(values.shape[1])
+
+    # posisi close valid terakhir & sebelumnya untuk tiap kolom
+    count = valid.sum(axis=0)
+    last_idx = n - 1 - np.argmax(valid[::-1], axis=0)
+    valid_prev = valid.copy()
+    valid_prev[last_idx, cols] = False
+    prev_idx = n - 1 - np.argmax(valid_prev[::-1], axis=0)
+
+    last = values[last_idx, cols]
+    prev = values[prev_idx, cols]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (last - prev) / prev * 100
+
+    ok = (count >= 2) & (prev != 0) & np.isfinite(change)
+    return pd.Series(np.where(ok, change, np.nan), index=close.columns)
+
+
+def get_sector_sentiment(symbol, sector_map=None):
     """
     Hitung sentiment sektor berdasarkan saham-saham rekan satu sektor.
+    Semua peer diambil dalam SATU multi-ticker download.
     Aman walaupun data kosong.
+
+    `sector_map` opsional (mis. seluruh universe IDX); default SECTOR_MAP.
     """
     symbol = symbol.upper()
-    sector_name = None
+
+    if sector_map is None:
+        sector_map = SECTOR_MAP
+    index = sector_index_for(sector_map)
 
     # cari sektor dari symbol
-    for sec, syms in SECTOR_MAP.items():
-        if symbol in syms:
-            sector_name = sec
-            break
+    sector_name = index.get(symbol)
 
     if sector_name is None:
         return "Unknown", 50  # netral
 
-    scores = []
-
-    for s in SECTOR_MAP[sector_name]:
-        try:
-            df = yf.download(s, period="7d", interval="1d")
-            close = df["Close"].dropna()
-
-            if len(close) < 2:
-                continue
-
-            last = safe_float(close.iloc[-1])
-            prev = safe_float(close.iloc[-2])
-
-            if last is None or prev is None or prev == 0:
-                continue
-
-            change = (last - prev) / prev * 100
-            scores.append(change)
+    peers = list(dict.fromkeys(sector_map[sector_name]))
 
-        except:
-            continue
+    try:
+        df = yf_download(peers, period="7d", interval="1d", group_by="column")
+        close = df["Close"]
+        if isinstance(close, pd.Series):
+            close = close.to_frame(peers[0])
+        changes = last_two_changes(close).dropna()
+    except Exception:
+        changes = pd.Series(dtype=float)
 
     # Jika semua gagal → netral
-    if len(scores) == 0:
+    if len(changes) == 0:
         return sector_name, 50
 
-    avg = float(np.mean(scores))
+    avg = float(changes.mean())
 
     # Normalisasi → 0–100
     score = max(0, min(round((avg + 3) * 10), 100))
@@ -151,7 +204,7 @@ def get_foreign_flow():
     """
     def fetch_etf(etf_symbol):
         try:
-            df = yf.download(etf_symbol, period="7d", interval="1d")
+            df = get_macro(etf_symbol, period="7d")
             if df is None or df.empty:
                 return None
 
@@ -210,11 +263,17 @@ def render_sentiment(symbol):
     st.subheader("📊 Indonesian Market Sentiment (Premium)")
 
     # -------------------------------
-    # Load data
+    # Load data (paralel, satu deadline per panel)
     # -------------------------------
-    ihsg = get_ihsg_sentiment()
-    sector, sector_score = get_sector_sentiment(symbol)
-    foreign = get_foreign_flow()
+    results, missed = fan_out({
+        "ihsg": get_ihsg_sentiment,
+        "sector": lambda: get_sector_sentiment(symbol),
+        "foreign": get_foreign_flow,
+    }, deadline=PANEL_DEADLINE)
+
+    ihsg = results["ihsg"]
+    sector, sector_score = results["sector"] or ("N/A/stale", None)
+    foreign = results["foreign"]
 
     # -------------------------------
     # Display IHSG
@@ -241,8 +300,8 @@ def render_sentiment(symbol):
     # === CARD 1: Fear & Greed ===
     with c1:
         if ihsg is None:
-            val = "IHSG data unavailable."
-            html = premium_card("🇮🇩 IHSG Sentiment", val, sub, icon)
+            sub = badge("N/A/stale" if "ihsg" in missed else "IHSG data unavailable.", "#7f8c8d")
+            html = premium_card("🇮🇩 IHSG Sentiment", "N/A", sub, "⚪")
         else:
             icon = "🟢" if ihsg > 0 else "🔴"
             val = f"**{icon} IHSG Change:** {ihsg:.2f}%"
@@ -257,7 +316,8 @@ def render_sentiment(symbol):
 
     # === CARD 2: BTC Dominance (hanya BTC) ===
     with c2:
-        html = premium_card("🏭 Sector Sentiment", f"{sector_score:.0f}/100", f"**Sector:** {sector}", icon="")
+        val = f"{sector_score:.0f}/100" if sector_score is not None else "N/A"
+        html = premium_card("🏭 Sector Sentiment", val, f"**Sector:** {sector}", icon="")
         st.markdown(html, unsafe_allow_html=True)
 
     # === CARD 3: Coin Momentum ===
@@ -265,15 +325,19 @@ def render_sentiment(symbol):
         # -------------------------------
         # Display Foreign Flow
         # -------------------------------
-        icon = "🟢" if foreign > 0 else "🔴" if foreign < 0 else "⚪"
-
-        col = "#2ecc71" if foreign > 0 else "#e74c3c"
-        sub = badge(
-            f"**{icon} Foreign ETF Change:** {foreign:.2f}%",
-            col,
-        )
-        #title = f"{symbol} Momentum (7d)"
-        html = premium_card("🌏 Foreign Flow", f"{foreign:.2f}%", sub, icon)
+        if foreign is None:
+            sub = badge("N/A/stale", "#7f8c8d")
+            html = premium_card("🌏 Foreign Flow", "N/A", sub, "⚪")
+        else:
+            icon = "🟢" if foreign > 0 else "🔴" if foreign < 0 else "⚪"
+
+            col = "#2ecc71" if foreign > 0 else "#e74c3c"
+            sub = badge(
+                f"**{icon} Foreign ETF Change:** {foreign:.2f}%",
+                col,
+            )
+            #title = f"{symbol} Momentum (7d)"
+            html = premium_card("🌏 Foreign Flow", f"{foreign:.2f}%", sub, icon)
         st.markdown(html, unsafe_allow_html=True)
 
     
@@ -287,8 +351,12 @@ def render_sentiment(symbol):
     #if ihsg is not None:
     #    msgs.append(f"IHSG is **{interpret_sentiment(ihsg)}** ({ihsg:+.2f}%).")
 
-    msgs.append(f"Sector sentiment is **{sector_score}/100**.")
-    msgs.append(f"Foreign flow indicates **{interpret_sentiment(foreign)}** ({foreign:+.2f}%).")
+    if sector_score is not None:
+        msgs.append(f"Sector sentiment is **{sector_score}/100**.")
+    if foreign is not None:
+        msgs.append(f"Foreign flow indicates **{interpret_sentiment(foreign)}** ({foreign:+.2f}%).")
+    if missed:
+        msgs.append(f"Data N/A/stale (lewat deadline {PANEL_DEADLINE:.0f}s): {', '.join(sorted(missed))}.")
 
     for m in msgs:
         st.markdown(f"- {m}")
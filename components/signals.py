@@ -1,24 +1,7 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 
-# ===============================
-# INDICATORS (LOCAL, SAFE)
-# ===============================
-
-def EMA(series, period):
-    return series.ewm(span=period, adjust=False).mean()
-
-def RSI(series, period=14):
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-
-    avg_gain = gain.rolling(period).mean()
-    avg_loss = loss.rolling(period).mean()
-
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+from components.indicator_engine import indicators
 
 # ===============================
 # MAIN SIGNAL ENGINE
@@ -31,18 +14,18 @@ def render_signals(df: pd.DataFrame):
         st.warning("Data tidak cukup untuk generate signal.")
         return
 
-    df = df.copy()
-
     # --- SAFETY NORMALIZATION ---
     if "close" not in df.columns:
         st.error("Kolom 'close' tidak ditemukan.")
         return
 
-    # --- CALCULATE INDICATORS ---
-    df["EMA20"] = EMA(df["close"], 20)
-    df["RSI"] = RSI(df["close"])
-
-    last = df.iloc[-1]
+    # --- INDICATORS (shared engine) ---
+    ind = indicators(df)
+    last = {
+        "close": df["close"].iloc[-1],
+        "EMA20": ind.last("ema20"),
+        "RSI": ind.last("rsi14"),
+    }
 
     # --- SIGNAL LOGIC ---
     buy_signal = (
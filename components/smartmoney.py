@@ -1,8 +1,45 @@
 import streamlit as st
 
-def render_smartmoney(df):
+from components.indicator_engine import indicators
+
+# jumlah candle terakhir yang dipakai untuk bias order flow
+FLOW_BARS = 5
+
+
+def render_smartmoney(df, flow=None):
     st.subheader("💰 Smart Money")
 
+    flow_df = flow.frame() if flow is not None else None
+
+    if flow_df is not None and not flow_df.empty:
+        recent = flow_df.iloc[-FLOW_BARS:]
+        bias = flow.bias(FLOW_BARS)
+
+        if bias is not None:
+            st.info(f"Smart Money Bias (order flow): **{bias}**")
+        else:
+            # awal flow / trade terlewat di antara poll → delta parsial, jangan dipakai
+            st.info(f"Smart Money Bias (EMA50): **{get_smart_money_bias(df)}**")
+            st.warning(
+                f"Order flow belum lengkap: butuh {FLOW_BARS} candle teramati penuh, "
+                f"{int((~recent['complete']).sum())} dari {len(recent)} candle terakhir parsial "
+                f"(awal data / trade terlewat di antara poll)."
+            )
+
+        last = flow_df.iloc[-1]
+        st.caption(
+            f"Buy {last['buy_volume']:,.4g} · Sell {last['sell_volume']:,.4g} · "
+            f"Delta {last['delta']:+,.4g} · Delta {len(recent)} candle {recent['delta'].sum():+,.4g} · "
+            f"CVD {last['cvd']:+,.4g} ({flow.ingested:,} trades · {flow.gaps} gap)"
+        )
+
+        fp = flow.footprint()
+        if not fp.empty:
+            with st.expander("👣 Footprint candle terakhir"):
+                st.dataframe(fp.sort_values("price", ascending=False), hide_index=True)
+        return
+
+    # fallback tanpa data trade (mis. saham): bandingkan candle
     last = df.iloc[-1]
     prev = df.iloc[-5]
 
@@ -10,18 +47,21 @@ def render_smartmoney(df):
 
     st.info(f"Smart Money Bias: **{bias}**")
 
-def get_smart_money_bias(df):
+def get_smart_money_bias(df, flow=None):
     """
     Return simple smart money bias:
+    - Bila ada order flow (TradeFlow) lengkap: arah delta beberapa candle terakhir
     - Bullish jika close > EMA50
     - Bearish jika close < EMA50
     """
-    import pandas as pd
+    if flow is not None:
+        bias = flow.bias(FLOW_BARS)
+        if bias is not None:
+            return bias
 
-    df = df.copy()
-    df["ema50"] = df["Close"].ewm(span=50).mean()
+    ind = indicators(df)
 
-    if df["Close"].iloc[-1] > df["ema50"].iloc[-1]:
+    if ind.last("close") > ind.last("ema50_adj"):
         return "BULLISH"
     else:
         return "BEARISH"
@@ -0,0 +1,401 @@
+import copy
+import math
+from collections import deque
+
+# ======================================================
+# STREAMING INDICATORS
+# ======================================================
+# Versi incremental dari fungsi batch di components/indicators.py.
+#
+# Semua objek punya protokol yang sama:
+# - update(...)  → bar baru ditutup / ditambahkan, O(1)
+# - amend(...)   → bar terakhir (masih terbentuk) berubah, O(1)
+# - snapshot()   → state (dict) untuk disimpan
+# - restore(st)  → kembalikan state dari snapshot
+#
+# Indikator berbasis window menghitung ulang sum dari window tiap `period`
+# update (amortized O(1)) supaya error floating point tidak menumpuk.
+
+NAN = float("nan")
+
+
+class StreamingIndicator:
+    def snapshot(self):
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state):
+        self.__dict__.update(copy.deepcopy(state))
+        return self
+
+
+class EMA(StreamingIndicator):
+    """Sama dengan series.ewm(span=span, adjust=False).mean()."""
+
+    def __init__(self, span):
+        self.alpha = 2 / (span + 1)
+        self.value = None
+        self._base = None     # nilai sebelum bar terakhir
+        self.n = 0
+
+    def _step(self, x):
+        if self._base is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self._base
+
+    def update(self, x):
+        self._base = self.value
+        self.value = self._step(x)
+        self.n += 1
+        return self.value
+
+    def amend(self, x):
+        if self.n == 0:
+            return self.update(x)
+        self.value = self._step(x)
+        return self.value
+
+
+def _rsi(avg_gain, avg_loss):
+    # sama dengan pandas: x/0 → inf → 100, 0/0 → NaN
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else NAN
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class RSI(StreamingIndicator):
+    """
+    RSI 14.
+    - wilder=False: rolling mean gain/loss, sama dengan indicators.RSI
+    - wilder=True : smoothing Wilder, sama dengan indicators.RSI_WILDER
+    """
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self.value = NAN
+
+        self.last_close = None
+        self._base_close = None   # close sebelum bar terakhir
+
+        # SMA: window gain/loss; Wilder: window hanya dipakai untuk seed
+        self.gains = deque(maxlen=period)
+        self.losses = deque(maxlen=period)
+        self.sum_gain = 0.0
+        self.sum_loss = 0.0
+        self._pushes = 0
+
+        self.avg_gain = None
+        self.avg_loss = None
+        self._base_avg = None     # (avg_gain, avg_loss) sebelum bar terakhir
+
+    def _resum(self):
+        self.sum_gain = math.fsum(self.gains)
+        self.sum_loss = math.fsum(self.losses)
+
+    def _value(self):
+        if self.wilder:
+            if self.avg_gain is None:
+                return NAN
+            return _rsi(self.avg_gain, self.avg_loss)
+        if len(self.gains) < self.period:
+            return NAN
+        return _rsi(self.sum_gain / self.period, self.sum_loss / self.period)
+
+    def _wilder_step(self, g, l):
+        p = self.period
+        if self._base_avg is None:
+            # seed: SMA dari `period` delta pertama
+            if len(self.gains) == p:
+                self.avg_gain = self.sum_gain / p
+                self.avg_loss = self.sum_loss / p
+            return
+        bg, bl = self._base_avg
+        self.avg_gain = (bg * (p - 1) + g) / p
+        self.avg_loss = (bl * (p - 1) + l) / p
+
+    def update(self, x):
+        if self.last_close is None:
+            self.last_close = x
+            return self.value
+
+        d = x - self.last_close
+        g, l = max(d, 0.0), max(-d, 0.0)
+
+        if self.wilder and self.avg_gain is not None:
+            self._base_avg = (self.avg_gain, self.avg_loss)
+        elif len(self.gains) == self.period:
+            self.sum_gain -= self.gains[0]
+            self.sum_loss -= self.losses[0]
+
+        if not (self.wilder and self._base_avg is not None):
+            self.gains.append(g)
+            self.losses.append(l)
+            self.sum_gain += g
+            self.sum_loss += l
+            self._pushes += 1
+            if self._pushes % self.period == 0:
+                self._resum()
+
+        if self.wilder:
+            self._wilder_step(g, l)
+
+        self._base_close = self.last_close
+        self.last_close = x
+        self.value = self._value()
+        return self.value
+
+    def amend(self, x):
+        if self._base_close is None:
+            # baru satu bar: cukup ganti close
+            self.last_close = x
+            return self.value
+
+        d = x - self._base_close
+        g, l = max(d, 0.0), max(-d, 0.0)
+
+        if self.wilder and self._base_avg is not None:
+            self._wilder_step(g, l)
+        else:
+            self.sum_gain += g - self.gains[-1]
+            self.sum_loss += l - self.losses[-1]
+            self.gains[-1] = g
+            self.losses[-1] = l
+            if self.wilder:
+                self._wilder_step(g, l)
+
+        self.last_close = x
+        self.value = self._value()
+        return self.value
+
+
+class MACD(StreamingIndicator):
+    """(macd, signal, hist), sama dengan indicators.MACD."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = (None, None, None)
+
+    def _out(self, sig):
+        macd = self.fast.value - self.slow.value
+        self.value = (macd, sig, macd - sig)
+        return self.value
+
+    def update(self, x):
+        self.fast.update(x)
+        self.slow.update(x)
+        return self._out(self.signal.update(self.fast.value - self.slow.value))
+
+    def amend(self, x):
+        self.fast.amend(x)
+        self.slow.amend(x)
+        return self._out(self.signal.amend(self.fast.value - self.slow.value))
+
+
+class Bollinger(StreamingIndicator):
+    """
+    (upper, mid, lower), sama dengan indicators.Bollinger (std ddof=1).
+    Mean & variance window di-update gaya Welford (add/remove).
+    """
+
+    def __init__(self, period=20, dev=2):
+        self.period = period
+        self.dev = dev
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._pushes = 0
+        self.value = (NAN, NAN, NAN)
+
+    def _resum(self):
+        n = len(self.window)
+        self.mean = math.fsum(self.window) / n
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in self.window)
+
+    def _swap(self, old, new, n):
+        """Ganti satu elemen window (`old` → `new`) dengan ukuran tetap n."""
+        old_mean = self.mean
+        self.mean += (new - old) / n
+        self.m2 += (new - old) * (new - self.mean + old - old_mean)
+
+    def _out(self):
+        n = len(self.window)
+        if n < self.period:
+            self.value = (NAN, NAN, NAN)
+        else:
+            std = math.sqrt(max(self.m2, 0.0) / (n - 1))
+            self.value = (self.mean + self.dev * std, self.mean, self.mean - self.dev * std)
+        return self.value
+
+    def update(self, x):
+        n = len(self.window)
+        if n < self.period:
+            # Welford add
+            d = x - self.mean
+            self.mean += d / (n + 1)
+            self.m2 += d * (x - self.mean)
+        else:
+            self._swap(self.window[0], x, n)
+        self.window.append(x)
+
+        self._pushes += 1
+        if self._pushes % self.period == 0:
+            self._resum()
+        return self._out()
+
+    def amend(self, x):
+        if not self.window:
+            return self.update(x)
+        self._swap(self.window[-1], x, len(self.window))
+        self.window[-1] = x
+        return self._out()
+
+
+class ATR(StreamingIndicator):
+    """True range + smoothing Wilder (alpha 1/period), sama dengan indicators.ATR."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.value = None
+        self._base = None          # ATR sebelum bar terakhir
+        self.prev_close = None     # close bar sebelum bar terakhir
+        self.last_close = None
+        self.n = 0
+
+    def _tr(self, h, l):
+        if self.prev_close is None:
+            return h - l
+        pc = self.prev_close
+        return max(h - l, abs(h - pc), abs(l - pc))
+
+    def _step(self, h, l):
+        tr = self._tr(h, l)
+        if self._base is None:
+            return tr
+        return self._base + (tr - self._base) / self.period
+
+    def update(self, h, l, c):
+        self._base = self.value
+        self.prev_close = self.last_close
+        self.value = self._step(h, l)
+        self.last_close = c
+        self.n += 1
+        return self.value
+
+    def amend(self, h, l, c):
+        if self.n == 0:
+            return self.update(h, l, c)
+        self.value = self._step(h, l)
+        self.last_close = c
+        return self.value
+
+
+# ======================================================
+# BUNDLE PER SYMBOL
+# ======================================================
+
+class IndicatorState(StreamingIndicator):
+    """
+    Set indikator standar dashboard untuk satu (symbol, interval):
+    EMA20/50/100/200, RSI14, MACD, Bollinger20, ATR14.
+    Dipakai untuk update tick-rate / watchlist besar tanpa hitung ulang window.
+    """
+
+    def __init__(self):
+        self.emas = {p: EMA(p) for p in (20, 50, 100, 200)}
+        self.rsi = RSI(14)
+        self.macd = MACD()
+        self.bb = Bollinger(20, 2)
+        self.atr = ATR(14)
+        self.last_date = None
+
+    def _apply(self, method, o, h, l, c):
+        for e in self.emas.values():
+            getattr(e, method)(c)
+        getattr(self.rsi, method)(c)
+        getattr(self.macd, method)(c)
+        getattr(self.bb, method)(c)
+        getattr(self.atr, method)(h, l, c)
+
+    def on_bar(self, date, o, h, l, c):
+        """Bar dengan `date` baru → update; `date` sama → amend (forming bar)."""
+        if self.last_date is not None and date == self.last_date:
+            self._apply("amend", o, h, l, c)
+        else:
+            self._apply("update", o, h, l, c)
+            self.last_date = date
+        return self.values()
+
+    def values(self):
+        macd, sig, hist = self.macd.value
+        up, mid, low = self.bb.value
+        out = {f"ema{p}": e.value for p, e in self.emas.items()}
+        out.update({
+            "rsi14": self.rsi.value,
+            "macd": macd, "macd_signal": sig, "macd_hist": hist,
+            "bb_up": up, "bb_mid": mid, "bb_low": low,
+            "atr14": self.atr.value,
+        })
+        return out
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+    import pandas as pd
+
+    from components.indicators import EMA as ema_b, RSI as rsi_b, RSI_WILDER, MACD as macd_b, Bollinger as bb_b, ATR as atr_b
+
+    rng = np.random.default_rng(0)
+    n = 20_000
+    close = pd.Series(100 + np.cumsum(rng.normal(0, 1, n)))
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    df = pd.DataFrame({"high": high, "low": low, "close": close})
+
+    # streaming dengan forming bar: tiap bar di-amend dua kali sebelum close final
+    objs = {"ema": EMA(50), "rsi": RSI(14), "rsiw": RSI(14, wilder=True),
+            "macd": MACD(), "bb": Bollinger(), "atr": ATR(14)}
+    out = {k: [] for k in objs}
+
+    t0 = time.perf_counter()
+    for i, (h, l, c) in enumerate(zip(high.tolist(), low.tolist(), close.tolist())):
+        for step, x in enumerate((c + 0.5, c - 0.3, c)):
+            hx, lx = max(h, x), min(l, x)
+            m = "update" if step == 0 else "amend"
+            for k, o in objs.items():
+                v = getattr(o, m)(hx, lx, x) if k == "atr" else getattr(o, m)(x)
+                if step == 2:
+                    out[k].append(v)
+    dt = time.perf_counter() - t0
+
+    def check(name, stream, batch):
+        a = np.asarray(stream, dtype=np.float64)
+        b = np.asarray(batch, dtype=np.float64)
+        ok = np.allclose(a, b, rtol=1e-9, atol=1e-9, equal_nan=True)
+        print(f"{name:10s} match={ok} max_err={np.nanmax(np.abs(a - b)):.2e}")
+
+    check("EMA50", out["ema"], ema_b(close, 50))
+    check("RSI14", out["rsi"], rsi_b(close))
+    check("RSI Wilder", out["rsiw"], RSI_WILDER(close))
+    m, s, h_ = macd_b(close)
+    check("MACD", [v[0] for v in out["macd"]], m)
+    check("MACD hist", [v[2] for v in out["macd"]], h_)
+    up, mid, lo = bb_b(close)
+    check("BB upper", [v[0] for v in out["bb"]], up)
+    check("BB lower", [v[2] for v in out["bb"]], lo)
+    check("ATR14", out["atr"], atr_b(df))
+
+    ops = n * 3 * len(objs)
+    print(f"{ops:,} updates in {dt:.2f}s ({dt / ops * 1e6:.2f} µs/update)")
+
+    # snapshot / restore
+    st = IndicatorState()
+    for i in range(300):
+        st.on_bar(i, 0, high[i], low[i], close[i])
+    snap = st.snapshot()
+    a = st.on_bar(300, 0, high[300], low[300], close[300])
+    b = IndicatorState().restore(snap).on_bar(300, 0, high[300], low[300], close[300])
+    print("snapshot/restore identical:", a == b)
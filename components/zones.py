@@ -0,0 +1,380 @@
+import threading
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# lebar zona dari harga pivot & jarak maksimum antar zona untuk di-merge
+ZONE_WIDTH = 0.003
+MERGE_GAP = 0.004
+
+# zona yang tidak tersentuh swing baru selama ini dibuang
+ZONE_MAX_AGE = np.timedelta64(30, "D")
+
+# symbol yang zonanya dijaga per ZoneScanner (paling lama dipakai dibuang)
+MAX_TRACKERS = 1000
+
+
+# ======================================================
+# SWING / PIVOT DETECTION
+# ======================================================
+
+def pivot_mask(values, width=1, kind="low"):
+    """
+    Mask pivot: bar i adalah swing low (high) bila nilainya strictly lebih
+    kecil (besar) dari `width` bar di kiri & kanan.
+
+    Rentang index yang dicek [width + 1, n - width - 1), sama dengan loop
+    lama `range(2, n - 2)` untuk width=1.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+
+    start, end = width + 1, n - width - 1
+    if end <= start:
+        return mask
+
+    center = values[start:end]
+    ok = np.ones(end - start, dtype=bool)
+    for j in range(1, width + 1):
+        left = values[start - j:end - j]
+        right = values[start + j:end + j]
+        if kind == "low":
+            ok &= (center < left) & (center < right)
+        else:
+            ok &= (center > left) & (center > right)
+
+    mask[start:end] = ok
+    return mask
+
+
+# ======================================================
+# ZONE CLUSTERING
+# ======================================================
+
+def cluster_zones(lower, upper, gap=MERGE_GAP):
+    """
+    Merge zona (lower, upper) yang berdekatan, hasil identik dengan loop lama:
+    urutkan, lalu gabung selama |lower_i - upper_merged| / upper_merged < gap.
+
+    Karena upper naik monoton terhadap lower, upper gabungan selalu upper
+    zona sebelumnya, jadi keputusan merge cukup dari pasangan berurutan.
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    if len(lower) == 0:
+        return []
+
+    order = np.lexsort((upper, lower))
+    lo, hi = lower[order], upper[order]
+
+    merge = np.abs(lo[1:] - hi[:-1]) / hi[:-1] < gap
+    starts = np.flatnonzero(np.r_[True, ~merge])
+
+    merged_lo = lo[starts]
+    merged_hi = np.maximum.reduceat(hi, starts)
+    return list(zip(merged_lo.tolist(), merged_hi.tolist()))
+
+
+def find_zones(high, low, pivot_width=1, width=ZONE_WIDTH, gap=MERGE_GAP):
+    """Demand zone dari swing low, supply zone dari swing high."""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    lows = low[pivot_mask(low, pivot_width, "low")]
+    highs = high[pivot_mask(high, pivot_width, "high")]
+
+    demand = cluster_zones(lows, lows * (1 + width), gap)
+    supply = cluster_zones(highs * (1 - width), highs, gap)
+    return demand, supply
+
+
+# ======================================================
+# ZONE INDEX
+# ======================================================
+
+class ZoneIndex:
+    """
+    Zona satu sisi (demand atau supply) satu symbol sebagai interval
+    terurut & disjoint. Karena disjoint, lower dan upper sama-sama terurut
+    sehingga query titik/rentang cukup bisect (O(log n)).
+
+    Insert menggabungkan zona yang overlap atau berjarak < `gap` (aturan
+    yang sama dengan cluster_zones); expire membuang zona yang tidak
+    tersentuh swing baru sejak `ts` tertentu.
+    """
+
+    def __init__(self, gap=MERGE_GAP):
+        self.gap = gap
+        self.lo = []
+        self.hi = []
+        self.ts = []          # waktu swing terakhir yang membentuk zona
+        self.touches = []     # jumlah swing yang tergabung
+
+    def __len__(self):
+        return len(self.lo)
+
+    @classmethod
+    def from_zones(cls, zones, ts=0, gap=MERGE_GAP):
+        idx = cls(gap)
+        for lo, hi in zones:
+            idx.insert(lo, hi, ts)
+        return idx
+
+    def _near(self, lo, hi):
+        """True bila zona [lo, ...] bersinggungan / cukup dekat dengan upper `hi`."""
+        return lo <= hi or abs(lo - hi) / hi < self.gap
+
+    def insert(self, lo, hi, ts=0, touches=1):
+        lo, hi = float(lo), float(hi)
+        i = bisect_left(self.lo, lo)
+
+        # gabung dengan tetangga kiri
+        if i > 0 and self._near(lo, self.hi[i - 1]):
+            i -= 1
+            lo = self.lo[i]
+            hi = max(hi, self.hi[i])
+            ts = max(ts, self.ts[i])
+            touches += self.touches[i]
+            self._pop(i)
+
+        # gabung dengan tetangga kanan selama masih dekat
+        while i < len(self.lo) and self._near(self.lo[i], hi):
+            hi = max(hi, self.hi[i])
+            ts = max(ts, self.ts[i])
+            touches += self.touches[i]
+            self._pop(i)
+
+        self.lo.insert(i, lo)
+        self.hi.insert(i, hi)
+        self.ts.insert(i, ts)
+        self.touches.insert(i, touches)
+        return i
+
+    def _pop(self, i):
+        for arr in (self.lo, self.hi, self.ts, self.touches):
+            del arr[i]
+
+    def expire(self, before_ts):
+        """Buang zona yang swing terakhirnya lebih lama dari `before_ts`."""
+        keep = [k for k, t in enumerate(self.ts) if t >= before_ts]
+        if len(keep) == len(self.ts):
+            return 0
+        removed = len(self.ts) - len(keep)
+        for name in ("lo", "hi", "ts", "touches"):
+            arr = getattr(self, name)
+            setattr(self, name, [arr[k] for k in keep])
+        return removed
+
+    def containing(self, price):
+        """Zona yang memuat `price` (maks satu karena disjoint), atau None."""
+        i = bisect_right(self.lo, price) - 1
+        if i >= 0 and price <= self.hi[i]:
+            return self.lo[i], self.hi[i]
+        return None
+
+    def overlapping(self, low, high):
+        """Semua zona yang beririsan dengan rentang [low, high]."""
+        i = bisect_left(self.hi, low)
+        j = bisect_right(self.lo, high)
+        return list(zip(self.lo[i:j], self.hi[i:j]))
+
+    def nearest(self, price):
+        """Zona terdekat di bawah & di atas `price` (masing-masing atau None)."""
+        i = bisect_right(self.lo, price)
+        below = (self.lo[i - 1], self.hi[i - 1]) if i > 0 else None
+        above = (self.lo[i], self.hi[i]) if i < len(self.lo) else None
+        return below, above
+
+    def zones(self):
+        return list(zip(self.lo, self.hi))
+
+
+class ZoneTracker:
+    """
+    Demand & supply ZoneIndex untuk satu symbol, diisi incremental dari
+    frame candle: hanya pivot yang terkonfirmasi setelah update terakhir
+    yang di-insert.
+    """
+
+    def __init__(self, pivot_width=1, max_age=ZONE_MAX_AGE):
+        self.pivot_width = pivot_width
+        self.max_age = max_age          # np.timedelta64 / pd.Timedelta / None
+        self.demand = ZoneIndex()
+        self.supply = ZoneIndex()
+        self.last_pivot = None          # date pivot terakhir yang diproses
+
+    def update(self, df):
+        if df is None or len(df) == 0:
+            return 0
+
+        dates = df["date"].to_numpy()
+        high = df["high"].to_numpy(dtype=np.float64)
+        low = df["low"].to_numpy(dtype=np.float64)
+
+        new = 0
+        for index, values, kind, bounds in (
+            (self.demand, low, "low", lambda p: (p, p * (1 + ZONE_WIDTH))),
+            (self.supply, high, "high", lambda p: (p * (1 - ZONE_WIDTH), p)),
+        ):
+            mask = pivot_mask(values, self.pivot_width, kind)
+            if self.last_pivot is not None:
+                mask &= dates > self.last_pivot
+            for i in np.flatnonzero(mask).tolist():
+                index.insert(*bounds(values[i]), ts=dates[i])
+                new += 1
+
+        # pivot terakhir yang bisa terkonfirmasi: n - width - 2
+        confirmed = len(df) - self.pivot_width - 2
+        if confirmed >= 0:
+            self.last_pivot = dates[confirmed]
+
+        if self.max_age is not None:
+            cutoff = dates[-1] - np.timedelta64(self.max_age)
+            self.demand.expire(cutoff)
+            self.supply.expire(cutoff)
+        return new
+
+    def at_price(self, price):
+        """{'demand': zona|None, 'supply': zona|None} yang memuat harga."""
+        return {"demand": self.demand.containing(price), "supply": self.supply.containing(price)}
+
+
+class ZoneScanner:
+    """
+    ZoneTracker untuk banyak symbol (satu interval) + scan harga live
+    terhadap zonanya. Maksimal `max_trackers` symbol, yang paling lama
+    tidak dipakai dibuang.
+    """
+
+    def __init__(self, pivot_width=1, max_age=ZONE_MAX_AGE, max_trackers=MAX_TRACKERS):
+        self.pivot_width = pivot_width
+        self.max_age = max_age
+        self.max_trackers = max_trackers
+        self.trackers = {}
+        self._lock = threading.Lock()
+
+    def tracker(self, symbol):
+        with self._lock:
+            key = symbol.upper()
+            t = self.trackers.pop(key, None)
+            if t is None:
+                t = ZoneTracker(self.pivot_width, self.max_age)
+            self.trackers[key] = t   # paling baru di belakang
+            while len(self.trackers) > self.max_trackers:
+                self.trackers.pop(next(iter(self.trackers)))
+            return t
+
+    def update(self, symbol, df):
+        return self.tracker(symbol).update(df)
+
+    def scan(self, prices):
+        """
+        prices: {symbol: harga terakhir}. Return list hit
+        {symbol, side, low, high, price} untuk harga yang berada di zona.
+        """
+        hits = []
+        trackers = self.trackers
+        for symbol, price in prices.items():
+            t = trackers.get(symbol.upper())
+            if t is None:
+                continue
+            for side, index in (("demand", t.demand), ("supply", t.supply)):
+                z = index.containing(price)
+                if z is not None:
+                    hits.append({"symbol": symbol, "side": side, "low": z[0], "high": z[1], "price": price})
+        return hits
+
+
+_SCANNERS = {}
+_SCANNERS_LOCK = threading.Lock()
+
+
+def get_zone_scanner(interval):
+    """ZoneScanner bersama per interval (pivot 1m dan 1h tidak dicampur)."""
+    with _SCANNERS_LOCK:
+        if interval not in _SCANNERS:
+            _SCANNERS[interval] = ZoneScanner()
+        return _SCANNERS[interval]
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _legacy_find_zones(high, low):
+    """Implementasi loop lama (detect_zones sebelum vectorized), untuk pembanding."""
+    zones_demand = []
+    zones_supply = []
+    n = len(high)
+
+    for i in range(2, n - 2):
+        if low[i] < low[i - 1] and low[i] < low[i + 1]:
+            zones_demand.append((low[i], low[i] * 1.003))
+
+        if high[i] > high[i - 1] and high[i] > high[i + 1]:
+            zones_supply.append((high[i] * 0.997, high[i]))
+
+    def cluster(zones):
+        if not zones:
+            return []
+        zones = sorted(zones)
+        merged = [zones[0]]
+        for z in zones[1:]:
+            last = merged[-1]
+            if abs(z[0] - last[1]) / last[1] < 0.004:
+                merged[-1] = (min(last[0], z[0]), max(last[1], z[1]))
+            else:
+                merged.append(z)
+        return merged
+
+    return cluster(zones_demand), cluster(zones_supply)
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    for n in (200, 5_000, 100_000):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        high = close * (1 + rng.random(n) * 0.002)
+        low = close * (1 - rng.random(n) * 0.002)
+
+        t0 = time.perf_counter()
+        legacy = _legacy_find_zones(high, low)
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fast = find_zones(high, low)
+        t_vec = time.perf_counter() - t0
+
+        same = all(
+            len(a) == len(b) and np.array_equal(np.array(a), np.array(b))
+            for a, b in zip(legacy, fast)
+        )
+        print(f"n={n:>7,}  loop {t_loop * 1e3:8.2f} ms  numpy {t_vec * 1e3:6.2f} ms  "
+              f"x{t_loop / t_vec:5.1f}  identical={same}  zones={len(fast[0])}/{len(fast[1])}")
+
+    t0 = time.perf_counter()
+    wide = find_zones(high, low, pivot_width=5)
+    print(f"pivot_width=5 on {n:,} bars: {(time.perf_counter() - t0) * 1e3:.2f} ms, zones={len(wide[0])}/{len(wide[1])}")
+
+    # scan: 5000 symbol × ~20 zona per sisi, satu tick harga
+    scanner = ZoneScanner(max_trackers=5_000)
+    prices = {}
+    for k in range(5_000):
+        t = scanner.tracker(f"SYM{k}")
+        base = 10 + rng.random() * 100
+        for lo in np.sort(base * (1 + rng.random(20) * 0.5)):
+            t.demand.insert(lo, lo * (1 + ZONE_WIDTH))
+            t.supply.insert(lo * 1.2, lo * 1.2 * (1 + ZONE_WIDTH))
+        prices[f"SYM{k}"] = base * (1 + rng.random() * 0.6)
+
+    t0 = time.perf_counter()
+    hits = scanner.scan(prices)
+    print(f"scan 5,000 symbols: {(time.perf_counter() - t0) * 1e3:.2f} ms, {len(hits)} hits")
+
+    scanner.max_trackers = 100
+    scanner.tracker("NEW")
+    assert len(scanner.trackers) == 100 and "NEW" in scanner.trackers and "SYM0" not in scanner.trackers
+    print("tracker dibatasi max_trackers (LRU) ✔")
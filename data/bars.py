@@ -0,0 +1,298 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# bar selesai yang disimpan per builder (chart / indikator cukup ratusan bar)
+MAX_BARS = 500
+
+
+class BarBuilder(ABC):
+    """
+    Basis builder bar non-waktu yang streaming.
+
+    State per builder O(1): satu bar yang sedang terbentuk + deque bar
+    selesai berukuran tetap. Input bisa tick (ts, price, qty) atau kline
+    1m yang diurai menjadi path harga open → high/low → close.
+
+    Output `frame()` mengikuti kontrak load_candles
+    (date, open, high, low, close, volume) sehingga render_chart,
+    render_indicators dan premium_reversal bisa dipakai langsung.
+    """
+
+    def __init__(self, size, max_bars=MAX_BARS):
+        if size <= 0:
+            raise ValueError("Bar size harus > 0")
+        self.size = float(size)
+        self.bars = deque(maxlen=max_bars)
+        self.completed = 0           # total bar selesai (deque membuang yang lama)
+        self.last_ts = None          # timestamp input terakhir (ms)
+        self._bar = None             # [ts, open, high, low, close, volume]
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Forming bar helpers
+    # -----------------------------
+    def _open(self, ts, price, qty):
+        self._bar = [ts, price, price, price, price, qty]
+
+    def _extend(self, ts, price, qty):
+        b = self._bar
+        if price > b[2]:
+            b[2] = price
+        if price < b[3]:
+            b[3] = price
+        b[4] = price
+        b[5] += qty
+
+    def _close(self):
+        self.bars.append(tuple(self._bar))
+        self.completed += 1
+        self._bar = None
+
+    @abstractmethod
+    def _on_tick(self, ts, price, qty):
+        """Proses satu tick; dipanggil dengan self._lock sudah dipegang."""
+
+    # -----------------------------
+    # Input
+    # -----------------------------
+    def update(self, ts, price, qty=0.0):
+        """Satu tick. Return jumlah bar yang selesai."""
+        with self._lock:
+            before = self.completed
+            self._on_tick(int(ts), float(price), float(qty))
+            self.last_ts = int(ts)
+            return self.completed - before
+
+    def update_many(self, times, prices, qtys):
+        """Batch tick (mis. dari TradeFlow / replay trade tape)."""
+        with self._lock:
+            before = self.completed
+            for ts, p, q in zip(np.asarray(times, dtype=np.int64).tolist(),
+                                np.asarray(prices, dtype=np.float64).tolist(),
+                                np.asarray(qtys, dtype=np.float64).tolist()):
+                self._on_tick(ts, p, q)
+            if len(times):
+                self.last_ts = int(times[-1])
+            return self.completed - before
+
+    def update_kline(self, ts, o, h, l, c, v):
+        """
+        Satu kline (mis. 1m). Urutan harga diasumsikan o → l → h → c untuk
+        candle naik dan o → h → l → c untuk candle turun; volume dibagi rata.
+        """
+        with self._lock:
+            return self._feed_kline(ts, o, h, l, c, v)
+
+    def _feed_kline(self, ts, o, h, l, c, v):
+        """update_kline tanpa lock (pemanggil memegang self._lock)."""
+        path = (o, l, h, c) if c >= o else (o, h, l, c)
+        q = float(v) / 4
+        before = self.completed
+        for p in path:
+            self._on_tick(int(ts), float(p), q)
+        self.last_ts = int(ts)
+        return self.completed - before
+
+    def feed_candles(self, df, include_last=False):
+        """
+        Masukkan kline dari frame load_candles yang belum pernah diproses.
+        Bar terakhir (masih terbentuk) dilewati kecuali `include_last`.
+        """
+        if df is None or df.empty:
+            return 0
+
+        ts = df["date"].to_numpy().astype("datetime64[ms]").astype(np.int64)
+        o, h, l, c, v = (df[col].to_numpy(dtype=np.float64) for col in ("open", "high", "low", "close", "volume"))
+        rows = np.arange(len(df) if include_last else len(df) - 1)
+
+        # filter last_ts + feed dalam satu lock: builder di-share antar
+        # session, dua refresh bersamaan tidak boleh memasukkan baris yang sama
+        with self._lock:
+            if self.last_ts is not None:
+                rows = rows[ts[rows] > self.last_ts]
+
+            done = 0
+            for i in rows.tolist():
+                done += self._feed_kline(ts[i], o[i], h[i], l[i], c[i], v[i])
+            return done
+
+    # -----------------------------
+    # Output
+    # -----------------------------
+    def frame(self, include_forming=True):
+        with self._lock:
+            rows = list(self.bars)
+            if include_forming and self._bar is not None:
+                rows.append(tuple(self._bar))
+
+        arr = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        return pd.DataFrame({
+            "date": arr[:, 0].astype(np.int64).astype("datetime64[ms]"),
+            "open": arr[:, 1],
+            "high": arr[:, 2],
+            "low": arr[:, 3],
+            "close": arr[:, 4],
+            "volume": arr[:, 5],
+        })
+
+
+class VolumeBarBuilder(BarBuilder):
+    """Bar selesai tiap akumulasi volume >= `size` (tick terakhir tidak dipecah)."""
+
+    def _on_tick(self, ts, price, qty):
+        if self._bar is None:
+            self._open(ts, price, qty)
+        else:
+            self._extend(ts, price, qty)
+        if self._bar[5] >= self.size:
+            self._close()
+
+
+class RangeBarBuilder(BarBuilder):
+    """Bar selesai saat high - low >= `size`."""
+
+    def _on_tick(self, ts, price, qty):
+        if self._bar is None:
+            self._open(ts, price, qty)
+        else:
+            self._extend(ts, price, qty)
+        if self._bar[2] - self._bar[3] >= self.size:
+            self._close()
+
+
+class RenkoBuilder(BarBuilder):
+    """
+    Renko klasik: brick baru tiap harga bergerak `size` dari brick terakhir
+    searah trend, atau 2 × `size` untuk reversal. Satu tick bisa menghasilkan
+    beberapa brick; volume sejak brick terakhir masuk ke brick pertama.
+    """
+
+    def __init__(self, size, max_bars=MAX_BARS):
+        super().__init__(size, max_bars)
+        self.anchor = None     # close brick terakhir
+        self.direction = 0     # 1 naik, -1 turun, 0 belum ada brick
+        self._volume = 0.0
+
+    def _brick(self, ts, open_, close):
+        self.bars.append((ts, open_, max(open_, close), min(open_, close), close, self._volume))
+        self.completed += 1
+        self._volume = 0.0
+        self.anchor = close
+
+    def _on_tick(self, ts, price, qty):
+        self._volume += qty
+        if self.anchor is None:
+            self.anchor = price
+            return
+
+        s = self.size
+        while True:
+            if self.direction >= 0 and price >= self.anchor + s:
+                self._brick(ts, self.anchor, self.anchor + s)
+                self.direction = 1
+            elif self.direction <= 0 and price <= self.anchor - s:
+                self._brick(ts, self.anchor, self.anchor - s)
+                self.direction = -1
+            elif self.direction == 1 and price <= self.anchor - 2 * s:
+                # reversal: brick turun dibuka dari bawah brick naik terakhir
+                self._brick(ts, self.anchor - s, self.anchor - 2 * s)
+                self.direction = -1
+            elif self.direction == -1 and price >= self.anchor + 2 * s:
+                self._brick(ts, self.anchor + s, self.anchor + 2 * s)
+                self.direction = 1
+            else:
+                break
+
+    def frame(self, include_forming=False):
+        # renko tidak punya bar "forming"
+        return super().frame(include_forming=False)
+
+
+BUILDERS = {
+    "Volume": VolumeBarBuilder,
+    "Range": RangeBarBuilder,
+    "Renko": RenkoBuilder,
+}
+
+
+def auto_size(df, kind, bars_per_unit=5):
+    """
+    Ukuran bar dari histori 1m: kira-kira satu bar per `bars_per_unit`
+    candle 1m (volume) atau median range 1m × `bars_per_unit` (range/renko).
+    Dibulatkan ke 2 angka signifikan supaya stabil antar refresh.
+    """
+    if kind == "Volume":
+        raw = df["volume"].median() * bars_per_unit
+    else:
+        raw = (df["high"] - df["low"]).median() * bars_per_unit
+    if not np.isfinite(raw) or raw <= 0:
+        raw = 1.0
+    return float(f"{raw:.2g}")
+
+
+def bars_from_candles(df, kind, size):
+    """Sekali jalan (non-streaming): frame 1m → frame bar alternatif."""
+    builder = BUILDERS[kind](size)
+    builder.feed_candles(df, include_last=True)
+    return builder.frame()
+
+
+_BUILDERS = {}
+_BUILDERS_LOCK = threading.Lock()
+
+
+def get_bar_builder(symbol, kind, size):
+    """Builder per (symbol, jenis, size), di-share antar session."""
+    with _BUILDERS_LOCK:
+        key = (symbol.upper(), kind, float(size))
+        if key not in _BUILDERS:
+            _BUILDERS[key] = BUILDERS[kind](size)
+        return _BUILDERS[key]
+
+
+# ======================================================
+# CONCURRENT FEED CHECK
+# ======================================================
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 2000
+    close = 30000 + np.cumsum(rng.normal(0, 5, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    df = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": open_,
+        "high": np.maximum(open_, close) + rng.random(n) * 3,
+        "low": np.minimum(open_, close) - rng.random(n) * 3,
+        "close": close,
+        "volume": rng.random(n) * 10,
+    })
+
+    for kind, size in (("Volume", 40.0), ("Range", 25.0), ("Renko", 10.0)):
+        expected = bars_from_candles(df, kind, size)
+
+        bad = 0
+        for _ in range(20):
+            builder = BUILDERS[kind](size)
+            start = threading.Barrier(4)
+
+            def feed():
+                start.wait()
+                builder.feed_candles(df, include_last=True)
+
+            threads = [threading.Thread(target=feed) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            got = builder.frame()
+            if len(got) != len(expected) or not np.allclose(got.iloc[:, 1:], expected.iloc[:, 1:]):
+                bad += 1
+
+        assert bad == 0, (kind, bad)
+        print(f"{kind:6s} 4 thread × feed_candles: {len(expected)} bar, 20/20 trial identik dengan feed tunggal ✔")
@@ -0,0 +1,126 @@
+import threading
+import time
+
+
+# ======================================================
+# TTL PER INTERVAL
+# ======================================================
+# Candle yang sedang terbentuk berubah terus, jadi TTL dibuat pendek
+# untuk interval kecil dan lebih panjang untuk interval besar.
+INTERVAL_TTL = {
+    "1m": 5,
+    "5m": 15,
+    "15m": 30,
+    "30m": 45,
+    "1h": 60,
+    "60m": 60,
+    "4h": 120,
+    "1d": 300,
+}
+
+DEFAULT_TTL = 10
+
+
+def ttl_for_interval(interval):
+    return INTERVAL_TTL.get(interval, DEFAULT_TTL)
+
+
+def ttl_for_key(key):
+    """Key cache selalu diawali (mode, symbol, interval, ...)."""
+    return ttl_for_interval(key[2])
+
+
+class _InFlight:
+    """Satu fetch yang sedang berjalan; session lain menunggu hasil yang sama."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class CandleCache:
+    """
+    Cache candle process-wide, key = (mode, symbol, interval).
+
+    - Entry kadaluarsa sesuai TTL interval.
+    - Miss yang bersamaan untuk key yang sama digabung menjadi satu fetch
+      (request coalescing); semua session menunggu hasil fetch tersebut.
+    - Counter hit / miss / coalesced untuk memantau traffic upstream.
+    """
+
+    def __init__(self, ttl_fn=ttl_for_key, clock=time.monotonic):
+        self._ttl_fn = ttl_fn
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._inflight = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Kembalikan value untuk `key`; panggil `fetch()` hanya bila entry
+        tidak ada / expired dan belum ada fetch lain untuk key yang sama.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._stats["hits"] += 1
+                return entry[1]
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                owner = False
+            else:
+                self._stats["misses"] += 1
+                flight = _InFlight()
+                self._inflight[key] = flight
+                owner = True
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._inflight.pop(key, None)
+            flight.error = e
+            flight.done.set()
+            raise
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_fn(key), value)
+            self._inflight.pop(key, None)
+        flight.value = value
+        flight.done.set()
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Snapshot counter + jumlah fetch upstream yang dihemat."""
+        with self._lock:
+            s = dict(self._stats)
+            s["entries"] = len(self._entries)
+        total = s["hits"] + s["misses"] + s["coalesced"]
+        s["saved"] = s["hits"] + s["coalesced"]
+        s["hit_ratio"] = (s["saved"] / total) if total else 0.0
+        return s
+
+
+_CACHE = CandleCache()
+
+
+def get_candle_cache():
+    return _CACHE
@@ -0,0 +1,220 @@
+import os
+import threading
+
+import numpy as np
+
+from data.klines import klines_to_frame
+
+STORE_DIR = os.environ.get("CANDLE_STORE_DIR", "data/store")
+
+# bar maksimum per (symbol, interval); bar tertua dibuang saat append
+# melewati MAX_BARS + TRIM_SLACK (rewrite diamortisasi, bukan tiap bar)
+MAX_BARS = 30 * 1440
+TRIM_SLACK = 1440
+
+# Kolom disimpan sebagai file biner mentah (satu file per kolom) sehingga
+# bisa di-append dan dibaca lewat np.memmap tanpa parsing.
+COLUMNS = {
+    "open_time": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "close_time": np.int64,
+    "quote_volume": np.float64,
+}
+
+
+class CandleStore:
+    """
+    Candle store kolumnar di disk per (symbol, interval).
+
+    Layout: <root>/<SYMBOL>/<interval>/<kolom>.bin, semua kolom sejajar
+    dan terurut berdasarkan open_time. Tiap seri dibatasi `max_bars`.
+    """
+
+    def __init__(self, root=STORE_DIR, max_bars=MAX_BARS):
+        self.root = root
+        self.max_bars = max_bars
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+    def _dir(self, symbol, interval):
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _file(self, symbol, interval, col):
+        return os.path.join(self._dir(symbol, interval), f"{col}.bin")
+
+    def lock(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.RLock()
+            return self._locks[key]
+
+    def _map(self, symbol, interval, col, rows=None):
+        path = self._file(symbol, interval, col)
+        dtype = np.dtype(COLUMNS[col])
+        if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        arr = np.memmap(path, dtype=dtype, mode="r")
+        return arr if rows is None else arr[:rows]
+
+    def _rows(self, symbol, interval):
+        """
+        Jumlah bar utuh = panjang kolom terpendek. Append ditulis per kolom,
+        jadi crash di tengah append bisa meninggalkan kolom yang lebih
+        panjang; ekor itu diabaikan saat baca dan dipotong saat append berikutnya.
+        """
+        rows = None
+        for col, dtype in COLUMNS.items():
+            path = self._file(symbol, interval, col)
+            n = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+            rows = n if rows is None else min(rows, n)
+        return rows
+
+    # -----------------------------
+    # Read
+    # -----------------------------
+    def size(self, symbol, interval):
+        return self._rows(symbol, interval)
+
+    def first_open_time(self, symbol, interval):
+        with self.lock(symbol, interval):
+            t = self._map(symbol, interval, "open_time", self._rows(symbol, interval))
+            return int(t[0]) if len(t) else None
+
+    def last_open_time(self, symbol, interval):
+        with self.lock(symbol, interval):
+            t = self._map(symbol, interval, "open_time", self._rows(symbol, interval))
+            return int(t[-1]) if len(t) else None
+
+    def read_arrays(self, symbol, interval, limit=None):
+        """Ambil `limit` bar terakhir sebagai dict kolom -> np.ndarray (copy)."""
+        with self.lock(symbol, interval):
+            rows = self._rows(symbol, interval)
+            out = {}
+            for col in COLUMNS:
+                arr = self._map(symbol, interval, col, rows)
+                if limit is not None:
+                    arr = arr[-limit:]
+                out[col] = np.array(arr)
+            return out
+
+    def read_since(self, symbol, interval, start_time):
+        """Bar dengan open_time >= start_time saja (dipakai resampling incremental)."""
+        with self.lock(symbol, interval):
+            rows = self._rows(symbol, interval)
+            times = self._map(symbol, interval, "open_time", rows)
+            start = int(np.searchsorted(times, start_time, side="left"))
+            del times
+            return {col: np.array(self._map(symbol, interval, col, rows)[start:]) for col in COLUMNS}
+
+    def read(self, symbol, interval, limit=None):
+        """Frame dengan kontrak yang sama seperti load_candles."""
+        return klines_to_frame(self.read_arrays(symbol, interval, limit))
+
+    # -----------------------------
+    # Write
+    # -----------------------------
+    def write(self, symbol, interval, arrays):
+        """Tulis ulang seluruh kolom (dipakai saat backfill ke belakang)."""
+        with self.lock(symbol, interval):
+            os.makedirs(self._dir(symbol, interval), exist_ok=True)
+            for col, dtype in COLUMNS.items():
+                path = self._file(symbol, interval, col)
+                tmp = path + ".tmp"
+                np.ascontiguousarray(arrays[col], dtype=dtype).tofile(tmp)
+                os.replace(tmp, path)
+
+    def append(self, symbol, interval, arrays):
+        """
+        Append bar baru. Bar di store dengan open_time >= bar pertama yang
+        baru dianggap usang (bar yang masih terbentuk) dan ditimpa.
+        """
+        new_times = np.asarray(arrays["open_time"], dtype=np.int64)
+        if len(new_times) == 0:
+            return
+
+        with self.lock(symbol, interval):
+            os.makedirs(self._dir(symbol, interval), exist_ok=True)
+            times = self._map(symbol, interval, "open_time", self._rows(symbol, interval))
+            # semua kolom dipotong ke panjang yang sama → ekor append yang putus ikut terbuang
+            keep = int(np.searchsorted(times, new_times[0], side="left"))
+            del times
+
+            for col, dtype in COLUMNS.items():
+                path = self._file(symbol, interval, col)
+                with open(path, "ab") as f:
+                    f.truncate(keep * np.dtype(dtype).itemsize)
+                    np.ascontiguousarray(arrays[col], dtype=dtype).tofile(f)
+
+            if self.max_bars is not None and self.size(symbol, interval) > self.max_bars + TRIM_SLACK:
+                self.write(symbol, interval, self.read_arrays(symbol, interval, self.max_bars))
+
+    def prepend(self, symbol, interval, arrays):
+        """Tambahkan histori lama di depan (hasil paginasi mundur)."""
+        with self.lock(symbol, interval):
+            current = self.read_arrays(symbol, interval)
+            first = current["open_time"][0] if len(current["open_time"]) else None
+
+            older = {c: np.asarray(v, dtype=COLUMNS[c]) for c, v in arrays.items()}
+            if first is not None:
+                mask = older["open_time"] < first
+                older = {c: v[mask] for c, v in older.items()}
+
+            merged = {c: np.concatenate([older[c], current[c]]) for c in COLUMNS}
+            if self.max_bars is not None:
+                merged = {c: v[-self.max_bars:] for c, v in merged.items()}
+            self.write(symbol, interval, merged)
+
+
+_STORE = CandleStore()
+
+
+def get_candle_store():
+    return _STORE
+
+
+# ======================================================
+# TRIM CHECK
+# ======================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    def bars(lo, hi):
+        t = np.arange(lo, hi, dtype=np.int64) * 60_000
+        out = {c: np.arange(lo, hi, dtype=np.float64) for c in COLUMNS}
+        out["open_time"], out["close_time"] = t, t + 59_999
+        return out
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root, max_bars=1000)
+        store.write("BTCUSDT", "1m", bars(0, 1000))
+
+        sizes = []
+        for i in range(1000, 5000, 10):
+            store.append("BTCUSDT", "1m", bars(i, i + 10))
+            sizes.append(store.size("BTCUSDT", "1m"))
+
+        assert max(sizes) <= 1000 + TRIM_SLACK, max(sizes)
+        t = store.read_arrays("BTCUSDT", "1m")["open_time"]
+        assert t[-1] == 4999 * 60_000 and (np.diff(t) == 60_000).all()
+        print(f"append 4000 bar, max_bars=1000 → ukuran maks {max(sizes)}, akhir {len(t)} bar ✔")
+
+        # append yang putus di tengah: hanya sebagian kolom sempat ditulis
+        n = store.size("BTCUSDT", "1m")
+        for col in ("open_time", "open", "high"):
+            with open(store._file("BTCUSDT", "1m", col), "ab") as f:
+                np.zeros(3, dtype=COLUMNS[col]).tofile(f)
+        assert store.size("BTCUSDT", "1m") == n
+        assert len(store.read("BTCUSDT", "1m")) == n
+        store.append("BTCUSDT", "1m", bars(5000, 5001))
+        cols = store.read_arrays("BTCUSDT", "1m")
+        assert all(len(v) == n + 1 for v in cols.values()) and cols["open_time"][-1] == 5000 * 60_000
+        print("kolom tidak sejajar → dibaca sepanjang kolom terpendek, diperbaiki saat append ✔")
@@ -0,0 +1,68 @@
+import threading
+
+import pandas as pd
+
+
+def merge_candles(window: pd.DataFrame, fresh: pd.DataFrame, limit=200):
+    """
+    Gabungkan bar baru ke window yang sudah ada.
+
+    Semua bar di `window` dengan date >= bar pertama `fresh` dianggap usang
+    (bar terakhir yang masih terbentuk) dan diganti; bar yang sudah close
+    ditambahkan di belakang. Hasil dipotong ke `limit` bar terakhir.
+    """
+    if window is None or window.empty:
+        merged = fresh
+    elif fresh is None or fresh.empty:
+        merged = window
+    else:
+        first = fresh["date"].iloc[0]
+        keep = window[window["date"] < first]
+        merged = pd.concat([keep, fresh], ignore_index=True)
+
+    if limit is not None and len(merged) > limit:
+        merged = merged.iloc[-limit:]
+
+    return merged.reset_index(drop=True)
+
+
+class CandleWindowStore:
+    """
+    Simpan window candle terakhir per (market, symbol, interval) supaya
+    refresh berikutnya cukup mengambil bar sejak `date` terakhir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def get(self, key):
+        with self._lock:
+            return self._windows.get(key)
+
+    def last_date(self, key):
+        window = self.get(key)
+        if window is None or window.empty:
+            return None
+        return window["date"].iloc[-1]
+
+    def update(self, key, fresh, limit=200, replace=False):
+        with self._lock:
+            window = None if replace else self._windows.get(key)
+            merged = merge_candles(window, fresh, limit)
+            self._windows[key] = merged
+            return merged
+
+    def clear(self, key=None):
+        with self._lock:
+            if key is None:
+                self._windows.clear()
+            else:
+                self._windows.pop(key, None)
+
+
+_STORE = CandleWindowStore()
+
+
+def get_window_store():
+    return _STORE
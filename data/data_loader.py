@@ -1,97 +1,351 @@
-import yfinance as yf
+import threading
+
 import pandas as pd
-import requests
+
+from data.candle_cache import get_candle_cache
+from data.candle_window import get_window_store
+from data.candle_store import get_candle_store
+from data.klines import parse_klines, klines_to_frame
+from data.ohlcv import canonical_ohlcv
+from data.rate_limit import get_mexc_limiter
+from data.resample import BASE_INTERVAL, BASE_MAX_BARS, base_bars_for, can_derive, get_resampler
+from data.http_client import http_get
+from data.yf_planner import yf_download
+
+WINDOW_LIMIT = 200
+
+# Crypto: histori yang di-backfill sekali ke store lokal, lalu dijaga
+# tetap up-to-date secara incremental.
+HISTORY_BARS = 5000
+MEXC_PAGE = 1000
+
+
+def load_candles(symbol, interval, mode="Crypto", incremental=True, limit=WINDOW_LIMIT):
+    """
+    Ambil candle lewat cache process-wide.
+    Semua session dengan (mode, symbol, interval) yang sama berbagi satu fetch.
+
+    Untuk crypto, `limit` boleh lebih besar dari 200: window dibaca dari
+    candle store lokal, bukan dari API.
+
+    Hasilnya frame OHLCV kanonik (data.ohlcv): bertipe, array read-only,
+    attrs berisi symbol/interval untuk cache indicator engine.
+
+    Crypto 5m/15m/1h (dst.) diturunkan lokal dari seri base 1m selama
+    history 1m yang dibutuhkan masih dalam BASE_MAX_BARS (data.resample).
+    """
+    # satu bentuk symbol untuk key cache, store dan request upstream
+    symbol = symbol.upper()
+
+    # incremental=False (watchlist) hanya 1 halaman MEXC → jangan berbagi entry dengan window store
+    key = ("Crypto" if mode.startswith("Crypto") else "Saham", symbol, interval, limit, incremental)
+    df = get_candle_cache().get_or_fetch(
+        key, lambda: canonical_ohlcv(
+            _fetch_candles(symbol, interval, mode, incremental, limit), symbol, interval
+        )
+    )
+
+    # array read-only → cukup shallow copy; kolom yang ditambah komponen
+    # tidak ikut ke session lain
+    return df.copy(deep=False)
 
 
-def load_candles(symbol, interval, mode="Crypto"):
-    # ====== CRYPTO (BINANCE) ======
-    # ====== CRYPTO (MEXC) ======
+def _fetch_candles(symbol, interval, mode="Crypto", incremental=True, limit=WINDOW_LIMIT):
+    """
+    Mode incremental: simpan histori per (symbol, interval) dan hanya minta
+    bar sejak open_time terakhir ke upstream. Bar terakhir (yang masih
+    terbentuk) diganti, bar yang sudah close ditambahkan.
+    """
     # ====== CRYPTO VIA MEXC ======
     if mode.startswith("Crypto"):
+        if not incremental:
+            return _fetch_mexc(symbol, interval, limit=min(limit, MEXC_PAGE))
+
+        if can_derive(interval, limit):
+            return _derive_from_base(symbol, interval, limit)
+
+        store = get_candle_store()
+        with store.lock(symbol, interval):
+            sync_mexc(symbol, interval, history=max(HISTORY_BARS, limit))
+            return store.read(symbol, interval, limit)
+
+    store = get_window_store()
+
+    # ====== SAHAM INDONESIA (YFINANCE) ======
+    # Yahoo Finance tidak support 1m untuk IDX
+    if interval == "1m":
+        interval = "5m"
+
+    key = ("Saham", symbol.upper(), interval)
+    last = store.last_date(key) if incremental else None
+
+    if last is None:
+        fresh = _fetch_yahoo(symbol, interval, period="5d")
+        return store.update(key, fresh, None, replace=True)
+
+    # mulai dari awal hari bar terakhir; bar yang tumpang tindih diganti
+    fresh = _fetch_yahoo(symbol, interval, start=pd.Timestamp(last).date())
+    merged = store.update(key, fresh, None)
+
+    # jaga window tetap setara period="5d" (5 hari bursa terakhir)
+    days = merged["date"].dt.normalize()
+    first_day = days.drop_duplicates().iloc[-5:].iloc[0]
+    if days.iloc[0] < first_day:
+        merged = store.update(key, merged[days >= first_day], None, replace=True)
+
+    return merged
+
+
+# ======================================================
+# MULTI-TIMEFRAME DARI BASE 1M
+# ======================================================
+
+def _derive_from_base(symbol, interval, limit=WINDOW_LIMIT, sync=True):
+    """Bar `interval` hasil resampling incremental dari candle store 1m."""
+    store = get_candle_store()
+    with store.lock(symbol, BASE_INTERVAL):
+        if sync:
+            sync_mexc(symbol, BASE_INTERVAL, history=max(HISTORY_BARS, base_bars_for(interval, limit)))
+        return get_resampler(symbol, interval).sync(store, symbol, limit)
+
+
+def load_mtf(symbol, intervals, limit=WINDOW_LIMIT, base_bars=BASE_MAX_BARS):
+    """
+    Semua timeframe crypto dari satu seri base 1m: satu sync ke MEXC,
+    sisanya resampling lokal. Return dict interval → frame kanonik.
+    Timeframe besar bisa berisi kurang dari `limit` bar bila base belum cukup.
+    """
+    symbol = symbol.upper()
+    key = ("Crypto", symbol, BASE_INTERVAL, "mtf", tuple(intervals), limit)
+    frames = get_candle_cache().get_or_fetch(
+        key, lambda: _fetch_mtf(symbol, intervals, limit, base_bars)
+    )
+    return {iv: df.copy(deep=False) for iv, df in frames.items()}
+
+
+def _fetch_mtf(symbol, intervals, limit, base_bars):
+    """
+    Histori base yang belum ada di-backfill di background: render pertama
+    langsung dapat frame parsial, render berikutnya (cache kedaluwarsa)
+    ikut memakai histori yang sudah masuk.
+    """
+    store = get_candle_store()
+    frames = {}
+
+    with store.lock(symbol, BASE_INTERVAL):
+        sync_mexc(symbol, BASE_INTERVAL, history=base_bars, background=True)
+
+        for interval in intervals:
+            if interval == BASE_INTERVAL:
+                df = store.read(symbol, BASE_INTERVAL, limit)
+            else:
+                df = _derive_from_base(symbol, interval, limit, sync=False)
+            frames[interval] = canonical_ohlcv(df, symbol, interval)
+
+    return frames
+
+
+# ======================================================
+# MEXC — LOCAL STORE SYNC
+# ======================================================
+
+def sync_mexc(symbol, interval, history=HISTORY_BARS, background=False):
+    """
+    Jaga candle store tetap up-to-date:
+    - store kosong / kurang dari `history` bar → backfill mundur
+      (background=True: di thread terpisah, return setelah halaman pertama)
+    - selain itu → ambil bar sejak open_time terakhir saja
+    `history` dibatasi max_bars store supaya backfill tidak melawan trim.
+    """
+    store = get_candle_store()
+    if store.max_bars is not None:
+        history = min(history, store.max_bars)
+
+    with store.lock(symbol, interval):
+        last = store.last_open_time(symbol, interval)
+
+        if last is None:
+            page = _fetch_mexc_arrays(symbol, interval, limit=MEXC_PAGE)
+            store.write(symbol, interval, page)
+        else:
+            # catch-up: ulangi selama halaman penuh (mis. app sempat mati)
+            while True:
+                page = _fetch_mexc_arrays(symbol, interval, limit=MEXC_PAGE, start_time=last)
+                store.append(symbol, interval, page)
+                if len(page["open_time"]) < MEXC_PAGE:
+                    break
+                last = int(store.last_open_time(symbol, interval))
 
-        url = (
-            "https://api.mexc.com/api/v3/klines"
-            f"?symbol={symbol}&interval={interval}&limit=200"
+        if store.size(symbol, interval) < history:
+            if background:
+                start_backfill(symbol, interval, history)
+            else:
+                backfill_mexc(symbol, interval, history)
+
+
+def backfill_mexc(symbol, interval, bars=HISTORY_BARS):
+    """
+    Paginasi mundur lewat endTime sampai store berisi `bars` candle.
+    Lock store hanya dipegang per halaman, bukan selama request ke MEXC
+    (kecuali pemanggil sudah memegangnya), jadi render lain tidak tertahan.
+    """
+    store = get_candle_store()
+
+    while True:
+        with store.lock(symbol, interval):
+            size = store.size(symbol, interval)
+            if size >= bars:
+                break
+            first = store.first_open_time(symbol, interval)
+            need = min(MEXC_PAGE, bars - size)
+
+        page = _fetch_mexc_arrays(
+            symbol, interval, limit=need, end_time=first - 1, allow_empty=True
         )
+        if len(page["open_time"]) == 0:
+            break   # histori di exchange sudah habis
 
-        resp = requests.get(url, timeout=10)
+        with store.lock(symbol, interval):
+            before = store.size(symbol, interval)
+            store.prepend(symbol, interval, page)
+            if store.size(symbol, interval) == before:
+                break
 
-        if resp.status_code != 200:
-            raise ValueError(f"MEXC HTTP {resp.status_code}: {resp.text[:200]}")
 
+_BACKFILLS = set()
+_BACKFILLS_LOCK = threading.Lock()
+
+
+def start_backfill(symbol, interval, bars):
+    """backfill_mexc di thread background, maksimal satu per (symbol, interval)."""
+    key = (symbol.upper(), interval)
+    with _BACKFILLS_LOCK:
+        if key in _BACKFILLS:
+            return False
+        _BACKFILLS.add(key)
+
+    def run():
         try:
-            data = resp.json()
-        except:
-            raise ValueError(f"MEXC non-JSON response: {resp.text[:200]}")
-
-        if not isinstance(data, list):
-            raise ValueError(f"MEXC API error: {data}")
-
-        if len(data) == 0:
-            raise ValueError("MEXC returned empty data")
-
-        # MEXC returns **8 columns only**
-        cols = [
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_volume"
-        ]
-
-        # Ensure each row has exactly 8 columns
-        cleaned = []
-        for row in data:
-            if len(row) >= 8:
-                cleaned.append(row[:8])
-            else:
-                raise ValueError(f"MEXC returned invalid row length: {row}")
+            backfill_mexc(symbol, interval, bars)
+        except Exception as e:
+            print("Backfill Error:", e)
+        finally:
+            with _BACKFILLS_LOCK:
+                _BACKFILLS.discard(key)
 
-        df = pd.DataFrame(cleaned, columns=cols)
+    threading.Thread(target=run, name=f"backfill-{key[0]}-{interval}", daemon=True).start()
+    return True
 
-        # Convert timestamps
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
-        df.rename(columns={"open_time": "date"}, inplace=True)
 
-        # Convert numbers
-        for col in ["open", "high", "low", "close", "volume"]:
-            df[col] = df[col].astype(float)
+def backfill_running(symbol, interval):
+    with _BACKFILLS_LOCK:
+        return (symbol.upper(), interval) in _BACKFILLS
 
-        return df
 
-    # ====== SAHAM INDONESIA (YFINANCE) ======
+# ======================================================
+# MEXC
+# ======================================================
+
+def _fetch_mexc(symbol, interval, limit=200, start_time=None, end_time=None, allow_empty=False):
+    return klines_to_frame(
+        _fetch_mexc_arrays(symbol, interval, limit, start_time, end_time, allow_empty)
+    )
+
+
+def _fetch_mexc_arrays(symbol, interval, limit=200, start_time=None, end_time=None, allow_empty=False):
+    url = (
+        "https://api.mexc.com/api/v3/klines"
+        f"?symbol={symbol}&interval={interval}&limit={limit}"
+    )
+    if start_time is not None:
+        url += f"&startTime={start_time}"
+    if end_time is not None:
+        url += f"&endTime={end_time}"
+
+    get_mexc_limiter().acquire()
+    resp = http_get(url)
+
+    if resp.status_code != 200:
+        raise ValueError(f"MEXC HTTP {resp.status_code}: {resp.text[:200]}")
+
+    try:
+        data = resp.json()
+    except:
+        raise ValueError(f"MEXC non-JSON response: {resp.text[:200]}")
+
+    if not isinstance(data, list):
+        raise ValueError(f"MEXC API error: {data}")
+
+    if len(data) == 0 and not allow_empty:
+        raise ValueError("MEXC returned empty data")
+
+    return parse_klines(data)
+
+
+# ======================================================
+# YAHOO FINANCE
+# ======================================================
+
+def _fetch_yahoo(symbol, interval, period="5d", start=None):
+    if start is not None:
+        df = yf_download(symbol, start=start, interval=interval)
+    else:
+        df = yf_download(symbol, period=period, interval=interval)
+
+    if df.empty:
+        raise ValueError(f"Yahoo Finance tidak mengembalikan data untuk {symbol} ({interval})")
+
+    df = df.reset_index()
+
+    # Beberapa interval TIDAK punya 'Adj Close'
+    # jadi kita adaptasikan rename ke kolom yang tersedia
+    cols = list(df.columns)
+
+    # Kasus umum:
+    # ['Date','Open','High','Low','Close','Adj Close','Volume']
+    if len(cols) == 7:
+        df.columns = ["date", "open", "high", "low", "close", "adj", "volume"]
+
+    # Kasus interval intraday (TIDAK ada Adj Close)
+    # ['Date','Open','High','Low','Close','Volume']
+    elif len(cols) == 6:
+        df.columns = ["date", "open", "high", "low", "close", "volume"]
+        df["adj"] = df["close"]  # tambahkan adj agar konsisten
+        df = df[["date","open","high","low","close","adj","volume"]]
+
     else:
-        # Yahoo Finance tidak support 1m untuk IDX
-        if interval == "1m":
-            interval = "5m"
-    
-        df = yf.download(symbol, period="5d", interval=interval)
-    
+        raise ValueError(f"Tidak dikenali struktur kolom dari YFinance: {cols}")
+
+    return df
+
+
+def _fetch_yahoo_many(symbols, interval, period="5d"):
+    """
+    Banyak ticker dalam satu yf.download (dipakai watchlist scanner).
+    Return dict symbol → frame dengan kolom sama seperti _fetch_yahoo.
+    """
+    symbols = list(symbols)
+    raw = yf_download(symbols, period=period, interval=interval, group_by="ticker", progress=False)
+    if raw.empty:
+        raise ValueError(f"Yahoo Finance tidak mengembalikan data ({interval})")
+
+    rename = {"Open": "open", "High": "high", "Low": "low", "Close": "close",
+              "Adj Close": "adj", "Volume": "volume"}
+    tickers = set(raw.columns.get_level_values(0))
+
+    out = {}
+    for sym in symbols:
+        if sym not in tickers:
+            continue
+
+        df = raw[sym].dropna(how="all")
         if df.empty:
-            raise ValueError(f"Yahoo Finance tidak mengembalikan data untuk {symbol} ({interval})")
-    
+            continue
+
         df = df.reset_index()
-    
-        # Beberapa interval TIDAK punya 'Adj Close'
-        # jadi kita adaptasikan rename ke kolom yang tersedia
-        cols = list(df.columns)
-    
-        # Kasus umum:
-        # ['Date','Open','High','Low','Close','Adj Close','Volume']
-        if len(cols) == 7:
-            df.columns = ["date", "open", "high", "low", "close", "adj", "volume"]
-    
-        # Kasus interval intraday (TIDAK ada Adj Close)
-        # ['Date','Open','High','Low','Close','Volume']
-        elif len(cols) == 6:
-            df.columns = ["date", "open", "high", "low", "close", "volume"]
-            df["adj"] = df["close"]  # tambahkan adj agar konsisten
-            df = df[["date","open","high","low","close","adj","volume"]]
-    
-        else:
-            raise ValueError(f"Tidak dikenali struktur kolom dari YFinance: {cols}")
-    
-        return df
+        df = df.rename(columns={df.columns[0]: "date", **rename})
+        if "adj" not in df.columns:
+            df["adj"] = df["close"]
+        out[sym] = df[["date", "open", "high", "low", "close", "adj", "volume"]]
+
+    return out
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# kapasitas default: 720 snapshot (~1 jam pada refresh 5 detik)
+HISTORY_CAPACITY = 720
+
+# depth dikelompokkan ke bin jarak dari mid (bps)
+DEPTH_BINS = 40
+BIN_BPS = 5.0
+
+# beberapa session bisa me-render symbol yang sama; snapshot yang lebih
+# rapat dari ini dilewati supaya history tidak terisi duplikat
+MIN_SPACING = 1.0
+
+_QMAX = np.iinfo(np.uint16).max
+
+# symbol yang history-nya disimpan; yang paling lama tidak dilihat dibuang
+MAX_SYMBOLS = 64
+
+
+class DepthHistory:
+    """
+    Ring buffer snapshot depth berukuran tetap.
+
+    Tiap snapshot disimpan sebagai:
+    - mid price (float64) & timestamp
+    - size per bin harga relatif terhadap mid, dikuantisasi ke uint16
+      dengan satu skala float32 per snapshot per sisi
+
+    Memori = capacity × bins × 2 sisi × 2 byte, tidak tumbuh seiring uptime.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY, bins=DEPTH_BINS, bin_bps=BIN_BPS):
+        self.capacity = capacity
+        self.bins = bins
+        self.bin_bps = bin_bps
+
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.mids = np.zeros(capacity, dtype=np.float64)
+        self.bid_q = np.zeros((capacity, bins), dtype=np.uint16)
+        self.ask_q = np.zeros((capacity, bins), dtype=np.uint16)
+        self.bid_scale = np.zeros(capacity, dtype=np.float32)
+        self.ask_scale = np.zeros(capacity, dtype=np.float32)
+
+        self.head = 0       # slot berikutnya yang akan ditulis
+        self.count = 0
+        self._lock = threading.Lock()
+
+    # -----------------------------
+    # Write
+    # -----------------------------
+    def _bin(self, prices, sizes, mid):
+        dist_bps = np.abs(prices - mid) / mid * 10_000
+        idx = (dist_bps // self.bin_bps).astype(np.int64)
+        ok = idx < self.bins
+        return np.bincount(idx[ok], weights=sizes[ok], minlength=self.bins)
+
+    @staticmethod
+    def _quantize(binned):
+        top = binned.max()
+        if top <= 0:
+            return np.zeros(len(binned), dtype=np.uint16), np.float32(0)
+        scale = np.float32(top / _QMAX)
+        return np.round(binned / scale).astype(np.uint16), scale
+
+    def record(self, book, ts=None):
+        """Simpan snapshot dari OrderBook (data.order_book), dibaca di bawah lock book."""
+        mid, bid_prices, bid_sizes, ask_prices, ask_sizes = book.levels()
+        if mid is None:
+            return False
+
+        bids = self._bin(bid_prices, bid_sizes, mid)
+        asks = self._bin(ask_prices, ask_sizes, mid)
+        return self.record_binned(mid, bids, asks, ts)
+
+    def record_binned(self, mid, bid_bins, ask_bins, ts=None):
+        bq, bs = self._quantize(np.asarray(bid_bins, dtype=np.float64))
+        aq, as_ = self._quantize(np.asarray(ask_bins, dtype=np.float64))
+
+        ts = time.time() if ts is None else ts
+
+        with self._lock:
+            if self.count and ts - self.times[(self.head - 1) % self.capacity] < MIN_SPACING:
+                return False
+
+            i = self.head
+            self.times[i] = ts
+            self.mids[i] = mid
+            self.bid_q[i], self.bid_scale[i] = bq, bs
+            self.ask_q[i], self.ask_scale[i] = aq, as_
+
+            self.head = (i + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+        return True
+
+    # -----------------------------
+    # Read (urut waktu, lama → baru)
+    # -----------------------------
+    def _order(self):
+        if self.count < self.capacity:
+            return np.arange(self.count)
+        return (np.arange(self.capacity) + self.head) % self.capacity
+
+    def snapshot_arrays(self):
+        """(times, mids, bid_depth, ask_depth) dalam float, urut waktu."""
+        with self._lock:
+            order = self._order()
+            bids = self.bid_q[order] * self.bid_scale[order, None]
+            asks = self.ask_q[order] * self.ask_scale[order, None]
+            return self.times[order], self.mids[order], bids, asks
+
+    # -----------------------------
+    # Analytics (vectorized over seluruh history)
+    # -----------------------------
+    def imbalance(self, near_bins=4):
+        """
+        Bid/ask imbalance per snapshot di `near_bins` bin terdekat mid:
+        (bid - ask) / (bid + ask), rentang -1 … 1.
+        """
+        _, _, bids, asks = self.snapshot_arrays()
+        b = bids[:, :near_bins].sum(axis=1)
+        a = asks[:, :near_bins].sum(axis=1)
+        total = b + a
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, (b - a) / total, 0.0)
+
+    def walls(self, factor=3.0, lookback=None):
+        """
+        Deteksi liquidity wall: bin yang size rata-ratanya (selama
+        `lookback` snapshot terakhir) > `factor` × median bin non-zero.
+        Return list dict: side, price_low, price_high, size, persistence.
+        """
+        _, mids, bids, asks = self.snapshot_arrays()
+        if len(mids) == 0:
+            return []
+
+        if lookback is not None:
+            mids, bids, asks = mids[-lookback:], bids[-lookback:], asks[-lookback:]
+
+        mid = mids[-1]
+        out = []
+        for side, depth, sign in (("bid", bids, -1), ("ask", asks, 1)):
+            avg = depth.mean(axis=0)
+            nz = avg[avg > 0]
+            if len(nz) == 0:
+                continue
+            threshold = factor * np.median(nz)
+
+            # persistence: porsi snapshot di mana bin itu tetap di atas threshold
+            persistence = (depth > threshold).mean(axis=0)
+
+            for b in np.flatnonzero(avg > threshold):
+                lo = mid * (1 + sign * b * self.bin_bps / 10_000)
+                hi = mid * (1 + sign * (b + 1) * self.bin_bps / 10_000)
+                out.append({
+                    "side": side,
+                    "price_low": float(min(lo, hi)),
+                    "price_high": float(max(lo, hi)),
+                    "size": float(avg[b]),
+                    "persistence": float(persistence[b]),
+                })
+
+        return sorted(out, key=lambda w: -w["size"])
+
+    def heatmap(self):
+        """
+        Matrix depth-over-time untuk heatmap: baris = bin (ask di atas,
+        bid di bawah, dalam bps dari mid), kolom = waktu.
+        """
+        times, _, bids, asks = self.snapshot_arrays()
+        z = np.hstack([bids[:, ::-1], asks]).T
+        edges = np.arange(self.bins) * self.bin_bps
+        y = np.concatenate([-(edges[::-1] + self.bin_bps / 2), edges + self.bin_bps / 2])
+        return times, y, z
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (
+            self.times, self.mids, self.bid_q, self.ask_q, self.bid_scale, self.ask_scale
+        ))
+
+
+_HISTORIES = OrderedDict()
+_HISTORIES_LOCK = threading.Lock()
+
+
+def get_depth_history(symbol):
+    """DepthHistory per symbol, LRU dibatasi MAX_SYMBOLS."""
+    with _HISTORIES_LOCK:
+        history = _HISTORIES.get(symbol)
+        if history is None:
+            history = _HISTORIES[symbol] = DepthHistory()
+            while len(_HISTORIES) > MAX_SYMBOLS:
+                _HISTORIES.popitem(last=False)
+        else:
+            _HISTORIES.move_to_end(symbol)
+        return history
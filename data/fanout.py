@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# pool bersama untuk fetch panel (I/O bound), ukurannya dibatasi
+MAX_WORKERS = 8
+
+# task yang boleh antri + jalan sekaligus; lebih dari ini langsung dianggap miss
+MAX_PENDING = 4 * MAX_WORKERS
+
+# deadline default per panel (detik)
+PANEL_DEADLINE = 4.0
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fanout")
+_SLOTS = threading.BoundedSemaphore(MAX_PENDING)
+
+
+def _submit(fn):
+    """Submit ke pool bersama, None bila antrian penuh (upstream lambat)."""
+    if not _SLOTS.acquire(blocking=False):
+        return None
+    fut = _EXECUTOR.submit(fn)
+    fut.add_done_callback(lambda _: _SLOTS.release())
+    return fut
+
+
+def fan_out(tasks, deadline=PANEL_DEADLINE):
+    """
+    Jalankan `tasks` ({nama: callable}) secara paralel dengan satu deadline.
+
+    Return (results, missed):
+    - results[nama] = hasil callable, atau None bila gagal / lewat deadline
+    - missed = set nama task yang lewat deadline, error, atau tidak kebagian
+      slot antrian
+
+    Saat deadline, task yang belum mulai dibatalkan; yang sedang jalan
+    selesai di background (hasilnya dibuang). Antrian dibatasi MAX_PENDING
+    supaya render yang menumpuk saat upstream lambat tidak menambah backlog.
+    """
+    futures = {name: _submit(fn) for name, fn in tasks.items()}
+    wait([f for f in futures.values() if f is not None], timeout=deadline)
+
+    results, missed = {}, set()
+    for name, fut in futures.items():
+        if fut is not None and fut.done() and not fut.cancelled() and fut.exception() is None:
+            results[name] = fut.result()
+        else:
+            if fut is not None:
+                fut.cancel()
+            results[name] = None
+            missed.add(name)
+
+    return results, missed
+
+
+# ======================================================
+# BACKLOG CHECK
+# ======================================================
+
+if __name__ == "__main__":
+    import time
+
+    # upstream macet: 20 render × 4 panel yang masing-masing butuh 1 detik
+    def slow():
+        time.sleep(1.0)
+        return "ok"
+
+    t = time.perf_counter()
+    for _ in range(20):
+        fan_out({f"p{i}": slow for i in range(4)}, deadline=0.05)
+    submitted = _EXECUTOR._work_queue.qsize()
+    print(f"20 render dalam {time.perf_counter() - t:.2f}s · antrian tersisa {submitted} (batas {MAX_PENDING})")
+    assert submitted <= MAX_PENDING
+
+    # setelah upstream pulih, panel kembali terisi
+    time.sleep(1.1)
+    results, missed = fan_out({"a": lambda: 1, "b": lambda: 2})
+    assert results == {"a": 1, "b": 2} and not missed, (results, missed)
+    print("fan_out pulih setelah backlog ✔")
@@ -0,0 +1,105 @@
+import threading
+from bisect import bisect_left
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) detik
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# batas atas bucket histogram latency (ms); bucket terakhir = overflow
+LATENCY_BUCKETS_MS = [25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _build_session():
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    # satu pool keep-alive per host (MEXC, alternative.me, CoinGecko, ...)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "cuanmology-dashboard/1.0"})
+    return session
+
+
+class LatencyHistogram:
+    """Histogram latency per host, thread-safe."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _entry(self, host):
+        h = self._hosts.get(host)
+        if h is None:
+            h = {"counts": [0] * (len(self.buckets) + 1), "n": 0, "sum": 0.0, "errors": 0}
+            self._hosts[host] = h
+        return h
+
+    def observe(self, host, ms):
+        with self._lock:
+            h = self._entry(host)
+
+            h["counts"][bisect_left(self.buckets, ms)] += 1
+            h["n"] += 1
+            h["sum"] += ms
+
+    def error(self, host):
+        with self._lock:
+            self._entry(host)["errors"] += 1
+
+    def snapshot(self):
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        with self._lock:
+            out = {}
+            for host, h in self._hosts.items():
+                out[host] = {
+                    "requests": h["n"],
+                    "errors": h["errors"],
+                    "avg_ms": round(h["sum"] / h["n"], 1) if h["n"] else None,
+                    "buckets": dict(zip(labels, h["counts"])),
+                }
+            return out
+
+
+_SESSION = _build_session()
+_LATENCY = LatencyHistogram()
+
+
+def get_session():
+    return _SESSION
+
+
+def http_get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    GET lewat session bersama (connection pool + keep-alive + retry).
+    Latency dicatat per host, termasuk retry.
+    """
+    host = urlsplit(url).netloc
+    t = time.perf_counter()
+    try:
+        resp = _SESSION.get(url, params=params, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        _LATENCY.error(host)
+        raise
+
+    _LATENCY.observe(host, (time.perf_counter() - t) * 1000)
+    return resp
+
+
+def latency_histograms():
+    return _LATENCY.snapshot()
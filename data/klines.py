@@ -0,0 +1,122 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# MEXC returns **8 columns only**
+KLINE_COLUMNS = [
+    "open_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_volume",
+]
+
+_TIME_COLS = {"open_time": 0, "close_time": 6}
+_VALUE_COLS = {"open": 1, "high": 2, "low": 3, "close": 4, "volume": 5, "quote_volume": 7}
+
+
+def _as_matrix(data):
+    """JSON array of arrays → 2D object matrix (n, >=8), validasi lebar baris."""
+    arr = np.array(data, dtype=object)
+
+    # baris dengan panjang berbeda → numpy membuat array 1D berisi list
+    if arr.ndim != 2:
+        widths = np.fromiter((len(r) for r in data), dtype=np.int64, count=len(data))
+        bad = np.flatnonzero(widths < len(KLINE_COLUMNS))
+        if len(bad):
+            raise ValueError(f"MEXC returned invalid row length: {data[bad[0]]}")
+        arr = np.array([r[:len(KLINE_COLUMNS)] for r in data], dtype=object)
+
+    if arr.shape[1] < len(KLINE_COLUMNS):
+        raise ValueError(f"MEXC returned invalid row length: {data[0]}")
+
+    return arr
+
+
+def parse_klines(data, price_dtype=np.float64):
+    """
+    Parse payload klines MEXC langsung ke kolom NumPy bertipe:
+    - open_time / close_time → int64 (ms)
+    - harga & volume → float64 (atau float32 via `price_dtype`)
+    """
+    if len(data) == 0:
+        cols = {c: np.empty(0, dtype=np.int64) for c in _TIME_COLS}
+        cols.update({c: np.empty(0, dtype=price_dtype) for c in _VALUE_COLS})
+        return {c: cols[c] for c in KLINE_COLUMNS}
+
+    arr = _as_matrix(data)
+
+    # satu konversi bulk untuk semua kolom angka (string → float)
+    values = arr[:, list(_VALUE_COLS.values())].astype(price_dtype)
+
+    cols = {
+        "open_time": arr[:, 0].astype(np.int64),
+        "close_time": arr[:, 6].astype(np.int64),
+    }
+    for j, col in enumerate(_VALUE_COLS):
+        cols[col] = np.ascontiguousarray(values[:, j])
+
+    return {c: cols[c] for c in KLINE_COLUMNS}
+
+
+def klines_to_frame(cols):
+    """Kolom hasil parse_klines → DataFrame dengan kontrak load_candles."""
+    data = {"date": cols["open_time"].astype("datetime64[ms]")}
+    data.update((c, cols[c]) for c in KLINE_COLUMNS[1:])
+    return pd.DataFrame(data, copy=False)
+
+
+# ======================================================
+# MICRO-BENCHMARK
+# ======================================================
+
+def _legacy_parse(data):
+    """Parser lama (loop per baris + astype per kolom), untuk pembanding."""
+    cleaned = []
+    for row in data:
+        if len(row) >= 8:
+            cleaned.append(row[:8])
+        else:
+            raise ValueError(f"MEXC returned invalid row length: {row}")
+
+    df = pd.DataFrame(cleaned, columns=KLINE_COLUMNS)
+    df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
+    df.rename(columns={"open_time": "date"}, inplace=True)
+    for col in ["open", "high", "low", "close", "volume"]:
+        df[col] = df[col].astype(float)
+    return df
+
+
+def _fake_payload(n):
+    t0 = 1_700_000_000_000
+    return [
+        [t0 + i * 60_000, f"{30000 + (i % 500) * 0.5:.2f}", "30010.50", "29990.10",
+         "30001.20", "12.3456", t0 + i * 60_000 + 59_999, "370000.12"]
+        for i in range(n)
+    ]
+
+
+def _bench(fn, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>8} {'legacy ms':>10} {'bulk ms':>10} {'f32 ms':>10} {'rows/s (bulk)':>15}")
+    for n in (200, 1_000, 100_000):
+        data = _fake_payload(n)
+        repeat = 5 if n > 10_000 else 50
+
+        legacy = _bench(_legacy_parse, data, repeat)
+        bulk = _bench(lambda d: klines_to_frame(parse_klines(d)), data, repeat)
+        f32 = _bench(lambda d: parse_klines(d, np.float32), data, repeat)
+
+        print(f"{n:>8} {legacy*1e3:>10.3f} {bulk*1e3:>10.3f} {f32*1e3:>10.3f} {n/bulk:>15,.0f}")
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pandas as pd
+
+from data.yf_planner import slice_period, yf_download
+
+# Seri makro harian yang dipakai banyak modul IDX premium
+MACRO_TICKERS = ["EIDO", "FXI", "USDIDR=X", "DX-Y.NYB", "^JKSE"]
+
+# superset dari semua period yang diminta consumer (7d, 10d, 30d, 3mo)
+MACRO_PERIOD = "3mo"
+
+MARKET_TZ = "Asia/Jakarta"
+
+# jeda sebelum mencoba ulang bila download gagal total
+RETRY_AFTER = 60
+
+
+class MacroService:
+    """
+    Ambil seri makro harian sekali per hari bursa (atau per `ttl` detik)
+    lewat satu multi-ticker download, lalu bagikan ke semua consumer.
+    """
+
+    def __init__(self, tickers=MACRO_TICKERS, period=MACRO_PERIOD, ttl=None):
+        self.tickers = list(tickers)
+        self.period = period
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._frames = {}
+        self._fetched_at = None
+        self._fetched_day = None
+        self._failed_at = None
+        self.downloads = 0
+
+    def _trading_day(self):
+        return pd.Timestamp.now(tz=MARKET_TZ).date()
+
+    def _stale(self):
+        if self._failed_at is not None and time.time() - self._failed_at < RETRY_AFTER:
+            return False
+        if self._fetched_at is None:
+            return True
+        if self.ttl is not None:
+            return time.time() - self._fetched_at > self.ttl
+        return self._fetched_day != self._trading_day()
+
+    def _refresh(self):
+        df = yf_download(self.tickers, period=self.period, interval="1d", group_by="ticker")
+        self.downloads += 1
+
+        frames = {}
+        for t in self.tickers:
+            if t not in df.columns.get_level_values(0):
+                continue
+            sub = df[t].dropna(how="all")
+            if not sub.empty:
+                frames[t] = sub
+
+        if not frames:
+            raise ValueError(f"Yahoo Finance kosong untuk {self.tickers}")
+
+        self._frames = frames
+        self._fetched_at = time.time()
+        self._fetched_day = self._trading_day()
+        self._failed_at = None
+
+    def get(self, ticker, period=None):
+        """
+        Frame OHLCV harian untuk `ticker`, dipotong ke `period` (mis. "7d").
+        Frame kosong bila seri tidak tersedia. Anggap read-only.
+        """
+        with self._lock:
+            if self._stale():
+                try:
+                    self._refresh()
+                except Exception as e:
+                    self._failed_at = time.time()
+                    print("Macro Service Error:", e)
+            df = self._frames.get(ticker)
+
+        if df is None:
+            return pd.DataFrame()
+        if period is None:
+            return df
+        return slice_period(df, period)
+
+
+_SERVICE = MacroService()
+
+
+def get_macro_service():
+    return _SERVICE
+
+
+def get_macro(ticker, period=None):
+    return _SERVICE.get(ticker, period)
@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+# kolom kanonik hasil load_candles & nama standar yang dipakai komponen AI
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+STD_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# alias kolom untuk frame non-kanonik (yfinance mentah, CSV, dsb)
+CANDIDATES = {
+    "Open": ["open", "o"],
+    "High": ["high", "h"],
+    "Low": ["low", "l"],
+    "Close": ["close", "c", "price", "last"],
+    "Volume": ["volume", "vol", "qty"],
+}
+
+
+def _frozen(values):
+    arr = np.array(values, dtype=np.float64, copy=True)
+    arr.flags.writeable = False
+    return arr
+
+
+def canonical_ohlcv(df, symbol=None, interval=None):
+    """
+    Frame OHLCV kanonik, dibuat sekali saat load:
+    - kolom date + open/high/low/close/volume bertipe float64
+    - baris dengan O/H/L/C NaN dibuang, volume NaN → 0
+    - array read-only, jadi aman di-share antar session & komponen tanpa copy
+    - df.attrs["ohlcv"] = True menandai fast path normalize_ohlcv
+    """
+    ok = df[["open", "high", "low", "close"]].notna().all(axis=1).to_numpy()
+    if not ok.all():
+        df = df[ok]
+
+    data = {"date": df["date"].to_numpy()}
+    for col in OHLCV_COLUMNS:
+        data[col] = _frozen(pd.to_numeric(df[col], errors="coerce"))
+    data["volume"] = _frozen(np.nan_to_num(data["volume"], nan=0.0))
+
+    # kolom tambahan (mis. close_time, quote_volume) ikut dibawa apa adanya
+    for col in df.columns:
+        if col not in data:
+            data[col] = df[col].to_numpy()
+
+    out = pd.DataFrame(data, copy=False)
+    out.attrs.update(df.attrs)
+    out.attrs["ohlcv"] = True
+    if symbol is not None:
+        out.attrs["symbol"] = symbol.upper()
+    if interval is not None:
+        out.attrs["interval"] = interval
+    return out
+
+
+def is_canonical(df):
+    return df.attrs.get("ohlcv") is True
+
+
+def ohlcv_view(df):
+    """
+    View bernama standar (date, Open, High, Low, Close, Volume) di atas
+    frame kanonik, tanpa menyalin data. Ditandai attrs["ohlcv"] = "std"
+    supaya normalisasi berikutnya langsung lolos.
+    """
+    data = {}
+    if "date" in df.columns:
+        data["date"] = df["date"]
+    for std, col in zip(STD_COLUMNS, OHLCV_COLUMNS):
+        data[std] = df[col]
+    out = pd.DataFrame(data, index=df.index, copy=False)
+    out.attrs.update(df.attrs)
+    out.attrs["ohlcv"] = "std"
+    return out
+
+
+def normalize_ohlcv(df, required=STD_COLUMNS, numeric=STD_COLUMNS, dropna=("Open", "Close")):
+    """
+    Normalizer bersama untuk semua komponen: kolom apa pun → Open/High/Low/Close/Volume.
+
+    Frame kanonik (dari load_candles) langsung dikembalikan sebagai view
+    tanpa copy / to_numeric / dropna, karena sudah bertipe dan bersih.
+    Frame lain lewat jalur lama:
+    - `required`: kolom standar yang wajib ada (KeyError bila hilang)
+    - `numeric` : kolom yang dikonversi pd.to_numeric
+    - `dropna`  : subset untuk dropna, "all" = semua kolom, None = tidak ada
+    """
+    if df.attrs.get("ohlcv") == "std":
+        return df
+    if is_canonical(df):
+        return ohlcv_view(df)
+
+    df = df.copy()
+    lower = {c.lower(): c for c in df.columns}
+
+    col_map = {}
+    for std, poss in CANDIDATES.items():
+        for p in poss:
+            if p in lower:
+                col_map[std] = lower[p]
+                break
+
+    missing = [c for c in required if c not in col_map]
+    if missing:
+        raise KeyError(f"Missing OHLCV: {missing}. Available: {list(df.columns)}")
+
+    df = df.rename(columns={orig: std for std, orig in col_map.items()})
+
+    for col in numeric:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    if dropna == "all":
+        return df.dropna()
+    if dropna:
+        return df.dropna(subset=[c for c in dropna if c in df.columns])
+    return df
+
+
+def expand_history(out, positions, index, neutral):
+    """
+    Output *_history per baris bersih → sepanjang frame mentah (`index`).
+    `positions` = posisi baris bersih di frame mentah. Baris yang di-dropna
+    memakai nilai baris bersih sebelumnya (sama dengan hasil engine pada
+    df.iloc[:i + 1]); sebelum baris bersih pertama dipakai `neutral`.
+    """
+    if len(out) == len(index):
+        return out.set_axis(index)
+
+    take = np.searchsorted(positions, np.arange(len(index)), side="right")
+    cols = {}
+    for col in out.columns:
+        values = np.concatenate([[neutral[col]], out[col].to_numpy()])
+        cols[col] = pd.Series(values[take], index=index, dtype=out[col].dtype)
+    return pd.DataFrame(cols, index=index)
+
+
+# ======================================================
+# ALLOCATION BENCHMARK
+# ======================================================
+
+def _legacy_normalize(df, keep_original=False):
+    """Pola normalizer lama (copy + rename + to_numeric), untuk pembanding."""
+    df = df.copy()
+    lower = {c.lower(): c for c in df.columns}
+    col_map = {}
+    for std, poss in CANDIDATES.items():
+        for p in poss:
+            if p in lower:
+                col_map[std] = lower[p]
+                break
+    if keep_original:
+        for std, raw in col_map.items():
+            df[std] = df[raw]
+        return df
+    df = df.rename(columns={orig: std for std, orig in col_map.items()})
+    for c in STD_COLUMNS:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df.dropna(subset=["Open", "Close"])
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    rng = np.random.default_rng(0)
+    n = 1000
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    raw = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": rng.random(n) * 10,
+        "close_time": np.arange(n, dtype=np.int64),
+        "quote_volume": rng.random(n),
+    })
+
+    # satu refresh lama: load_candles copy + 5 normalizer (final engine
+    # menormalisasi lalu detect_reversal & smart money menormalisasi lagi)
+    def legacy_refresh():
+        df = raw.copy()
+        a = _legacy_normalize(df)                       # AIPredictor.predict
+        b = _legacy_normalize(df)                       # AIPredictor.detect_reversal
+        c = _legacy_normalize(df)                       # premium_reversal
+        d = _legacy_normalize(df)                       # level2 detect_zones
+        e = _legacy_normalize(df, keep_original=True)   # final engine
+        f = _legacy_normalize(e)                        # ai_reversal (dalam final engine)
+        return a, b, c, d, e, f
+
+    shared = canonical_ohlcv(raw, "BTCUSDT", "1m")
+
+    def canonical_refresh():
+        df = shared.copy(deep=False)
+        return tuple(normalize_ohlcv(x) for x in (df, df, df, df, df, normalize_ohlcv(df)))
+
+    for name, fn in (("legacy", legacy_refresh), ("canonical", canonical_refresh)):
+        fn()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        for _ in range(50):
+            fn()
+        dt = (time.perf_counter() - t0) / 50
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        keep = fn()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del keep
+        print(f"{name:10s} {dt * 1e3:6.2f} ms/refresh · retained {current / 1024:8.1f} KiB · peak {peak / 1024:8.1f} KiB")
@@ -0,0 +1,334 @@
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _levels(raw):
+    """[[price, qty], ...] (string/float) → array float64 (n, 2)."""
+    arr = np.asarray(raw, dtype=np.float64)
+    if arr.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return arr.reshape(-1, 2)
+
+
+class BookSide:
+    """
+    Satu sisi order book dalam array float terurut.
+
+    Disimpan berdasarkan `key` yang selalu ascending (price untuk ask,
+    -price untuk bid) sehingga index 0 = level terbaik dan lookup level
+    cukup np.searchsorted.
+    """
+
+    def __init__(self, is_bid, capacity=1024):
+        self.is_bid = is_bid
+        self._keys = np.empty(capacity, dtype=np.float64)
+        self._sizes = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def prices(self):
+        keys = self._keys[:self.n]
+        return -keys if self.is_bid else keys.copy()
+
+    @property
+    def sizes(self):
+        return self._sizes[:self.n]
+
+    def _to_keys(self, prices):
+        return -prices if self.is_bid else prices
+
+    def _find(self, keys):
+        """Posisi (searchsorted) & mask apakah key sudah ada di book."""
+        cur = self._keys[:self.n]
+        pos = np.searchsorted(cur, keys)
+        if self.n == 0:
+            return pos, np.zeros(len(keys), dtype=bool)
+        return pos, (pos < self.n) & (cur[np.minimum(pos, self.n - 1)] == keys)
+
+    def apply(self, prices, sizes):
+        """
+        Terapkan update depth: size 0 → hapus level, selain itu set/insert.
+        Return jumlah level yang berubah.
+
+        Biaya untuk k level di update dan n level di book:
+        - lookup: searchsorted O(k log n)
+        - modify saja: in place, tanpa copy
+        - ada delete/insert: satu pass merge ke buffer baru, yaitu O(k)
+          slice + satu salinan O(n) per update (memmove, bukan per level).
+          Array terurut tidak bisa menggeser level lebih murah dari itu.
+        """
+        if len(prices) == 0:
+            return 0
+
+        keys = self._to_keys(np.asarray(prices, dtype=np.float64))
+        sizes = np.asarray(sizes, dtype=np.float64)
+
+        # update terakhir untuk price yang sama yang berlaku
+        keys, first = np.unique(keys[::-1], return_index=True)
+        sizes = sizes[::-1][first]
+
+        pos, exists = self._find(keys)
+
+        # 1) modify level yang sudah ada (in place)
+        mod = exists & (sizes > 0)
+        self._sizes[pos[mod]] = sizes[mod]
+
+        dele = exists & (sizes <= 0)
+        ins = ~exists & (sizes > 0)
+        n_del, n_ins = int(dele.sum()), int(ins.sum())
+        if n_del or n_ins:
+            self._merge(pos[dele], pos[ins], keys[ins], sizes[ins])
+
+        return int(mod.sum()) + n_del + n_ins
+
+    def _merge(self, del_pos, ins_pos, ins_keys, ins_sizes):
+        """
+        Hapus level di `del_pos` dan sisipkan level baru sebelum `ins_pos`
+        (posisi searchsorted di book lama) dalam satu pass.
+        """
+        n_new = self.n - len(del_pos) + len(ins_pos)
+        cap = max(len(self._keys), n_new)
+        out_keys = np.empty(cap, dtype=np.float64)
+        out_sizes = np.empty(cap, dtype=np.float64)
+
+        # event urut posisi; di posisi yang sama insert (key lebih kecil) dulu
+        ev_pos = np.concatenate([ins_pos, del_pos])
+        ev_ins = np.concatenate([np.arange(len(ins_pos)), np.full(len(del_pos), -1)])
+        order = np.lexsort((ev_ins < 0, ev_pos))
+
+        src = dst = 0
+        for p, j in zip(ev_pos[order].tolist(), ev_ins[order].tolist()):
+            run = p - src
+            out_keys[dst:dst + run] = self._keys[src:p]
+            out_sizes[dst:dst + run] = self._sizes[src:p]
+            dst += run
+            if j >= 0:
+                out_keys[dst] = ins_keys[j]
+                out_sizes[dst] = ins_sizes[j]
+                dst += 1
+                src = p
+            else:
+                src = p + 1
+
+        run = self.n - src
+        out_keys[dst:dst + run] = self._keys[src:self.n]
+        out_sizes[dst:dst + run] = self._sizes[src:self.n]
+
+        self._keys, self._sizes, self.n = out_keys, out_sizes, n_new
+
+    def replace(self, prices, sizes):
+        """
+        Samakan isi sisi ini dengan snapshot penuh, di-diff in place:
+        level yang hilang dihapus, yang berubah/baru di-update.
+        Snapshot memuat seluruh depth, jadi diff-nya O(n log m) lewat
+        searchsorted terhadap key snapshot yang diurutkan.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+
+        pos, exists = self._find(self._to_keys(prices))
+        same = exists & (self._sizes[np.minimum(pos, max(self.n - 1, 0))] == sizes)
+
+        # level yang tidak ada di snapshot → hapus; yang tidak berubah dilewati
+        snap = np.sort(self._to_keys(prices))
+        cur = self._keys[:self.n]
+        if len(snap):
+            at = np.minimum(np.searchsorted(snap, cur), len(snap) - 1)
+            gone = snap[at] != cur
+        else:
+            gone = np.ones(self.n, dtype=bool)
+
+        cur_prices = self.prices
+        upd_prices = np.concatenate([cur_prices[gone], prices[~same]])
+        upd_sizes = np.concatenate([np.zeros(int(gone.sum())), sizes[~same]])
+        return self.apply(upd_prices, upd_sizes)
+
+    def best(self):
+        if self.n == 0:
+            return None, None
+        price = -self._keys[0] if self.is_bid else self._keys[0]
+        return float(price), float(self._sizes[0])
+
+    def cumulative(self, depth=None):
+        """Cumulative size dari level terbaik sampai `depth` level."""
+        n = self.n if depth is None else min(depth, self.n)
+        return np.cumsum(self._sizes[:n])
+
+
+class OrderBook:
+    """Order book satu symbol: bids & asks dalam array terurut."""
+
+    def __init__(self, symbol, capacity=1024):
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True, capacity=capacity)
+        self.asks = BookSide(is_bid=False, capacity=capacity)
+        self.updates = 0
+        self.last_changed = 0
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, bids, asks):
+        """Snapshot penuh (mis. REST /depth), di-diff terhadap book saat ini."""
+        b, a = _levels(bids), _levels(asks)
+        with self._lock:
+            changed = self.bids.replace(b[:, 0], b[:, 1])
+            changed += self.asks.replace(a[:, 0], a[:, 1])
+            self.updates += 1
+            self.last_changed = changed
+        return changed
+
+    def apply_update(self, bids=(), asks=()):
+        """Depth update incremental; qty 0 berarti level dihapus."""
+        b, a = _levels(bids), _levels(asks)
+        with self._lock:
+            changed = self.bids.apply(b[:, 0], b[:, 1])
+            changed += self.asks.apply(a[:, 0], a[:, 1])
+            self.updates += 1
+            self.last_changed = changed
+        return changed
+
+    def _mid(self):
+        bid, _ = self.bids.best()
+        ask, _ = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (ask + bid) / 2
+
+    # baca di bawah lock yang sama dengan apply_*: array side bisa
+    # di-realokasi / digeser oleh snapshot dari session lain
+    def top_of_book(self):
+        with self._lock:
+            bid, bid_qty = self.bids.best()
+            ask, ask_qty = self.asks.best()
+        return {"bid": bid, "bid_qty": bid_qty, "ask": ask, "ask_qty": ask_qty}
+
+    def spread(self):
+        with self._lock:
+            bid, _ = self.bids.best()
+            ask, _ = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def mid(self):
+        with self._lock:
+            return self._mid()
+
+    def levels(self):
+        """Salinan konsisten (mid, bid_prices, bid_sizes, ask_prices, ask_sizes)."""
+        with self._lock:
+            return (
+                self._mid(),
+                self.bids.prices, self.bids.sizes.copy(),
+                self.asks.prices, self.asks.sizes.copy(),
+            )
+
+    def depth(self, levels=20):
+        """(prices, sizes, cumulative) untuk `levels` teratas tiap sisi."""
+        with self._lock:
+            out = {}
+            for name, side in (("bids", self.bids), ("asks", self.asks)):
+                n = min(levels, len(side))
+                out[name] = (side.prices[:n], side.sizes[:n].copy(), side.cumulative(n))
+            return out
+
+
+def replay_depth_file(path):
+    """
+    Replay feed lokal (JSON lines). Tiap baris:
+    {"type": "snapshot"|"update", "bids": [[p, q], ...], "asks": [[p, q], ...]}
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def apply_message(book, msg):
+    if msg.get("type", "update") == "snapshot":
+        return book.apply_snapshot(msg.get("bids", []), msg.get("asks", []))
+    return book.apply_update(msg.get("bids", []), msg.get("asks", []))
+
+
+# symbol yang book-nya disimpan; yang paling lama tidak dilihat dibuang
+MAX_BOOKS = 64
+
+_BOOKS = OrderedDict()
+_BOOKS_LOCK = threading.Lock()
+
+
+def get_order_book(symbol):
+    """OrderBook per symbol, LRU dibatasi MAX_BOOKS."""
+    with _BOOKS_LOCK:
+        book = _BOOKS.get(symbol)
+        if book is None:
+            book = _BOOKS[symbol] = OrderBook(symbol)
+            while len(_BOOKS) > MAX_BOOKS:
+                _BOOKS.popitem(last=False)
+        else:
+            _BOOKS.move_to_end(symbol)
+        return book
+
+
+# ======================================================
+# CHECK + BENCHMARK
+# ======================================================
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    book = OrderBook("BTCUSDT", capacity=64)
+    ref = {"bids": {}, "asks": {}}
+
+    def random_levels(side, k):
+        base = 60_000 - 1 if side == "bids" else 60_000 + 1
+        sign = -1 if side == "bids" else 1
+        prices = base + sign * rng.integers(0, 5_000, k) * 0.5
+        sizes = np.where(rng.random(k) < 0.3, 0.0, rng.random(k))
+        return np.stack([prices, sizes], axis=1)
+
+    for step in range(3_000):
+        if step % 500 == 0:
+            msg = {side: random_levels(side, 2_000) for side in ref}
+            msg = {side: lv[lv[:, 1] > 0] for side, lv in msg.items()}
+            book.apply_snapshot(msg["bids"], msg["asks"])
+            for side in ref:
+                ref[side] = {}
+                for p, q in msg[side]:
+                    ref[side][p] = q
+        else:
+            msg = {side: random_levels(side, 20) for side in ref}
+            book.apply_update(msg["bids"], msg["asks"])
+            for side in ref:
+                for p, q in msg[side]:
+                    if q > 0:
+                        ref[side][p] = q
+                    else:
+                        ref[side].pop(p, None)
+
+    for side, book_side in (("bids", book.bids), ("asks", book.asks)):
+        want = sorted(ref[side].items(), reverse=(side == "bids"))
+        assert np.array_equal(book_side.prices, [p for p, _ in want]), side
+        assert np.array_equal(book_side.sizes, [q for _, q in want]), side
+    print(f"3,000 update/snapshot == referensi dict ✔ ({len(book.bids)}/{len(book.asks)} level)")
+
+    # biaya per update: book 5,000 level, update 20 level (mod/insert/delete campur)
+    for depth in (5_000, 50_000):
+        book = OrderBook("BENCH")
+        lv = np.stack([60_000 - np.arange(depth) * 0.5, rng.random(depth) + 0.1], axis=1)
+        book.apply_snapshot(lv, lv * [[-1, 1]] + [[120_001, 0]])
+        steps = 2_000
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            upd = lv[rng.integers(0, depth, 20)].copy()
+            upd[:5, 0] += 0.25                    # level baru
+            upd[5:10, 1] = 0.0                    # hapus
+            book.apply_update(upd)
+        print(f"{depth:>6} level: {(time.perf_counter() - t0) / steps * 1e6:6.1f} us/update (20 level)")
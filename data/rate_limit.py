@@ -0,0 +1,41 @@
+import threading
+import time
+
+# MEXC: 500 request / 10 detik per endpoint per IP → 50/s, sisakan
+# sedikit untuk orderbook & trades yang tidak lewat limiter ini
+MEXC_RATE = 45
+MEXC_BURST = 45
+
+
+class RateLimiter:
+    """Token bucket thread-safe: `rate` token/detik, kapasitas `burst`."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+_MEXC_LIMITER = RateLimiter(MEXC_RATE, MEXC_BURST)
+
+
+def get_mexc_limiter():
+    """Limiter bersama untuk setiap request kline / ticker MEXC yang benar-benar keluar."""
+    return _MEXC_LIMITER
@@ -0,0 +1,228 @@
+import threading
+
+import numpy as np
+
+from data.candle_store import MAX_BARS as STORE_MAX_BARS
+from data.klines import KLINE_COLUMNS, klines_to_frame
+from data.trade_tape import INTERVAL_MS
+
+# Satu seri 1m per simbol; interval lebih besar diturunkan lokal dari situ.
+BASE_INTERVAL = "1m"
+BASE_MS = INTERVAL_MS[BASE_INTERVAL]
+
+RESAMPLE_MS = {k: v for k, v in INTERVAL_MS.items() if v > BASE_MS}
+
+# batas bar base yang dijaga di store (= batas trim candle store); interval
+# yang butuh lebih dari ini (mis. 200 bar 1d) tetap diambil native dari exchange
+BASE_MAX_BARS = STORE_MAX_BARS
+
+# bar higher-timeframe selesai yang disimpan per resampler
+MAX_BARS = 10_000
+
+
+def base_bars_for(interval, limit):
+    """Jumlah bar 1m yang dibutuhkan untuk `limit` bar `interval` (+1 bucket parsial)."""
+    ratio = RESAMPLE_MS[interval] // BASE_MS
+    return (limit + 1) * ratio
+
+
+def can_derive(interval, limit):
+    return interval in RESAMPLE_MS and base_bars_for(interval, limit) <= BASE_MAX_BARS
+
+
+def _empty():
+    return {c: np.empty(0, dtype=np.int64 if c.endswith("_time") else np.float64) for c in KLINE_COLUMNS}
+
+
+def resample_arrays(cols, interval_ms):
+    """
+    Kolom kline base → kolom kline `interval_ms` (bucket = open_time dibulatkan
+    ke bawah, UTC). open = pertama, close = terakhir, high/low = max/min,
+    volume & quote_volume = jumlah. Satu pass reduceat, tanpa groupby.
+    """
+    t = np.asarray(cols["open_time"], dtype=np.int64)
+    if len(t) == 0:
+        return _empty()
+
+    bucket = t - t % interval_ms
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    ends = np.append(starts[1:], len(t)) - 1
+
+    return {
+        "open_time": bucket[starts],
+        "open": np.asarray(cols["open"], dtype=np.float64)[starts],
+        "high": np.maximum.reduceat(np.asarray(cols["high"], dtype=np.float64), starts),
+        "low": np.minimum.reduceat(np.asarray(cols["low"], dtype=np.float64), starts),
+        "close": np.asarray(cols["close"], dtype=np.float64)[ends],
+        "volume": np.add.reduceat(np.asarray(cols["volume"], dtype=np.float64), starts),
+        "close_time": bucket[starts] + interval_ms - 1,
+        "quote_volume": np.add.reduceat(np.asarray(cols["quote_volume"], dtype=np.float64), starts),
+    }
+
+
+class Resampler:
+    """
+    Resampling incremental 1m → satu interval.
+
+    Bar yang sudah selesai disimpan; tiap update hanya membaca bar base
+    sejak open_time bucket yang masih terbentuk lalu membangun ulang
+    bucket itu (plus bucket baru bila jam sudah lewat).
+    """
+
+    def __init__(self, interval, max_bars=MAX_BARS):
+        self.interval = interval
+        self.interval_ms = RESAMPLE_MS[interval]
+        self.max_bars = max_bars
+        self.base_first = None
+        self._done = _empty()
+        self._forming = _empty()
+        self._lock = threading.Lock()
+
+    def next_time(self):
+        """open_time base pertama yang perlu dibaca (None = rebuild penuh)."""
+        if len(self._forming["open_time"]):
+            return int(self._forming["open_time"][0])
+        if len(self._done["open_time"]):
+            return int(self._done["open_time"][-1]) + self.interval_ms
+        return None
+
+    def reset(self):
+        self.base_first = None
+        self._done = _empty()
+        self._forming = _empty()
+
+    def update(self, cols, full=False):
+        """
+        `cols`: bar base dengan open_time >= next_time() (atau seluruh seri
+        bila full=True). Bucket pertama yang tidak lengkap di awal seri dibuang.
+        """
+        with self._lock:
+            if full:
+                self.reset()
+                if len(cols["open_time"]):
+                    self.base_first = int(cols["open_time"][0])
+
+            new = resample_arrays(cols, self.interval_ms)
+            if full and len(new["open_time"]) and new["open_time"][0] < self.base_first:
+                new = {c: v[1:] for c, v in new.items()}
+            if len(new["open_time"]) == 0:
+                return
+
+            # bucket terakhir masih terbentuk, sisanya final
+            self._done = {
+                c: np.concatenate([self._done[c], new[c][:-1]])[-self.max_bars:]
+                for c in KLINE_COLUMNS
+            }
+            self._forming = {c: new[c][-1:] for c in KLINE_COLUMNS}
+
+    def arrays(self, limit=None):
+        with self._lock:
+            out = {c: np.concatenate([self._done[c], self._forming[c]]) for c in KLINE_COLUMNS}
+        if limit is not None:
+            out = {c: v[-limit:] for c, v in out.items()}
+        return out
+
+    def frame(self, limit=None):
+        """Frame dengan kontrak yang sama seperti CandleStore.read."""
+        return klines_to_frame(self.arrays(limit))
+
+    def sync(self, store, symbol, limit=None):
+        """Update dari candle store base lalu kembalikan frame `limit` bar terakhir."""
+        with store.lock(symbol, BASE_INTERVAL):
+            first = store.first_open_time(symbol, BASE_INTERVAL)
+            since = self.next_time()
+
+            # store di-backfill ke belakang → histori lama berubah, rebuild
+            if since is None or first is None or self.base_first is None or first < self.base_first:
+                self.update(store.read_arrays(symbol, BASE_INTERVAL), full=True)
+            else:
+                self.update(store.read_since(symbol, BASE_INTERVAL, since))
+
+        return self.frame(limit)
+
+
+# ======================================================
+# REGISTRY
+# ======================================================
+
+_RESAMPLERS = {}
+_RESAMPLERS_LOCK = threading.Lock()
+
+
+def get_resampler(symbol, interval):
+    key = (symbol.upper(), interval)
+    with _RESAMPLERS_LOCK:
+        if key not in _RESAMPLERS:
+            _RESAMPLERS[key] = Resampler(interval)
+        return _RESAMPLERS[key]
+
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from data.candle_store import CandleStore
+
+    rng = np.random.default_rng(0)
+    n = BASE_MAX_BARS
+    t0 = 1_700_000_000_000 - 1_700_000_000_000 % 86_400_000 + 37 * BASE_MS   # mulai di tengah bucket
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, n + 300)))
+
+    def base(lo, hi):
+        o = np.concatenate(([close[0]], close[:-1]))[lo:hi]
+        c = close[lo:hi]
+        times = t0 + np.arange(lo, hi, dtype=np.int64) * BASE_MS
+        return {
+            "open_time": times,
+            "open": o,
+            "high": np.maximum(o, c) + 1,
+            "low": np.minimum(o, c) - 1,
+            "close": c,
+            "volume": rng.random(hi - lo),
+            "close_time": times + BASE_MS - 1,
+            "quote_volume": rng.random(hi - lo),
+        }
+
+    def pandas_resample(cols, interval):
+        df = klines_to_frame(cols).set_index("date")
+        rule = {"m": "min", "h": "h", "d": "D"}[interval[-1]]
+        out = df.resample(interval[:-1] + rule).agg({
+            "open": "first", "high": "max", "low": "min", "close": "last",
+            "volume": "sum", "quote_volume": "sum",
+        }).dropna(subset=["open"])
+        return out.iloc[1:]   # bucket pertama parsial
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CandleStore(root)
+        store.write("BTCUSDT", BASE_INTERVAL, base(0, n))
+
+        for interval in ("5m", "15m", "1h", "4h", "1d"):
+            r = Resampler(interval)
+            t = time.perf_counter()
+            r.sync(store, "BTCUSDT")
+            full_ms = (time.perf_counter() - t) * 1e3
+
+            # live: bar 1m baru masuk satu per satu (bar terakhir ditimpa)
+            steps = 300
+            inc_ms = 0.0
+            for i in range(n, n + steps):
+                store.append("BTCUSDT", BASE_INTERVAL, base(i, i + 1))
+                t = time.perf_counter()
+                r.sync(store, "BTCUSDT")
+                inc_ms += (time.perf_counter() - t) * 1e3 / steps
+
+            got = r.frame().set_index("date")
+            ref = pandas_resample(store.read_arrays("BTCUSDT", BASE_INTERVAL), interval)
+            cols = ["open", "high", "low", "close", "volume", "quote_volume"]
+            assert len(got) == len(ref), (interval, len(got), len(ref))
+            assert np.allclose(got[cols].to_numpy(), ref[cols].to_numpy()), interval
+            assert (got.index == ref.index).all()
+
+            print(f"{interval:>4} {len(got):>6} bar · full {full_ms:7.2f} ms · incremental {inc_ms:6.3f} ms/update (== pandas resample ✔)")
+
+            # kembalikan store ke n bar untuk interval berikutnya
+            store.write("BTCUSDT", BASE_INTERVAL, base(0, n))
@@ -0,0 +1,164 @@
+import threading
+import time
+
+
+# jeda sebelum fetch dicoba lagi setelah gagal (detik)
+ERROR_BACKOFF = 30
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate untuk satu nilai upstream.
+
+    - Belum ada nilai → fetch sinkron (sekali, saat render pertama), atau
+      dengan block=False fetch di background dan (None, None) langsung.
+      Miss bersamaan digabung: hanya satu fetch, pemanggil lain menunggu
+      fetch yang sama.
+    - Nilai masih segar → langsung dikembalikan.
+    - Nilai basi → tetap dikembalikan saat itu juga, refresh jalan di
+      background thread. Bila upstream lambat/down, nilai lama tetap
+      disajikan beserta umurnya.
+    - Fetch gagal → tidak dicoba lagi selama `error_backoff` detik
+      (negative cache), jadi upstream yang down tidak dipukul tiap render.
+
+    `fetch()` harus raise bila gagal (jangan return None).
+    """
+
+    def __init__(self, fetch, max_age, clock=time.time, error_backoff=ERROR_BACKOFF):
+        self._fetch = fetch
+        self.max_age = max_age
+        self.error_backoff = error_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value = None
+        self._fetched_at = None
+        self._failed_at = None
+        self._refreshing = False
+        self._done = None          # Event fetch yang sedang berjalan
+        self.last_error = None
+
+    def _start(self):
+        """
+        Klaim fetch berikutnya. Return (owner, event): owner=True → pemanggil
+        yang menjalankan fetch; event=None → masih dalam backoff error.
+        """
+        with self._lock:
+            if self._refreshing:
+                return False, self._done
+            if self._failed_at is not None and self._clock() - self._failed_at < self.error_backoff:
+                return False, None
+            self._refreshing = True
+            self._done = threading.Event()
+            return True, self._done
+
+    def _run_fetch(self):
+        done = self._done
+        try:
+            value = self._fetch()
+        except Exception as e:
+            with self._lock:
+                self.last_error = e
+                self._failed_at = self._clock()
+                self._refreshing = False
+            done.set()
+            return False
+
+        with self._lock:
+            self._value = value
+            self._fetched_at = self._clock()
+            self._failed_at = None
+            self.last_error = None
+            self._refreshing = False
+        done.set()
+        return True
+
+    def _revalidate_async(self):
+        owner, _ = self._start()
+        if owner:
+            threading.Thread(target=self._run_fetch, daemon=True).start()
+
+    def get(self, block=True):
+        """Return (value, age_detik). (None, None) bila belum pernah berhasil."""
+        with self._lock:
+            has_value = self._fetched_at is not None
+
+        if not has_value and not block:
+            self._revalidate_async()
+        elif not has_value:
+            owner, done = self._start()
+            if owner:
+                self._run_fetch()
+            elif done is not None:
+                done.wait()
+        elif self.age() > self.max_age:
+            self._revalidate_async()
+
+        with self._lock:
+            if self._fetched_at is None:
+                return None, None
+            return self._value, self._clock() - self._fetched_at
+
+    def age(self):
+        with self._lock:
+            if self._fetched_at is None:
+                return None
+            return self._clock() - self._fetched_at
+
+    def is_refreshing(self):
+        with self._lock:
+            return self._refreshing
+
+    def is_stale(self):
+        age = self.age()
+        return age is None or age > self.max_age
+
+
+def format_age(seconds):
+    """Umur data dalam format singkat: 45s / 12m / 3h / 2d."""
+    if seconds is None:
+        return "N/A"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    if seconds < 86400:
+        return f"{seconds // 3600}h"
+    return f"{seconds // 86400}d"
+
+
+# ======================================================
+# COALESCING CHECK
+# ======================================================
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return len(calls)
+
+    cache = SWRCache(slow, max_age=60)
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda _: cache.get()[0], range(16)))
+    assert len(calls) == 1 and results == [1] * 16, (calls, results)
+    print("16 cold miss bersamaan → 1 fetch ✔")
+
+    now = [0.0]
+    failures = []
+
+    def down():
+        failures.append(1)
+        raise ValueError("upstream down")
+
+    cache = SWRCache(down, max_age=60, clock=lambda: now[0], error_backoff=30)
+    for _ in range(10):
+        assert cache.get() == (None, None)
+    assert len(failures) == 1
+    now[0] += 31
+    cache.get()
+    assert len(failures) == 2
+    print("fetch gagal → backoff 30s, 10 render = 1 request ✔")
@@ -0,0 +1,486 @@
+import json
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from data.http_client import http_get
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "60m": 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+# jumlah bar order flow yang disimpan per (symbol, interval)
+MAX_BARS = 500
+
+# lebar bin footprint ~5 bps dari harga, dibulatkan ke pangkat 10
+FOOTPRINT_BPS = 5
+
+# /api/v3/trades: maksimum trade per request
+TRADES_LIMIT = 1000
+
+# jeda minimum antar poll per simbol (detik), dibagi semua session & interval
+POLL_INTERVAL = 1.0
+
+
+def auto_tick(price):
+    """Ukuran bin harga footprint untuk level harga `price`."""
+    if price <= 0:
+        return 1.0
+    return float(10 ** np.floor(np.log10(price * FOOTPRINT_BPS / 10_000)))
+
+
+# ======================================================
+# SOURCES
+# ======================================================
+
+def _trade_id(t):
+    tid = t.get("id")
+    try:
+        return int(tid)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _trades_to_arrays(trades):
+    """
+    List trade MEXC (dict) → (time, price, qty, is_buyer_maker, id).
+    id = -1 bila exchange tidak mengirim trade id (MEXC spot kadang null).
+    """
+    n = len(trades)
+    times = np.fromiter((t["time"] for t in trades), dtype=np.int64, count=n)
+    prices = np.array([t["price"] for t in trades], dtype=object).astype(np.float64)
+    qtys = np.array([t["qty"] for t in trades], dtype=object).astype(np.float64)
+    maker = np.fromiter((bool(t["isBuyerMaker"]) for t in trades), dtype=bool, count=n)
+    ids = np.fromiter((_trade_id(t) for t in trades), dtype=np.int64, count=n)
+    return times, prices, qtys, maker, ids
+
+
+def fetch_recent_trades(symbol, limit=1000):
+    """Recent trades MEXC (/api/v3/trades), diurutkan berdasarkan waktu."""
+    url = f"https://api.mexc.com/api/v3/trades?symbol={symbol}&limit={limit}"
+    resp = http_get(url, timeout=5)
+
+    if resp.status_code != 200:
+        raise ValueError(f"MEXC HTTP {resp.status_code}: {resp.text[:200]}")
+
+    data = resp.json()
+    if not isinstance(data, list):
+        raise ValueError(f"MEXC API error: {data}")
+
+    times, prices, qtys, maker, ids = _trades_to_arrays(data)
+    order = np.lexsort((ids, times))
+    return times[order], prices[order], qtys[order], maker[order], ids[order]
+
+
+def replay_trades_file(path, batch=10_000):
+    """
+    Replay trade dari file lokal (JSON lines, format sama dengan MEXC:
+    {"time", "price", "qty", "isBuyerMaker"}), dikirim per batch.
+    """
+    buf = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            buf.append(json.loads(line))
+            if len(buf) >= batch:
+                yield _trades_to_arrays(buf)
+                buf = []
+    if buf:
+        yield _trades_to_arrays(buf)
+
+
+# ======================================================
+# STREAMING AGGREGATION
+# ======================================================
+
+class TradeFlow:
+    """
+    Reduksi streaming trade → order flow per candle:
+    buy volume, sell volume, delta, cumulative volume delta (CVD) dan
+    footprint (volume buy/sell per bin harga per candle).
+
+    Taker side: isBuyerMaker=True → taker SELL, False → taker BUY.
+
+    Bar pertama flow selalu dianggap tidak lengkap: ingest bisa mulai di
+    tengah bar, atau poll pertama hanya mencakup beberapa detik bar itu.
+    """
+
+    def __init__(self, interval="1m", tick="auto", max_bars=MAX_BARS):
+        self.interval_ms = INTERVAL_MS.get(interval, 60_000)
+        self.tick = tick
+        self.max_bars = max_bars
+
+        self._bars = {}          # bar_start_ms -> [buy, sell, trades]
+        self._footprint = {}     # bar_start_ms -> {price_bin: [buy, sell]}
+        self._cvd_base = 0.0     # delta dari bar yang sudah dibuang
+        self._last_time = -1
+        self._last_keys = Counter()  # trade di _last_time (multiset, untuk dedupe overlap)
+        self._gap_bars = set()   # bar yang mungkin kehilangan trade (awal flow / poll tidak overlap)
+        self._first_bar = None   # bar trade pertama yang di-ingest
+        self.ingested = 0
+        self.gaps = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trade_keys(prices, qtys, maker, ids):
+        """Identitas trade: id exchange bila ada, selain itu (price, qty, side)."""
+        return [
+            ("id", i) if i >= 0 else (p, q, m)
+            for p, q, m, i in zip(prices.tolist(), qtys.tolist(), maker.tolist(), ids.tolist())
+        ]
+
+    def _dedupe(self, times, prices, qtys, maker, ids):
+        """
+        Buang trade yang sudah pernah di-ingest (polling REST overlap).
+        Di milidetik terakhir yang sudah terlihat, trade dicocokkan per id;
+        tanpa id dihitung sebagai multiset, jadi fill identik yang berbeda di
+        milidetik yang sama tidak ikut terbuang.
+        """
+        fresh = times > self._last_time
+        same = np.flatnonzero(times == self._last_time)
+        if len(same):
+            seen = Counter(self._last_keys)
+            for i, key in zip(same.tolist(), self._trade_keys(prices[same], qtys[same], maker[same], ids[same])):
+                if seen[key] > 0:
+                    seen[key] -= 1
+                else:
+                    fresh[i] = True
+        return fresh
+
+    def ingest(self, times, prices, qtys, is_buyer_maker, ids=None):
+        """Tambahkan satu batch trade (array, urut waktu). Return jumlah trade baru."""
+        times = np.asarray(times, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        qtys = np.asarray(qtys, dtype=np.float64)
+        maker = np.asarray(is_buyer_maker, dtype=bool)
+        ids = np.full(len(times), -1, dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+
+        with self._lock:
+            fresh = self._dedupe(times, prices, qtys, maker, ids)
+            if not fresh.any():
+                return 0
+
+            # state dedupe: semua trade batch ini di milidetik terakhirnya
+            # (batch overlap memuat trade lama + baru di milidetik itu)
+            last = int(times[-1])
+            at_last = times == last
+            keys_last = Counter(self._trade_keys(prices[at_last], qtys[at_last], maker[at_last], ids[at_last]))
+            if last == self._last_time:
+                keys_last |= self._last_keys
+            self._last_keys = keys_last
+            self._last_time = last
+
+            times, prices, qtys, maker = times[fresh], prices[fresh], qtys[fresh], maker[fresh]
+
+            if self._first_bar is None:
+                self._first_bar = int(times[0] - times[0] % self.interval_ms)
+                self._gap_bars.add(self._first_bar)
+
+            buy = np.where(maker, 0.0, qtys)
+            sell = np.where(maker, qtys, 0.0)
+            bars = times - times % self.interval_ms
+
+            # reduksi per bar: satu np.unique + bincount untuk seluruh batch
+            keys, inv = np.unique(bars, return_inverse=True)
+            buy_sum = np.bincount(inv, weights=buy, minlength=len(keys))
+            sell_sum = np.bincount(inv, weights=sell, minlength=len(keys))
+            count = np.bincount(inv, minlength=len(keys))
+
+            for k, b, s, c in zip(keys.tolist(), buy_sum.tolist(), sell_sum.tolist(), count.tolist()):
+                acc = self._bars.setdefault(k, [0.0, 0.0, 0])
+                acc[0] += b
+                acc[1] += s
+                acc[2] += c
+
+            if self.tick == "auto":
+                self.tick = auto_tick(float(prices[-1]))
+            if self.tick:
+                self._ingest_footprint(bars, prices, buy, sell)
+
+            self.ingested += int(len(times))
+            self._trim()
+            return int(len(times))
+
+    def _ingest_footprint(self, bars, prices, buy, sell):
+        # epsilon: 10.2 / 0.001 = 10199.999… tidak boleh jatuh ke bin bawah
+        pbin = np.floor(prices / self.tick + 1e-9).astype(np.int64)
+        pair = np.stack([bars, pbin], axis=1)
+        keys, inv = np.unique(pair, axis=0, return_inverse=True)
+        inv = inv.ravel()
+        b = np.bincount(inv, weights=buy, minlength=len(keys))
+        s = np.bincount(inv, weights=sell, minlength=len(keys))
+
+        for (bar, pb), bv, sv in zip(keys.tolist(), b.tolist(), s.tolist()):
+            acc = self._footprint.setdefault(bar, {}).setdefault(pb, [0.0, 0.0])
+            acc[0] += bv
+            acc[1] += sv
+
+    def mark_gap(self, start_ms, end_ms):
+        """Trade antara start_ms dan end_ms mungkin hilang → bar di rentang itu tidak lengkap."""
+        first = start_ms - start_ms % self.interval_ms
+        last = end_ms - end_ms % self.interval_ms
+        with self._lock:
+            self._gap_bars.update(range(first, last + 1, self.interval_ms))
+            self.gaps += 1
+
+    def _trim(self):
+        if len(self._bars) <= self.max_bars:
+            return
+        for k in sorted(self._bars)[:len(self._bars) - self.max_bars]:
+            b, s, _ = self._bars.pop(k)
+            self._cvd_base += b - s
+            self._footprint.pop(k, None)
+        oldest = min(self._bars)
+        self._gap_bars = {k for k in self._gap_bars if k >= oldest}
+
+    # -----------------------------
+    # Output
+    # -----------------------------
+    def frame(self):
+        """
+        DataFrame per candle: date, buy_volume, sell_volume, delta, cvd, trades,
+        complete (False = bar di dalam gap poll, volume & CVD parsial).
+        """
+        with self._lock:
+            keys = sorted(self._bars)
+            arr = np.array([self._bars[k] for k in keys], dtype=np.float64).reshape(-1, 3)
+            base = self._cvd_base
+            gap = np.array([k in self._gap_bars for k in keys], dtype=bool)
+
+        delta = arr[:, 0] - arr[:, 1]
+        return pd.DataFrame({
+            "date": pd.to_datetime(np.array(keys, dtype=np.int64), unit="ms"),
+            "buy_volume": arr[:, 0],
+            "sell_volume": arr[:, 1],
+            "delta": delta,
+            "cvd": base + np.cumsum(delta),
+            "trades": arr[:, 2].astype(np.int64),
+            "complete": ~gap,
+        })
+
+    def footprint(self, bar_start=None):
+        """Footprint satu candle (default candle terakhir): price, buy, sell, delta."""
+        with self._lock:
+            if not self._footprint or not self.tick:
+                return pd.DataFrame(columns=["price", "buy", "sell", "delta"])
+            bar = max(self._footprint) if bar_start is None else bar_start
+            bins = self._footprint.get(bar, {})
+            rows = sorted(bins.items())
+
+        pb = np.array([r[0] for r in rows], dtype=np.float64)
+        bs = np.array([r[1] for r in rows], dtype=np.float64).reshape(-1, 2)
+        return pd.DataFrame({
+            "price": np.round(pb * self.tick, 10),
+            "buy": bs[:, 0],
+            "sell": bs[:, 1],
+            "delta": bs[:, 0] - bs[:, 1],
+        })
+
+    def bias(self, bars=5):
+        """
+        Bias order flow dari delta `bars` candle terakhir.
+        None bila belum ada `bars` candle yang teramati penuh, atau salah satu
+        candle itu di awal flow / gap poll (delta parsial) → caller memakai
+        fallback candle/EMA.
+        """
+        df = self.frame()
+        if len(df) < bars:
+            return None
+        recent = df.iloc[-bars:]
+        if not recent["complete"].all():
+            return None
+        return "BULLISH" if recent["delta"].sum() > 0 else "BEARISH"
+
+
+# ======================================================
+# SHARED TAPE (satu poll per simbol)
+# ======================================================
+
+class TradeTape:
+    """
+    Satu sumber trade per simbol: /trades di-poll paling sering sekali per
+    `poll_interval` untuk semua session, lalu batch yang sama diagregasi ke
+    TradeFlow setiap interval yang sedang dipakai.
+
+    Poll mengembalikan maksimal TRADES_LIMIT trade terbaru. Bila batch penuh
+    dan trade tertuanya lebih baru dari trade terakhir di tape, trade di
+    antaranya terlewat: rentang itu dicatat sebagai gap di setiap TradeFlow.
+    """
+
+    def __init__(self, symbol, fetch=fetch_recent_trades, poll_interval=POLL_INTERVAL,
+                 limit=TRADES_LIMIT, clock=time.monotonic):
+        self.symbol = symbol.upper()
+        self.poll_interval = poll_interval
+        self.limit = limit
+        self._fetch = fetch
+        self._clock = clock
+        self._flows = {}          # interval -> TradeFlow
+        self._last_time = None    # waktu trade terakhir yang diterima
+        self._last_poll = None
+        self.polls = 0
+        self.gaps = 0
+        self.missed_ms = 0        # total durasi gap
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def flow(self, interval="1m"):
+        with self._lock:
+            if interval not in self._flows:
+                self._flows[interval] = TradeFlow(interval)
+            return self._flows[interval]
+
+    def ingest(self, times, prices, qtys, is_buyer_maker, ids=None):
+        """Satu batch poll → semua TradeFlow simbol ini (dedupe per flow)."""
+        times = np.asarray(times, dtype=np.int64)
+        if len(times) == 0:
+            return
+
+        with self._lock:
+            flows = list(self._flows.values())
+            if len(times) >= self.limit and self._last_time is not None and times[0] > self._last_time:
+                gap = (self._last_time, int(times[0]))
+                self.gaps += 1
+                self.missed_ms += gap[1] - gap[0]
+                for flow in flows:
+                    flow.mark_gap(*gap)
+            self._last_time = max(self._last_time or 0, int(times[-1]))
+
+        for flow in flows:
+            flow.ingest(times, prices, qtys, is_buyer_maker, ids)
+
+    def poll(self):
+        """
+        Fetch trade terbaru bila poll terakhir lebih lama dari poll_interval.
+        Pemanggil bersamaan menunggu poll yang sedang jalan lalu memakai
+        hasilnya (coalesce). Return True bila benar-benar fetch.
+        """
+        with self._poll_lock:
+            now = self._clock()
+            if self._last_poll is not None and now - self._last_poll < self.poll_interval:
+                return False
+            # dicatat sebelum fetch: poll gagal juga menunggu poll_interval
+            self._last_poll = now
+            self.polls += 1
+            self.ingest(*self._fetch(self.symbol, self.limit))
+            return True
+
+
+_TAPES = {}
+_TAPES_LOCK = threading.Lock()
+
+
+def get_trade_tape(symbol):
+    with _TAPES_LOCK:
+        key = symbol.upper()
+        if key not in _TAPES:
+            _TAPES[key] = TradeTape(key)
+        return _TAPES[key]
+
+
+def get_trade_flow(symbol, interval="1m"):
+    return get_trade_tape(symbol).flow(interval)
+
+
+def update_trade_flow(symbol, interval="1m"):
+    """TradeFlow (symbol, interval), setelah poll tape bersama simbol itu bila sudah waktunya."""
+    tape = get_trade_tape(symbol)
+    flow = tape.flow(interval)
+    try:
+        tape.poll()
+    except Exception as e:
+        print("Trade Tape Error:", e)
+    return flow
+
+
+if __name__ == "__main__":
+    import time
+
+    # benchmark: 1 juta trade sintetis dalam batch 1000 (≈ polling REST)
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    times = np.sort(rng.integers(0, 6 * 3_600_000, n)) + 1_700_000_000_000
+    prices = 60_000 + np.cumsum(rng.normal(0, 2, n))
+    qtys = rng.exponential(0.05, n)
+    maker = rng.random(n) < 0.5
+
+    flow = TradeFlow("1m")
+    t0 = time.perf_counter()
+    for i in range(0, n, 1000):
+        s = slice(i, i + 1000)
+        flow.ingest(times[s], prices[s], qtys[s], maker[s])
+    dt = time.perf_counter() - t0
+
+    df = flow.frame()
+    expected = np.where(maker, -qtys, qtys).sum()
+    print(f"{flow.ingested:,} trades in {dt:.2f}s ({flow.ingested / dt:,.0f} trades/s)")
+    print(f"{len(df)} bars, CVD {df['cvd'].iloc[-1]:.4f} (expected {expected:.4f})")
+
+    # tape bersama: 8 session × 2 interval dalam satu detik → satu fetch
+    calls = []
+    cursor = [0]
+
+    def fake_fetch(symbol, limit):
+        calls.append(symbol)
+        s = slice(cursor[0], cursor[0] + limit)
+        return times[s], prices[s], qtys[s], maker[s]
+
+    now = [0.0]
+    tape = TradeTape("BTCUSDT", fetch=fake_fetch, clock=lambda: now[0])
+    tape.flow("1m")
+    tape.flow("5m")
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: tape.poll(), range(16)))
+    assert len(calls) == 1, calls
+
+    # poll berikutnya overlap 500 trade → tidak ada gap
+    now[0] += POLL_INTERVAL
+    cursor[0] = 500
+    assert tape.poll() and tape.gaps == 0
+    assert tape.flow("1m").ingested == 1500
+
+    # poll berikutnya melompat 5000 trade → gap tercatat, bias ditahan
+    now[0] += POLL_INTERVAL
+    cursor[0] = 6500
+    tape.poll()
+    f1 = tape.flow("1m").frame()
+    assert tape.gaps == 1 and not f1["complete"].all()
+    assert tape.flow("1m").bias() is None
+    print(f"tape: {len(calls)} fetch untuk 18 poll · gap {tape.missed_ms / 1000:.1f}s terdeteksi ✔")
+
+    # flow yang mulai di tengah bar: bar pertama parsial, bias menunggu 5 bar penuh
+    t0 = 1_700_000_000_000 - 1_700_000_000_000 % 60_000
+    flow = TradeFlow("1m")
+    mid = t0 + 45_000 + np.arange(0, 15_000, 1_000)          # 15 detik terakhir bar 0
+    flow.ingest(mid, np.full(len(mid), 100.0), np.ones(len(mid)), np.zeros(len(mid), bool))
+    assert not flow.frame()["complete"].iloc[0] and flow.bias() is None
+    for k in range(1, 6):
+        t = t0 + k * 60_000 + np.arange(0, 60_000, 1_000)
+        flow.ingest(t, np.full(len(t), 100.0), np.ones(len(t)), np.zeros(len(t), bool))
+        assert flow.bias() is None if k < 5 else flow.bias() == "BULLISH", k
+    print("flow mulai di tengah bar → bias None sampai 5 bar penuh ✔")
+
+    # fill identik di milidetik yang sama tidak boleh hilang saat poll overlap
+    flow = TradeFlow("1m")
+    ts = np.array([t0, t0 + 1, t0 + 1])
+    px, qty, mk = np.full(3, 100.0), np.ones(3), np.zeros(3, bool)
+    flow.ingest(ts[:2], px[:2], qty[:2], mk[:2])
+    assert flow.ingest(ts, px, qty, mk) == 1 and flow.ingested == 3
+    flow = TradeFlow("1m")
+    ids = np.array([7, 8, 9])
+    flow.ingest(ts[:2], px[:2], qty[:2], mk[:2], ids[:2])
+    assert flow.ingest(ts, px, qty, mk, ids) == 1 and flow.ingest(ts, px, qty, mk, ids) == 0
+    print("dedupe per trade id / multiset: fill identik di milidetik sama tetap dihitung ✔")
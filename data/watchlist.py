@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from data.data_loader import WINDOW_LIMIT, load_candles, _fetch_yahoo_many
+from data.http_client import http_get
+from data.ohlcv import canonical_ohlcv
+from data.rate_limit import get_mexc_limiter
+from data.swr_cache import SWRCache
+
+# thread fetch (I/O bound); throughput tetap dibatasi rate limiter MEXC
+FETCH_WORKERS = 16
+
+# default watchlist crypto: N pair USDT dengan quote volume 24 jam terbesar
+TOP_SYMBOLS = 300
+TOP_SYMBOLS_MAX_AGE = 3600
+
+
+def parse_watchlist(text):
+    """'BTCUSDT, ethusdt\\nSOLUSDT' → ['BTCUSDT', 'ETHUSDT', 'SOLUSDT'] (unik, urutan dijaga)."""
+    seen = {}
+    for token in text.replace(",", " ").split():
+        seen.setdefault(token.strip().upper(), None)
+    return list(seen)
+
+
+def mexc_top_symbols(n=TOP_SYMBOLS, quote="USDT"):
+    """Pair `quote` dengan quote volume 24 jam terbesar (satu request)."""
+    get_mexc_limiter().acquire()
+    resp = http_get("https://api.mexc.com/api/v3/ticker/24hr")
+    if resp.status_code != 200:
+        raise ValueError(f"MEXC HTTP {resp.status_code}: {resp.text[:200]}")
+
+    rows = [r for r in resp.json() if r.get("symbol", "").endswith(quote)]
+    rows.sort(key=lambda r: float(r.get("quoteVolume") or 0), reverse=True)
+    return [r["symbol"] for r in rows[:n]]
+
+
+_TOP = SWRCache(mexc_top_symbols, TOP_SYMBOLS_MAX_AGE)
+
+
+def get_top_symbols(n=TOP_SYMBOLS):
+    """
+    Daftar top pair (di-refresh tiap jam di background). Tidak pernah
+    menunggu upstream: [] selama fetch pertama masih berjalan.
+    """
+    symbols, _ = _TOP.get(block=False)
+    return (symbols or [])[:n]
+
+
+def fetch_watchlist(symbols, interval, mode="Crypto", limit=WINDOW_LIMIT):
+    """
+    Candle semua simbol watchlist → (dict symbol → frame kanonik, dict symbol → error).
+
+    - Crypto: satu request kline per simbol lewat thread pool. Lewat candle
+      cache, jadi simbol yang masih fresh (mis. simbol aktif di dashboard)
+      tidak di-fetch ulang; token bucket MEXC hanya dipakai oleh request
+      yang benar-benar keluar (_fetch_mexc_arrays).
+    - Saham: yfinance tidak aman paralel, jadi semua ticker diambil dalam
+      satu download batch.
+    """
+    frames, errors = {}, {}
+
+    if not mode.startswith("Crypto"):
+        try:
+            raw = _fetch_yahoo_many(symbols, "5m" if interval == "1m" else interval)
+        except Exception as e:
+            print("Watchlist Error:", e)
+            return frames, {s: str(e) for s in symbols}
+
+        for sym in symbols:
+            if sym in raw:
+                frames[sym] = canonical_ohlcv(raw[sym], sym, interval)
+            else:
+                errors[sym] = "no data"
+        return frames, errors
+
+    def fetch(sym):
+        return load_candles(sym, interval, mode, incremental=False, limit=limit)
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="watchlist") as pool:
+        futures = {sym: pool.submit(fetch, sym) for sym in symbols}
+        for sym, fut in futures.items():
+            try:
+                frames[sym] = fut.result()
+            except Exception as e:
+                errors[sym] = str(e)
+
+    return frames, errors
@@ -0,0 +1,152 @@
+import re
+import threading
+
+import pandas as pd
+import yfinance as yf
+
+
+# yf.download memakai state global (shared._DFS) sehingga tidak aman
+# dipanggil paralel dari beberapa thread; semua download diserialkan.
+_YF_LOCK = threading.Lock()
+
+
+def yf_download(*args, **kwargs):
+    with _YF_LOCK:
+        return yf.download(*args, **kwargs)
+
+
+def period_offset(period):
+    """'7d' / '3mo' / '1y' → offset kalender ala yfinance."""
+    m = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if m is None:
+        raise ValueError(f"Period tidak dikenali: {period}")
+
+    n, unit = int(m.group(1)), m.group(2)
+    if unit == "d":
+        return pd.Timedelta(days=n)
+    if unit == "wk":
+        return pd.Timedelta(weeks=n)
+    if unit == "mo":
+        return pd.DateOffset(months=n)
+    return pd.DateOffset(years=n)
+
+
+def period_start(period, now=None):
+    """Awal window `period` seperti yfinance: now - period (bukan tengah malam)."""
+    now = pd.Timestamp.now() if now is None else now
+    return now - period_offset(period)
+
+
+def slice_period(df, period, now=None):
+    """Potong frame superset ke window `period` terakhir (relatif ke `now`)."""
+    if df is None or df.empty:
+        return df
+
+    idx = df.index
+    now = pd.Timestamp.now(tz=idx.tz) if now is None else now
+    start = period_start(period, now)
+    if idx.tz is None and start.tz is not None:
+        start = start.tz_localize(None)
+    return df[idx >= start]
+
+
+# counter process-wide (planner sendiri dibuat ulang tiap render)
+_STATS = {"requested": 0, "downloads": 0, "tickers": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def _count(**deltas):
+    with _STATS_LOCK:
+        for k, v in deltas.items():
+            _STATS[k] += v
+
+
+def planner_stats():
+    """
+    Snapshot counter semua planner sejak proses mulai, seperti
+    CandleCache.stats(): request get(), download yfinance yang benar-benar
+    jalan, ticker di dalam download itu, dan request yang dieliminasi.
+    """
+    with _STATS_LOCK:
+        s = dict(_STATS)
+    s["eliminated"] = max(0, s["requested"] - s["downloads"])
+    s["saved_ratio"] = (s["eliminated"] / s["requested"]) if s["requested"] else 0.0
+    return s
+
+
+class DownloadPlanner:
+    """
+    Planner yfinance untuk satu render cycle.
+
+    Consumer mendeklarasikan kebutuhan (ticker, period, interval) lewat
+    `request()`. Saat `get()` pertama untuk sebuah interval, semua ticker
+    yang dideklarasikan untuk interval itu diambil dalam satu download
+    dengan period terpanjang (superset), lalu tiap caller menerima
+    potongan sesuai period-nya.
+    """
+
+    def __init__(self, downloader=None):
+        self._download = downloader or yf_download
+        self._lock = threading.Lock()
+        self._wanted = {}        # interval -> {ticker: {period, ...}}
+        self._frames = {}        # (ticker, interval) -> DataFrame superset
+        self.requested = 0
+        self.downloads = 0
+
+    def request(self, ticker, period, interval="1d"):
+        with self._lock:
+            self._wanted.setdefault(interval, {}).setdefault(ticker, set()).add(period)
+
+    def _superset_period(self, periods):
+        return min(periods, key=period_start)
+
+    def _fetch(self, interval):
+        wanted = self._wanted.get(interval, {})
+        pending = [t for t in wanted if (t, interval) not in self._frames]
+        if not pending:
+            return
+
+        period = self._superset_period({p for t in pending for p in wanted[t]})
+        df = self._download(pending, period=period, interval=interval, group_by="ticker")
+        self.downloads += 1
+        _count(downloads=1, tickers=len(pending))
+
+        for t in pending:
+            if df is not None and t in df.columns.get_level_values(0):
+                self._frames[(t, interval)] = df[t].dropna(how="all")
+            else:
+                self._frames[(t, interval)] = pd.DataFrame()
+
+    def get(self, ticker, period, interval="1d"):
+        """Frame OHLCV (kolom datar) untuk `ticker`, dipotong ke `period`."""
+        with self._lock:
+            self.requested += 1
+            _count(requested=1)
+            known = self._wanted.setdefault(interval, {}).setdefault(ticker, set())
+            if (ticker, interval) in self._frames and period not in known:
+                # period lebih panjang dari superset yang sudah diambil → ambil ulang
+                if period_start(period) < min(period_start(p) for p in known):
+                    self._frames.pop((ticker, interval))
+            known.add(period)
+
+            self._fetch(interval)
+            df = self._frames[(ticker, interval)]
+
+        return slice_period(df, period)
+
+    @property
+    def eliminated(self):
+        return max(0, self.requested - self.downloads)
+
+    def summary(self):
+        """Ringkasan request vs download satu planner (lihat planner_stats untuk total proses)."""
+        return (
+            f"yfinance planner: {self.requested} request → {self.downloads} download "
+            f"({self.eliminated} dieliminasi)"
+        )
+
+
+def fetch_history(ticker, period, interval="1d", planner=None):
+    """Helper: lewat planner bila ada, kalau tidak satu download langsung."""
+    planner = planner or DownloadPlanner()
+    return planner.get(ticker, period, interval)
@@ -27,7 +27,8 @@ def add_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 if __name__ == "__main__":
-    df = pd.read_csv("data/crypto_raw_15m.csv")
-    df = add_features(df)
-    df.to_csv("data/crypto_features_15m.csv", index=False)
-    print("📁 Saved: data/crypto_features_15m.csv")
+    # streaming per chunk (memori tetap) → kolom float32 yang bisa di-memmap
+    from features.streaming_features import build_features
+
+    rows = build_features("data/crypto_raw_15m.csv", "data/crypto_features_15m")
+    print(f"📁 Saved: data/crypto_features_15m/ ({rows:,} rows)")
@@ -0,0 +1,318 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# kolom fitur sama dengan add_features / ai/train_crypto_ai.py
+FEATURES = ["return", "sma5", "sma10", "ema5", "ema10", "rsi", "macd", "signal", "vol_change", "body"]
+TARGET = "Direction"
+
+# baris CSV per chunk → batas memori proses kira-kira tetap
+CHUNK_ROWS = 200_000
+
+# kolom waktu yang dikenali dari CSV mentah (yfinance / export lain)
+DATE_COLUMNS = ["Datetime", "Date", "date", "timestamp"]
+
+
+def _ewm_fixed_point(com):
+    """
+    Jumlah observasi sampai bobot ewm(adjust=True) pandas (old_wt) berhenti
+    berubah di float64. Setelah itu state ewm cukup (nilai terakhir, bobot).
+    """
+    factor = 1 - 1 / (1 + com)
+    wt, seen = 1.0, {1.0}
+    for k in range(2, 100_000):
+        wt = wt * factor + 1.0
+        if wt in seen:
+            return k
+        seen.add(wt)
+    return k
+
+
+def _ewm_continue(values, prev, warmup, **kwargs):
+    """
+    Lanjutkan ewm pandas dari state chunk sebelumnya, hasil bit-identik:
+    `prev` diulang `warmup` kali di depan (nilai sama → weighted tidak
+    berubah, bobot internal pandas berevolusi persis seperti series penuh).
+    Untuk adjust=False cukup warmup=1.
+    """
+    if prev is None or warmup == 0:
+        return pd.Series(values).ewm(**kwargs).mean().to_numpy(copy=True)
+
+    head = np.full(warmup, prev)
+    out = pd.Series(np.concatenate([head, values])).ewm(**kwargs).mean().to_numpy(copy=True)
+    return out[warmup:]
+
+
+class StreamingFeatures:
+    """
+    add_features() per chunk dengan state yang dibawa antar chunk:
+    close/volume sebelumnya (return, vol_change, RSI diff), ekor close
+    untuk SMA, nilai terakhir + jumlah observasi untuk EMA, RSI dan MACD,
+    serta satu baris tertunda karena Direction butuh close berikutnya.
+
+    EMA/RSI/MACD/return/body bit-identik dengan add_features. SMA dihitung
+    ulang dari ekor close sehingga bisa beda 1 ulp float64 dari running sum
+    pandas; setelah disimpan sebagai float32 hasilnya sama.
+    """
+
+    SMA = (5, 10)
+    EMA_COM = (5, 10)
+
+    def __init__(self):
+        self.rows = 0
+        self.prev_close = None
+        self.prev_volume = None
+        self.tail = np.empty(0)
+        self.ema = {com: None for com in self.EMA_COM}
+        self.ema_warmup = {com: _ewm_fixed_point(com) for com in self.EMA_COM}
+        self.rsi_up = None
+        self.rsi_down = None
+        self.macd_fast = None
+        self.macd_slow = None
+        self.macd_signal = None
+        self.macd_obs = 0
+        self.pending = None
+
+    def process(self, chunk):
+        """Chunk candle mentah → baris fitur yang sudah final (setelah dropna)."""
+        df = chunk.reset_index(drop=True)
+        n = len(df)
+        if n == 0:
+            return df
+
+        close = df["Close"].to_numpy(dtype=np.float64)
+        volume = df["Volume"].to_numpy(dtype=np.float64)
+        open_ = df["Open"].to_numpy(dtype=np.float64)
+        start = self.rows
+
+        prev_c = np.concatenate([[np.nan if self.prev_close is None else self.prev_close], close[:-1]])
+        prev_v = np.concatenate([[np.nan if self.prev_volume is None else self.prev_volume], volume[:-1]])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["return"] = close / prev_c - 1
+            for w in self.SMA:
+                ext = np.concatenate([self.tail[-(w - 1):], close])
+                sma = pd.Series(ext).rolling(w).mean().to_numpy()
+                df[f"sma{w}"] = sma[len(ext) - n:]
+
+            for com in self.EMA_COM:
+                warmup = min(start, self.ema_warmup[com])
+                ema = _ewm_continue(close, self.ema[com], warmup, com=com)
+                df[f"ema{com}"] = ema
+                self.ema[com] = ema[-1]
+
+            # ta.momentum.RSIIndicator(close, 14)
+            diff = close - prev_c
+            up = np.where(diff > 0, diff, 0.0)
+            down = -np.where(diff < 0, diff, 0.0)
+            emaup = _ewm_continue(up, self.rsi_up, 1, alpha=1 / 14, adjust=False)
+            emadn = _ewm_continue(down, self.rsi_down, 1, alpha=1 / 14, adjust=False)
+            self.rsi_up, self.rsi_down = emaup[-1], emadn[-1]
+            seen = start + np.arange(1, n + 1)
+            emaup[seen < 14] = np.nan
+            emadn[seen < 14] = np.nan
+            rsi = np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn)))
+            df["rsi"] = rsi
+
+            # ta.trend.MACD(close): ema 12/26/9, adjust=False, min_periods=window
+            fast = _ewm_continue(close, self.macd_fast, 1, span=12, adjust=False)
+            slow = _ewm_continue(close, self.macd_slow, 1, span=26, adjust=False)
+            self.macd_fast, self.macd_slow = fast[-1], slow[-1]
+            fast[seen < 12] = np.nan
+            slow[seen < 26] = np.nan
+            macd = fast - slow
+
+            signal = _ewm_continue(macd, self.macd_signal, 1, span=9, adjust=False)
+            self.macd_signal = signal[-1]
+            obs = self.macd_obs + np.cumsum(~np.isnan(macd))
+            self.macd_obs = int(obs[-1])
+            signal[obs < 9] = np.nan
+            df["macd"] = macd
+            df["signal"] = signal
+
+            df["vol_change"] = volume / prev_v - 1
+            df["body"] = (close - open_) / open_
+
+        # Direction butuh close bar berikutnya → baris terakhir ditahan
+        df["Close_next"] = np.append(close[1:], np.nan)
+        df["Direction"] = (df["Close_next"] > df["Close"]).astype(int)
+
+        if self.pending is not None:
+            self.pending["Close_next"] = close[0]
+            self.pending["Direction"] = int(close[0] > self.pending["Close"].iloc[0])
+            df = pd.concat([self.pending, df], ignore_index=True)
+        self.pending = df.iloc[-1:].copy()
+
+        self.rows += n
+        self.prev_close, self.prev_volume = close[-1], volume[-1]
+        self.tail = np.concatenate([self.tail, close])[-(max(self.SMA) - 1):]
+
+        return df.iloc[:-1].dropna()
+
+    def finish(self):
+        """Baris terakhir tidak punya close berikutnya → ikut di-dropna seperti add_features."""
+        if self.pending is None:
+            return pd.DataFrame()
+        last, self.pending = self.pending, None
+        return last.dropna()
+
+
+# ======================================================
+# COLUMNAR OUTPUT (float32 + memmap)
+# ======================================================
+
+def _date_column(columns):
+    for c in DATE_COLUMNS:
+        if c in columns:
+            return c
+    return None
+
+
+class FeatureWriter:
+    """
+    Tulis fitur per kolom ke <out_dir>/<kolom>.bin (float32, Direction int8,
+    time int64 ns) + meta.json, layout yang sama seperti candle store.
+    """
+
+    def __init__(self, out_dir, features=FEATURES):
+        self.out_dir = out_dir
+        self.columns = {c: "float32" for c in features}
+        self.columns[TARGET] = "int8"
+        self.rows = 0
+        self._files = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _open(self, col):
+        if col not in self._files:
+            self._files[col] = open(os.path.join(self.out_dir, f"{col}.bin"), "wb")
+        return self._files[col]
+
+    def write(self, df):
+        if df.empty:
+            return
+        date_col = _date_column(df.columns)
+        if date_col is not None:
+            self.columns["time"] = "int64"
+            t = pd.to_datetime(df[date_col], utc=True).dt.as_unit("ns").astype("int64")
+            np.ascontiguousarray(t.to_numpy()).tofile(self._open("time"))
+
+        for col, dtype in self.columns.items():
+            if col == "time":
+                continue
+            np.ascontiguousarray(df[col].to_numpy(), dtype=dtype).tofile(self._open(col))
+        self.rows += len(df)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        with open(os.path.join(self.out_dir, "meta.json"), "w") as f:
+            json.dump({"rows": self.rows, "columns": self.columns}, f)
+
+
+def build_features(csv_path, out_dir, chunk_rows=CHUNK_ROWS, **read_csv_kwargs):
+    """CSV candle mentah → fitur kolumnar di `out_dir`, streaming per chunk. Return jumlah baris."""
+    state = StreamingFeatures()
+    writer = FeatureWriter(out_dir)
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, **read_csv_kwargs):
+            writer.write(state.process(chunk))
+        writer.write(state.finish())
+    finally:
+        writer.close()
+    return writer.rows
+
+
+def load_feature_arrays(out_dir, columns=None):
+    """Dict kolom → np.memmap read-only (tanpa baca isi file)."""
+    with open(os.path.join(out_dir, "meta.json")) as f:
+        meta = json.load(f)
+
+    out = {}
+    for col in columns or meta["columns"]:
+        dtype = np.dtype(meta["columns"][col])
+        if meta["rows"] == 0:
+            out[col] = np.empty(0, dtype=dtype)
+        else:
+            out[col] = np.memmap(os.path.join(out_dir, f"{col}.bin"), dtype=dtype, mode="r", shape=(meta["rows"],))
+    return out
+
+
+def load_features(out_dir, columns=None):
+    """Frame fitur di atas memmap (kolom tidak disalin ke memori)."""
+    return pd.DataFrame(load_feature_arrays(out_dir, columns), copy=False)
+
+
+# ======================================================
+# EQUIVALENCE + MEMORY BENCHMARK
+# ======================================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    import tracemalloc
+
+    from features.feature_engineering import add_features
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    raw = pd.DataFrame({
+        "Datetime": pd.date_range("2022-01-01", periods=n, freq="min", tz="UTC"),
+        "Open": open_,
+        "High": np.maximum(open_, close) * 1.0005,
+        "Low": np.minimum(open_, close) * 0.9995,
+        "Close": close,
+        "Volume": rng.random(n) * 10 + 0.1,
+    })
+
+    with tempfile.TemporaryDirectory() as root:
+        csv_path = os.path.join(root, "raw.csv")
+        raw.to_csv(csv_path, index=False)
+        del raw
+
+        out_dir = os.path.join(root, "features")
+
+        def full():
+            return add_features(pd.read_csv(csv_path))
+
+        def stream():
+            return build_features(csv_path, out_dir, chunk_rows=50_000)
+
+        stats = {}
+        for name, fn in (("add_features", full), ("streaming", stream)):
+            t = time.perf_counter()
+            result = fn()
+            dt = time.perf_counter() - t
+            del result
+
+            tracemalloc.start()
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats[name] = (dt, peak, result)
+
+        ref = stats["add_features"][2]
+        rows = stats["streaming"][2]
+
+        t = time.perf_counter()
+        feats = load_features(out_dir)
+        dt_load = (time.perf_counter() - t) * 1e3
+
+        assert rows == len(ref), (rows, len(ref))
+        assert (feats[TARGET].to_numpy() == ref[TARGET].to_numpy()).all()
+        worst = 0
+        for col in FEATURES:
+            a = feats[col].to_numpy()
+            b = ref[col].to_numpy().astype(np.float32)
+            mismatch = int((a != b).sum())
+            worst = max(worst, mismatch)
+            assert np.array_equal(a, b) or mismatch <= rows * 1e-6, (col, mismatch)
+        print(f"{rows:,} baris · float32 identik dengan add_features (mismatch maks/kolom: {worst})")
+
+        for name, (dt, peak, _) in stats.items():
+            print(f"{name:13s} {dt:6.2f}s · peak {peak / 2**20:7.1f} MiB")
+        print(f"load memmap   {dt_load:6.2f} ms")